@@ -0,0 +1,16 @@
+"""Modelos de dominio del módulo de Cierre de Caja."""
+from .models import (
+    CursorVentas,
+    FiltroVentas,
+    PaginaVentas,
+    ResumenVentas,
+    ResultadoExportacion
+)
+
+__all__ = [
+    "CursorVentas",
+    "FiltroVentas",
+    "PaginaVentas",
+    "ResumenVentas",
+    "ResultadoExportacion"
+]
@@ -0,0 +1,55 @@
+"""Modelos de dominio para el módulo de Cierre de Caja."""
+from dataclasses import dataclass, field
+from datetime import date, time
+from typing import List, Optional, Tuple
+
+from ...sales.domain.models import Venta
+
+
+# Posición en el listado de ventas: (fecha tal como está guardada, id) de la última venta vista
+CursorVentas = Tuple[str, int]
+
+
+@dataclass
+class FiltroVentas:
+    """Filtros de consulta de ventas."""
+    fecha_inicio: Optional[date] = None
+    fecha_fin: Optional[date] = None
+    mes: Optional[int] = None
+    año: Optional[int] = None
+    hora_inicio: Optional[time] = None
+    hora_fin: Optional[time] = None
+
+
+@dataclass
+class PaginaVentas:
+    """Página de ventas ordenadas de la más reciente a la más antigua."""
+    ventas: List[Venta] = field(default_factory=list)
+    siguiente: Optional[CursorVentas] = None  # None si no hay más páginas
+    
+    @property
+    def hay_mas(self) -> bool:
+        """Indica si existen más ventas después de esta página."""
+        return self.siguiente is not None
+
+
+@dataclass
+class ResumenVentas:
+    """Cantidad y total de las ventas que cumplen un filtro."""
+    cantidad: int = 0
+    total: float = 0.0
+
+
+@dataclass
+class ResultadoExportacion:
+    """Resultado de exportar las facturas de un filtro de ventas."""
+    total: int = 0
+    generadas: List[str] = field(default_factory=list)  # Rutas en orden cronológico
+    errores: List[Tuple[str, str]] = field(default_factory=list)  # (número de factura, motivo)
+    archivo_combinado: Optional[str] = None
+    cancelado: bool = False
+    
+    @property
+    def exitoso(self) -> bool:
+        """Indica si se generaron todas las facturas sin errores."""
+        return not self.cancelado and not self.errores and len(self.generadas) == self.total
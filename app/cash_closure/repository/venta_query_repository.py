@@ -1,32 +1,99 @@
 """Repositorio para consultar ventas con filtros avanzados."""
 import sqlite3
-from typing import List, Optional
-from contextlib import contextmanager
-from datetime import datetime, date, time
+from typing import Iterator, List, Optional, Tuple
+from datetime import date, time
 
-from ...sales.domain.models import Venta, ItemVenta, MetodoPago
+from ...database.connection_manager import get_connection_manager, fetch_in_batches
+from ...database.migrations import ensure_schema
+from ...config.settings import Settings
+from ...utils.fechas import (
+    parsear_fecha, rango_dias, rango_horas, rango_mes, rango_año,
+    rangos_mes_en_años
+)
+from ...sales.domain.dinero import a_unidades
+from ...sales.domain.models import Venta, ItemVenta, RegistroVenta, RegistroItemVenta
+from ...sales.repository.venta_mapper import (
+    COLUMNAS_ITEM, COLUMNAS_VENTA, cargar_ventas, fila_a_item
+)
+from ..domain.models import CursorVentas, FiltroVentas, PaginaVentas, ResumenVentas
 
 
 class VentaQueryRepository:
     """Repositorio para consultar ventas con filtros avanzados."""
     
-    def __init__(self, db_path: str = "Ventas.DB"):
+    def __init__(self, db_path: str = None):
         """
         Inicializa el repositorio.
         
         Args:
             db_path: Ruta al archivo de base de datos SQLite
         """
-        self.db_path = db_path
+        self.db_path = db_path or Settings.SALES_DATABASE_PATH
+        ensure_schema(self.db_path, "ventas")
     
-    @contextmanager
     def _get_connection(self):
-        """Context manager para obtener conexiones a la base de datos."""
-        conn = sqlite3.connect(self.db_path)
-        try:
-            yield conn
-        finally:
-            conn.close()
+        """Context manager para obtener conexiones del pool compartido."""
+        return get_connection_manager(self.db_path).connection()
+    
+    def _construir_filtro(self, cursor: sqlite3.Cursor,
+                          filtro: FiltroVentas) -> Optional[Tuple[str, list]]:
+        """
+        Traduce un filtro a una cláusula WHERE sobre la tabla ventas.
+        
+        Todos los filtros se expresan como rangos sobre fecha para usar el
+        índice idx_ventas_fecha (fecha se guarda en formato ordenable).
+        
+        Args:
+            cursor: Cursor de la conexión
+            filtro: Filtros a aplicar
+        
+        Returns:
+            Tupla (where, params), o None si ninguna venta puede cumplir el filtro
+        """
+        query = "WHERE 1=1"
+        params = []
+        
+        # Filtro por día específico (opcionalmente acotado por horas)
+        if filtro.fecha_inicio and not filtro.fecha_fin:
+            if filtro.hora_inicio is not None or filtro.hora_fin is not None:
+                limites = rango_horas(filtro.fecha_inicio, filtro.hora_inicio, filtro.hora_fin)
+            else:
+                limites = rango_dias(filtro.fecha_inicio, filtro.fecha_inicio)
+            query += " AND fecha >= ? AND fecha < ?"
+            params.extend(limites)
+        
+        # Filtro por rango de fechas
+        elif filtro.fecha_inicio and filtro.fecha_fin:
+            query += " AND fecha >= ? AND fecha < ?"
+            params.extend(rango_dias(filtro.fecha_inicio, filtro.fecha_fin))
+        
+        # Filtro por mes y/o año
+        if filtro.mes is not None and filtro.año is not None:
+            query += " AND fecha >= ? AND fecha < ?"
+            params.extend(rango_mes(filtro.año, filtro.mes))
+        elif filtro.año is not None:
+            query += " AND fecha >= ? AND fecha < ?"
+            params.extend(rango_año(filtro.año))
+        elif filtro.mes is not None:
+            # Mes sin año: un rango por cada año con ventas. Solo se miran las
+            # fechas normalizadas; las que no se pudieron interpretar se dejan
+            # tal cual en la base y no empiezan por un año
+            cursor.execute(
+                "SELECT (SELECT fecha FROM ventas WHERE fecha GLOB ?1 ORDER BY fecha LIMIT 1), "
+                "(SELECT fecha FROM ventas WHERE fecha GLOB ?1 ORDER BY fecha DESC LIMIT 1)",
+                ("[0-9][0-9][0-9][0-9]-*",)
+            )
+            primera, ultima = cursor.fetchone()
+            if primera is None:
+                return None
+            rangos = rangos_mes_en_años(filtro.mes, int(primera[:4]), int(ultima[:4]))
+            query += " AND (" + " OR ".join(["(fecha >= ? AND fecha < ?)"] * len(rangos)) + ")"
+            for limites in rangos:
+                params.extend(limites)
+        
+        if not params:
+            return "", []
+        return query, params
     
     def obtener_ventas_filtradas(
         self,
@@ -47,139 +114,199 @@ class VentaQueryRepository:
             año: Año específico
             hora_inicio: Hora de inicio (para rango de horas)
             hora_fin: Hora de fin (para rango de horas)
-            
+        
         Returns:
             Lista de ventas que cumplen los filtros
         """
+        filtro = FiltroVentas(fecha_inicio, fecha_fin, mes, año, hora_inicio, hora_fin)
         with self._get_connection() as conn:
             cursor = conn.cursor()
+            condicion = self._construir_filtro(cursor, filtro)
+            if condicion is None:
+                return []
             
-            # Construir query base
-            query = """
-                SELECT id, numero_factura, fecha, cliente_id, subtotal, descuento_total, 
-                       impuesto_total, total, metodo_pago, observaciones
-                FROM ventas
-                WHERE 1=1
-            """
-            params = []
+            # Ventas e items en dos consultas, agrupados en memoria
+            return cargar_ventas(cursor, *condicion)
+    
+    def obtener_pagina_ventas(
+        self,
+        filtro: Optional[FiltroVentas] = None,
+        cursor_pagina: Optional[CursorVentas] = None,
+        tamaño_pagina: int = 100
+    ) -> PaginaVentas:
+        """
+        Obtiene una página de ventas ordenadas por (fecha, id) descendente.
+        
+        La paginación es por clave (keyset): la página siguiente empieza
+        después de la última venta vista, por lo que el costo de cada página
+        no depende de cuántas ventas se hayan recorrido antes.
+        
+        Args:
+            filtro: Filtros a aplicar (None para todas las ventas)
+            cursor_pagina: (fecha tal como está guardada, id) de la última venta
+                de la página anterior (None para la primera página)
+            tamaño_pagina: Máximo de ventas por página
+        
+        Returns:
+            PaginaVentas con las ventas y el cursor de la página siguiente
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            condicion = self._construir_filtro(cursor, filtro or FiltroVentas())
+            if condicion is None:
+                return PaginaVentas()
             
-            # Filtro por día específico
-            if fecha_inicio and not fecha_fin:
-                query += " AND DATE(fecha) = ?"
-                params.append(fecha_inicio.isoformat())
+            where, params = condicion
+            if cursor_pagina is not None:
+                fecha_cursor, id_cursor = cursor_pagina
+                where = (where or "WHERE 1=1") + " AND (fecha, id) < (?, ?)"
+                params = params + [fecha_cursor, id_cursor]
             
-            # Filtro por rango de fechas
-            elif fecha_inicio and fecha_fin:
-                query += " AND DATE(fecha) >= ? AND DATE(fecha) <= ?"
-                params.extend([fecha_inicio.isoformat(), fecha_fin.isoformat()])
+            # Se pide una venta de más para saber si existe otra página
+            ventas = cargar_ventas(cursor, where, params, limite=tamaño_pagina + 1)
+            if len(ventas) <= tamaño_pagina:
+                return PaginaVentas(ventas=ventas)
             
-            # Filtro por mes
-            if mes is not None:
-                query += " AND CAST(strftime('%m', fecha) AS INTEGER) = ?"
-                params.append(mes)
+            ventas = ventas[:tamaño_pagina]
+            ultima = ventas[-1]
+            # El cursor lleva la fecha guardada y no la interpretada: una fecha
+            # que no se pudo interpretar (o con otro formato) no se puede
+            # reconstruir y la página siguiente saltaría ventas
+            cursor.execute("SELECT fecha FROM ventas WHERE id = ?", (ultima.id,))
+            fecha_guardada = cursor.fetchone()[0]
+        
+        return PaginaVentas(ventas=ventas, siguiente=(fecha_guardada, ultima.id))
+    
+    def obtener_resumen_ventas(self, filtro: Optional[FiltroVentas] = None) -> ResumenVentas:
+        """
+        Calcula la cantidad y el total de las ventas que cumplen un filtro.
+        
+        Args:
+            filtro: Filtros a aplicar (None para todas las ventas)
+        
+        Returns:
+            ResumenVentas con la cantidad y el total
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            condicion = self._construir_filtro(cursor, filtro or FiltroVentas())
+            if condicion is None:
+                return ResumenVentas()
             
-            # Filtro por año
-            if año is not None:
-                query += " AND CAST(strftime('%Y', fecha) AS INTEGER) = ?"
-                params.append(año)
+            where, params = condicion
+            # Suma exacta en centavos enteros (los totales se guardan con dos decimales)
+            cursor.execute(
+                "SELECT COUNT(*), COALESCE(SUM(CAST(ROUND(total * 100) AS INTEGER)), 0) "
+                f"FROM ventas {where}",
+                params
+            )
+            cantidad, total_centavos = cursor.fetchone()
+            return ResumenVentas(cantidad=cantidad, total=a_unidades(total_centavos))
+    
+    def obtener_resumen_por_dias(self, fecha_inicio: Optional[date] = None,
+                                 fecha_fin: Optional[date] = None) -> ResumenVentas:
+        """
+        Calcula la cantidad y el total de las ventas de un rango de días completos.
+        
+        Lee la tabla ventas_por_dia (mantenida con triggers), por lo que el
+        costo depende del número de días del rango y no del número de ventas.
+        
+        Args:
+            fecha_inicio: Primer día incluido (None = desde la primera venta)
+            fecha_fin: Último día incluido (None = hasta la última venta)
+        
+        Returns:
+            ResumenVentas con la cantidad y el total
+        """
+        condiciones, params = [], []
+        if fecha_inicio is not None:
+            condiciones.append("dia >= ?")
+            params.append(fecha_inicio.isoformat())
+        if fecha_fin is not None:
+            condiciones.append("dia <= ?")
+            params.append(fecha_fin.isoformat())
+        where = f"WHERE {' AND '.join(condiciones)}" if condiciones else ""
+        
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT COALESCE(SUM(cantidad), 0), COALESCE(SUM(total_centavos), 0) "
+                f"FROM ventas_por_dia {where}",
+                params
+            )
+            cantidad, total_centavos = cursor.fetchone()
+            return ResumenVentas(cantidad=cantidad, total=a_unidades(total_centavos))
+    
+    def iter_ventas(self, filtro: Optional[FiltroVentas] = None,
+                    tamaño_lote: int = 500) -> Iterator[RegistroVenta]:
+        """
+        Recorre las ventas en orden cronológico sin cargarlas todas en memoria.
+        
+        Las filas se leen por lotes con fetchmany, por lo que la memoria usada
+        depende del tamaño del lote y no del tamaño del historial.
+        
+        Args:
+            filtro: Filtros a aplicar (None para todas las ventas)
+            tamaño_lote: Filas leídas por lote
             
-            # Filtro por rango de horas (solo si hay fecha específica)
-            if hora_inicio is not None or hora_fin is not None:
-                if fecha_inicio and not fecha_fin:
-                    # Si hay día específico, filtrar por horas de ese día
-                    if hora_inicio:
-                        query += " AND TIME(fecha) >= ?"
-                        params.append(hora_inicio.strftime("%H:%M:%S"))
-                    if hora_fin:
-                        query += " AND TIME(fecha) <= ?"
-                        params.append(hora_fin.strftime("%H:%M:%S"))
+        Yields:
+            RegistroVenta: Cada venta, sin items
+        """
+        with get_connection_manager(self.db_path).dedicated_connection() as conn:
+            cursor = conn.cursor()
+            condicion = self._construir_filtro(cursor, filtro or FiltroVentas())
+            if condicion is None:
+                return
             
-            query += " ORDER BY fecha DESC"
+            where, params = condicion
+            cursor.execute(
+                f"SELECT {COLUMNAS_VENTA} FROM ventas {where} ORDER BY fecha, id",
+                params
+            )
+            for row in fetch_in_batches(cursor, tamaño_lote):
+                yield RegistroVenta(
+                    row[0], row[1] or "", parsear_fecha(row[2]), row[3],
+                    row[4] or 0.0, row[5] or 0.0, row[6] or 0.0, row[7] or 0.0,
+                    row[8] or "", row[9] or ""
+                )
+    
+    def iter_items(self, filtro: Optional[FiltroVentas] = None,
+                   tamaño_lote: int = 500) -> Iterator[RegistroItemVenta]:
+        """
+        Recorre los items de las ventas que cumplen un filtro, por lotes.
+        
+        Los items salen agrupados por venta y en orden cronológico de venta.
+        
+        Args:
+            filtro: Filtros sobre las ventas (None para todas)
+            tamaño_lote: Filas leídas por lote
             
-            cursor.execute(query, params)
-            venta_rows = cursor.fetchall()
+        Yields:
+            RegistroItemVenta: Cada item con el número de factura y fecha de su venta
+        """
+        with get_connection_manager(self.db_path).dedicated_connection() as conn:
+            cursor = conn.cursor()
+            condicion = self._construir_filtro(cursor, filtro or FiltroVentas())
+            if condicion is None:
+                return
             
-            # Obtener items para cada venta
-            ventas = []
-            for venta_row in venta_rows:
-                venta_id = venta_row[0]
-                
-                # Obtener items usando id_venta (con fallback a venta_id para compatibilidad)
-                try:
-                    cursor.execute("""
-                        SELECT codigo_producto, nombre_producto, cantidad, precio_unitario, descuento, impuesto
-                        FROM items_venta
-                        WHERE id_venta = ?
-                        ORDER BY id
-                    """, (venta_id,))
-                except sqlite3.OperationalError:
-                    # Si id_venta no existe, usar venta_id
-                    cursor.execute("""
-                        SELECT codigo_producto, nombre_producto, cantidad, precio_unitario, descuento, impuesto
-                        FROM items_venta
-                        WHERE venta_id = ?
-                        ORDER BY id
-                    """, (venta_id,))
-                
-                items_data = cursor.fetchall()
-                items = [
-                    ItemVenta(
-                        codigo_producto=row[0],
-                        nombre_producto=row[1],
-                        cantidad=row[2],
-                        precio_unitario=row[3],
-                        descuento=row[4] if len(row) > 4 else 0.0,
-                        impuesto=row[5] if len(row) > 5 else 0.0
-                    )
-                    for row in items_data
-                ]
-                
-                # Parsear fecha
-                fecha_str = venta_row[2]
-                fecha = None
-                if isinstance(fecha_str, str):
-                    try:
-                        # Intentar formato ISO
-                        fecha = datetime.fromisoformat(fecha_str.replace('Z', '+00:00'))
-                    except:
-                        try:
-                            # Intentar formato timestamp
-                            fecha = datetime.fromtimestamp(float(fecha_str))
-                        except:
-                            try:
-                                # Intentar formato SQLite datetime
-                                fecha = datetime.strptime(fecha_str, "%Y-%m-%d %H:%M:%S")
-                            except:
-                                fecha = datetime.now()
-                else:
-                    try:
-                        fecha = datetime.fromtimestamp(fecha_str) if fecha_str else datetime.now()
-                    except:
-                        fecha = datetime.now()
-                
-                # Parsear método de pago
-                metodo_pago_str = venta_row[8]
-                try:
-                    metodo_pago = MetodoPago(metodo_pago_str) if metodo_pago_str else MetodoPago.EFECTIVO
-                except (ValueError, AttributeError):
-                    metodo_pago = MetodoPago.EFECTIVO
-                
-                venta = Venta(
-                    id=venta_id,
-                    numero_factura=venta_row[1] or "",
-                    fecha=fecha,
-                    items=items,
-                    cliente_id=venta_row[3],
-                    subtotal=venta_row[4] or 0.0,
-                    descuento_total=venta_row[5] or 0.0,
-                    impuesto_total=venta_row[6] or 0.0,
-                    total=venta_row[7] or 0.0,
-                    metodo_pago=metodo_pago,
-                    observaciones=venta_row[9] or ""
+            where, params = condicion
+            cursor.execute(
+                f"""SELECT v.id, v.numero_factura, v.fecha, i.codigo_producto, i.nombre_producto,
+                           i.cantidad, i.precio_unitario, i.descuento, i.impuesto, i.subtotal
+                    FROM (SELECT id, numero_factura, fecha FROM ventas {where}) AS v
+                    JOIN items_venta AS i ON i.venta_id = v.id
+                    ORDER BY v.fecha, v.id, i.id""",
+                params
+            )
+            for row in fetch_in_batches(cursor, tamaño_lote):
+                yield RegistroItemVenta(
+                    row[0], row[1] or "", parsear_fecha(row[2]), row[3] or "", row[4] or "",
+                    row[5] or 0, row[6] or 0.0,
+                    row[7] if row[7] is not None else 0.0,
+                    row[8] if row[8] is not None else 0.0,
+                    row[9] or 0.0
                 )
-                ventas.append(venta)
-            
-            return ventas
     
     def obtener_todas_las_ventas(self) -> List[Venta]:
         """Obtiene todas las ventas sin filtros."""
@@ -187,53 +314,19 @@ class VentaQueryRepository:
     
     def obtener_items_venta(self, venta_id: int) -> List[ItemVenta]:
         """
-        Obtiene los items de una venta específica usando id_venta o venta_id.
+        Obtiene los items de una venta específica.
         
         Args:
             venta_id: ID de la venta
-            
+        
         Returns:
             Lista de items de la venta
         """
         with self._get_connection() as conn:
             cursor = conn.cursor()
             
-            # Verificar si la columna id_venta existe
-            cursor.execute("PRAGMA table_info(items_venta)")
-            columns_info = cursor.fetchall()
-            column_names = [col[1] for col in columns_info]
-            has_id_venta = 'id_venta' in column_names
-            
-            # Usar la columna apropiada
-            if has_id_venta:
-                query = """
-                    SELECT codigo_producto, nombre_producto, cantidad, precio_unitario, descuento, impuesto
-                    FROM items_venta
-                    WHERE id_venta = ?
-                    ORDER BY id
-                """
-            else:
-                query = """
-                    SELECT codigo_producto, nombre_producto, cantidad, precio_unitario, descuento, impuesto
-                    FROM items_venta
-                    WHERE venta_id = ?
-                    ORDER BY id
-                """
-            
-            cursor.execute(query, (venta_id,))
-            items_data = cursor.fetchall()
-            
-            items = [
-                ItemVenta(
-                    codigo_producto=row[0] or "",
-                    nombre_producto=row[1] or "",
-                    cantidad=row[2] if row[2] else 0,
-                    precio_unitario=row[3] if row[3] else 0.0,
-                    descuento=row[4] if len(row) > 4 and row[4] is not None else 0.0,
-                    impuesto=row[5] if len(row) > 5 and row[5] is not None else 0.0
-                )
-                for row in items_data
-            ]
-            
-            return items
-
+            cursor.execute(
+                f"SELECT {COLUMNAS_ITEM} FROM items_venta WHERE venta_id = ? ORDER BY id",
+                (venta_id,)
+            )
+            return [fila_a_item(row) for row in cursor.fetchall()]
@@ -1,5 +1,6 @@
 """Servicios del módulo de Cierre de Caja."""
 from .cash_closure_service import CashClosureService
+from .exportacion_facturas import ExportadorFacturas
 
-__all__ = ["CashClosureService"]
+__all__ = ["CashClosureService", "ExportadorFacturas"]
 
@@ -1,9 +1,12 @@
 """Servicio de lógica de negocio para Cierre de Caja."""
-from typing import List, Optional
+from typing import Iterator, List, Optional
 from datetime import date, time
 
 from ..repository.venta_query_repository import VentaQueryRepository
-from ...sales.domain.models import Venta, ItemVenta
+from ..domain.models import CursorVentas, FiltroVentas, PaginaVentas, ResumenVentas
+from ...config.settings import Settings
+from ...sales.domain.dinero import a_centavos, a_unidades
+from ...sales.domain.models import Venta, ItemVenta, RegistroVenta, RegistroItemVenta
 
 
 class CashClosureService:
@@ -50,6 +53,69 @@ class CashClosureService:
             hora_fin=hora_fin
         )
     
+    def obtener_pagina_ventas(
+        self,
+        filtro: Optional[FiltroVentas] = None,
+        cursor: Optional[CursorVentas] = None,
+        tamaño_pagina: Optional[int] = None
+    ) -> PaginaVentas:
+        """
+        Obtiene una página de ventas, de la más reciente a la más antigua.
+        
+        Args:
+            filtro: Filtros a aplicar (None para todas las ventas)
+            cursor: Cursor devuelto en la página anterior (None para la primera)
+            tamaño_pagina: Ventas por página (por defecto Settings.CASH_CLOSURE_PAGE_SIZE)
+            
+        Returns:
+            PaginaVentas con las ventas y el cursor de la página siguiente
+        """
+        return self.repository.obtener_pagina_ventas(
+            filtro=filtro,
+            cursor_pagina=cursor,
+            tamaño_pagina=tamaño_pagina or Settings.CASH_CLOSURE_PAGE_SIZE
+        )
+    
+    def obtener_resumen_ventas(self, filtro: Optional[FiltroVentas] = None) -> ResumenVentas:
+        """
+        Obtiene la cantidad y el total de las ventas que cumplen un filtro.
+        
+        Args:
+            filtro: Filtros a aplicar (None para todas las ventas)
+            
+        Returns:
+            ResumenVentas con la cantidad y el total
+        """
+        return self.repository.obtener_resumen_ventas(filtro)
+    
+    def iterar_ventas(self, filtro: Optional[FiltroVentas] = None,
+                      tamaño_lote: int = 500) -> Iterator[RegistroVenta]:
+        """
+        Recorre las ventas de un filtro por lotes (para reportes y exportaciones).
+        
+        Args:
+            filtro: Filtros a aplicar (None para todas las ventas)
+            tamaño_lote: Filas leídas por lote
+            
+        Returns:
+            Generador de RegistroVenta en orden cronológico
+        """
+        return self.repository.iter_ventas(filtro, tamaño_lote)
+    
+    def iterar_items(self, filtro: Optional[FiltroVentas] = None,
+                     tamaño_lote: int = 500) -> Iterator[RegistroItemVenta]:
+        """
+        Recorre los items de las ventas de un filtro por lotes.
+        
+        Args:
+            filtro: Filtros sobre las ventas (None para todas)
+            tamaño_lote: Filas leídas por lote
+            
+        Returns:
+            Generador de RegistroItemVenta agrupados por venta
+        """
+        return self.repository.iter_items(filtro, tamaño_lote)
+    
     def calcular_total_ventas(self, ventas: List[Venta]) -> float:
         """
         Calcula el total de las ventas proporcionadas.
@@ -60,7 +126,7 @@ class CashClosureService:
         Returns:
             float: Total de todas las ventas
         """
-        return sum(venta.total for venta in ventas)
+        return a_unidades(sum(a_centavos(venta.total) for venta in ventas))
     
     def obtener_todas_las_ventas(self) -> List[Venta]:
         """Obtiene todas las ventas sin filtros."""
@@ -0,0 +1,177 @@
+"""Exportación por lotes de facturas PDF usando varios procesos."""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, List, Optional, Set, Tuple
+
+try:
+    from pypdf import PdfWriter
+    PYPDF_AVAILABLE = True
+except ImportError:
+    PYPDF_AVAILABLE = False
+
+from ..domain.models import FiltroVentas, ResultadoExportacion
+from .cash_closure_service import CashClosureService
+from ...config.settings import Settings
+from ...sales.domain.models import Venta
+from ...sales.pdf_generator import generar_factura_pdf
+
+
+# (fecha, id de venta, número de factura, ruta o None, error o None)
+ResultadoFactura = Tuple[datetime, int, str, Optional[str], Optional[str]]
+
+
+def _renderizar_lote(ventas: List[Venta], output_dir: str) -> List[ResultadoFactura]:
+    """
+    Genera las facturas de un lote de ventas (se ejecuta en un proceso hijo).
+    
+    Args:
+        ventas: Ventas con sus items
+        output_dir: Directorio de salida
+    
+    Returns:
+        Lista con el resultado de cada factura
+    """
+    resultados = []
+    for venta in ventas:
+        try:
+            ruta = generar_factura_pdf(venta, venta.id, output_dir)
+            resultados.append((venta.fecha, venta.id, venta.numero_factura, ruta, None))
+        except Exception as e:
+            resultados.append((venta.fecha, venta.id, venta.numero_factura, None, str(e)))
+    return resultados
+
+
+def combinar_pdfs(rutas: List[str], destino: str) -> str:
+    """
+    Une varios PDF en un solo documento, en el orden dado.
+    
+    Args:
+        rutas: Archivos PDF a combinar
+        destino: Ruta del archivo combinado
+    
+    Returns:
+        str: Ruta del archivo combinado
+    """
+    if not PYPDF_AVAILABLE:
+        raise ImportError("pypdf no está instalado. Instálelo con: pip install pypdf")
+    
+    writer = PdfWriter()
+    for ruta in rutas:
+        writer.append(ruta)
+    with open(destino, "wb") as archivo:
+        writer.write(archivo)
+    return destino
+
+
+class ExportadorFacturas:
+    """
+    Regenera las facturas de un rango de ventas en paralelo.
+    
+    Las ventas se leen por páginas (keyset) y cada lote se envía a un
+    ProcessPoolExecutor, de modo que la generación escala con los núcleos
+    disponibles. Puede cancelarse desde otro hilo con cancelar().
+    """
+    
+    def __init__(self, service: Optional[CashClosureService] = None,
+                 max_workers: Optional[int] = None, tamaño_lote: Optional[int] = None):
+        """
+        Inicializa el exportador.
+        
+        Args:
+            service: Servicio de cierre de caja (si None, se crea uno nuevo)
+            max_workers: Procesos de generación (si None, Settings.EXPORT_WORKERS;
+                0 usa un proceso por núcleo)
+            tamaño_lote: Facturas por tarea (si None, Settings.EXPORT_BATCH_SIZE)
+        """
+        self.service = service or CashClosureService()
+        workers = Settings.EXPORT_WORKERS if max_workers is None else max_workers
+        self.max_workers = workers or os.cpu_count() or 1
+        self.tamaño_lote = tamaño_lote or Settings.EXPORT_BATCH_SIZE
+        self._cancelado = threading.Event()
+    
+    def cancelar(self):
+        """Solicita detener la exportación en curso."""
+        self._cancelado.set()
+    
+    def exportar(self, filtro: FiltroVentas, output_dir: str, combinar: bool = True,
+                 progreso: Optional[Callable[[int, int], None]] = None) -> ResultadoExportacion:
+        """
+        Genera las facturas de las ventas que cumplen un filtro.
+        
+        Args:
+            filtro: Filtros de ventas (p. ej. FiltroVentas(mes=5, año=2026))
+            output_dir: Directorio donde se guardan las facturas
+            combinar: Si True, une todas las facturas en un PDF de varias páginas
+            progreso: Función llamada con (facturas procesadas, total)
+        
+        Returns:
+            ResultadoExportacion con las rutas generadas y los errores
+            
+        Raises:
+            ImportError: Si se pide combinar y pypdf no está instalado
+        """
+        if combinar and not PYPDF_AVAILABLE:
+            raise ImportError("pypdf no está instalado. Instálelo con: pip install pypdf")
+        
+        self._cancelado.clear()
+        Path(output_dir).mkdir(parents=True, exist_ok=True)
+        
+        resultado = ResultadoExportacion(total=self.service.obtener_resumen_ventas(filtro).cantidad)
+        if progreso:
+            progreso(0, resultado.total)
+        if resultado.total == 0:
+            return resultado
+        
+        facturas: List[ResultadoFactura] = []
+        pendientes: Set[Future] = set()
+        
+        def recoger(terminados: Set[Future]):
+            for future in terminados:
+                facturas.extend(future.result())
+            if terminados and progreso:
+                progreso(len(facturas), resultado.total)
+        
+        # "spawn": no se hereda el estado de Tkinter ni de las conexiones abiertas
+        contexto = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=self.max_workers, mp_context=contexto) as executor:
+            cursor = None
+            hay_mas = True
+            while hay_mas and not self._cancelado.is_set():
+                pagina = self.service.obtener_pagina_ventas(filtro, cursor, self.tamaño_lote)
+                if pagina.ventas:
+                    pendientes.add(executor.submit(_renderizar_lote, pagina.ventas, output_dir))
+                cursor = pagina.siguiente
+                hay_mas = pagina.hay_mas
+                
+                # Limitar las tareas en cola para no cargar todo el rango en memoria
+                while len(pendientes) >= self.max_workers * 2 and not self._cancelado.is_set():
+                    terminados, pendientes = wait(pendientes, timeout=0.5, return_when=FIRST_COMPLETED)
+                    recoger(terminados)
+            
+            while pendientes and not self._cancelado.is_set():
+                terminados, pendientes = wait(pendientes, timeout=0.5, return_when=FIRST_COMPLETED)
+                recoger(terminados)
+            
+            if self._cancelado.is_set():
+                resultado.cancelado = True
+                executor.shutdown(wait=True, cancel_futures=True)
+                recoger({f for f in pendientes if f.done() and not f.cancelled()})
+        
+        facturas.sort(key=lambda factura: (factura[0], factura[1]))
+        for _, _, numero_factura, ruta, error in facturas:
+            if ruta:
+                resultado.generadas.append(ruta)
+            else:
+                resultado.errores.append((numero_factura, error))
+        
+        if combinar and resultado.generadas and not resultado.cancelado:
+            nombre = f"facturas_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+            resultado.archivo_combinado = combinar_pdfs(
+                resultado.generadas, str(Path(output_dir) / nombre)
+            )
+        
+        return resultado
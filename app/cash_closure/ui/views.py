@@ -1,12 +1,16 @@
 """Vista de la interfaz gráfica del módulo de Cierre de Caja."""
+import queue
+import threading
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 from typing import Optional
 from datetime import date, time, datetime
 
 from ...config.settings import Settings, COLORS
 from ...ui.styles import StyleManager
 from ..services.cash_closure_service import CashClosureService
+from ..services.exportacion_facturas import ExportadorFacturas
+from ..domain.models import FiltroVentas, ResultadoExportacion
 
 
 class CashClosureGUI:
@@ -72,6 +76,17 @@ class CashClosureGUI:
         self.detalle_frame = None  # Frame del detalle desplegable
         self.ventas_dict = {}  # Diccionario para mapear items del tree a IDs de venta
         
+        # Paginación del listado (se cargan más páginas al hacer scroll)
+        self.filtro_actual = None
+        self.siguiente_cursor = None
+        self.cargando_pagina = False
+        self.pagina_pendiente = False
+        
+        # Exportación de facturas en segundo plano (el hilo de trabajo deja
+        # progreso y resultado en la cola; la interfaz la revisa con after())
+        self.exportador = None
+        self.eventos_exportacion: "queue.Queue[tuple]" = queue.Queue()
+        
         # Crear interfaz con scroll
         self.create_widgets_with_scroll()
         
@@ -337,6 +352,7 @@ class CashClosureGUI:
         buttons_frame.grid(row=row, column=0, columnspan=4, sticky="ew", pady=(10, 0))
         buttons_frame.grid_columnconfigure(0, weight=1)  # Primer botón
         buttons_frame.grid_columnconfigure(1, weight=2)  # Segundo botón más ancho (doble peso)
+        buttons_frame.grid_columnconfigure(2, weight=1)
         
         btn_aplicar = ttk.Button(
             buttons_frame,
@@ -352,7 +368,15 @@ class CashClosureGUI:
             command=self.limpiar_filtros,
             style="Secondary.TButton"
         )
-        btn_limpiar.grid(row=0, column=1, sticky="ew", padx=(5, 0))
+        btn_limpiar.grid(row=0, column=1, sticky="ew", padx=(5, 5))
+        
+        self.btn_exportar = ttk.Button(
+            buttons_frame,
+            text="[ Exportar Facturas ]",
+            command=self.exportar_facturas,
+            style="Secondary.TButton"
+        )
+        self.btn_exportar.grid(row=0, column=2, sticky="ew", padx=(5, 0))
         
         # Frame contenedor para tabla y detalles (layout vertical)
         table_details_container = tk.Frame(main_frame, bg=c["bg_darkest"])
@@ -384,12 +408,12 @@ class CashClosureGUI:
         table_container.grid_columnconfigure(0, weight=1)
         
         # Scrollbar vertical estilizada
-        v_scrollbar_table = ttk.Scrollbar(
+        self.v_scrollbar_table = ttk.Scrollbar(
             table_container,
             orient=tk.VERTICAL,
             style="Custom.Vertical.TScrollbar"
         )
-        v_scrollbar_table.grid(row=0, column=1, sticky="ns")
+        self.v_scrollbar_table.grid(row=0, column=1, sticky="ns")
         
         # Scrollbar horizontal estilizada
         h_scrollbar_table = ttk.Scrollbar(
@@ -409,11 +433,11 @@ class CashClosureGUI:
             show="headings",
             style="Custom.Treeview",
             height=20,  # Altura de la tabla (número de filas visibles)
-            yscrollcommand=v_scrollbar_table.set,
+            yscrollcommand=self.on_tree_yscroll,
             xscrollcommand=h_scrollbar_table.set
         )
         
-        v_scrollbar_table.config(command=self.tree.yview)
+        self.v_scrollbar_table.config(command=self.tree.yview)
         h_scrollbar_table.config(command=self.tree.xview)
         
         # Colocar la tabla en el grid (se expandirá dinámicamente)
@@ -592,6 +616,16 @@ class CashClosureGUI:
         )
         self.cantidad_ventas_label.pack(fill=tk.X, pady=(5, 0))
         
+        self.exportacion_label = tk.Label(
+            total_content,
+            text="",
+            font=(Settings.FONT_PRIMARY, 10),
+            fg=c["text_secondary"],
+            bg=c["bg_dark"],
+            anchor=tk.E
+        )
+        self.exportacion_label.pack(fill=tk.X, pady=(5, 0))
+        
         # Aplicar tema actual al inicializar
         self.apply_theme()
     
@@ -695,22 +729,44 @@ class CashClosureGUI:
             )
             return
         
-        # Obtener ventas filtradas
+        # Obtener resumen y primera página de ventas filtradas
+        self.filtro_actual = FiltroVentas(
+            fecha_inicio=fecha_dia,
+            fecha_fin=None,
+            mes=mes,
+            año=año,
+            hora_inicio=hora_inicio,
+            hora_fin=hora_fin
+        )
+        self.siguiente_cursor = None
+        self.ventas_dict = {}
+        
         try:
-            ventas = self.service.obtener_ventas_filtradas(
-                fecha_inicio=fecha_dia,
-                fecha_fin=None,
-                mes=mes,
-                año=año,
-                hora_inicio=hora_inicio,
-                hora_fin=hora_fin
-            )
+            resumen = self.service.obtener_resumen_ventas(self.filtro_actual)
+            self.total_label.config(text=f"TOTAL: ${resumen.total:,.2f}")
+            self.cantidad_ventas_label.config(text=f"Cantidad de ventas: {resumen.cantidad}")
             
-            # Limpiar mapeo de ventas
-            self.ventas_dict = {}
+            self.cargar_pagina()
+            
+        except Exception as e:
+            messagebox.showerror(
+                "Error",
+                f"Error al cargar ventas: {str(e)}",
+                parent=self.window
+            )
+    
+    def cargar_pagina(self):
+        """Agrega a la tabla la siguiente página de ventas del filtro actual."""
+        if self.cargando_pagina or self.filtro_actual is None:
+            return
+        
+        self.cargando_pagina = True
+        try:
+            pagina = self.service.obtener_pagina_ventas(self.filtro_actual, self.siguiente_cursor)
+            self.siguiente_cursor = pagina.siguiente
             
             # Agregar ventas a la tabla
-            for venta in ventas:
+            for venta in pagina.ventas:
                 fecha_str = venta.fecha.strftime("%Y-%m-%d") if venta.fecha else ""
                 hora_str = venta.fecha.strftime("%H:%M") if venta.fecha else ""
                 
@@ -732,19 +788,118 @@ class CashClosureGUI:
                 
                 # Guardar mapeo de item del tree a ID de venta
                 self.ventas_dict[item_id] = venta.id
-            
-            # Calcular y mostrar totales
-            total = self.service.calcular_total_ventas(ventas)
-            self.total_label.config(text=f"TOTAL: ${total:,.2f}")
-            self.cantidad_ventas_label.config(text=f"Cantidad de ventas: {len(ventas)}")
-            
+        finally:
+            self.cargando_pagina = False
+    
+    def on_tree_yscroll(self, first, last):
+        """Actualiza la scrollbar y carga más ventas al acercarse al final."""
+        self.v_scrollbar_table.set(first, last)
+        if self.siguiente_cursor is not None and not self.pagina_pendiente and float(last) >= 0.9:
+            self.pagina_pendiente = True
+            self.window.after_idle(self.cargar_pagina_siguiente)
+    
+    def cargar_pagina_siguiente(self):
+        """Carga la siguiente página si aún quedan ventas por mostrar."""
+        self.pagina_pendiente = False
+        if self.siguiente_cursor is None:
+            return
+        try:
+            self.cargar_pagina()
         except Exception as e:
+            self.siguiente_cursor = None
             messagebox.showerror(
                 "Error",
                 f"Error al cargar ventas: {str(e)}",
                 parent=self.window
             )
     
+    def exportar_facturas(self):
+        """Exporta las facturas del filtro actual o cancela la exportación en curso."""
+        if self.exportador is not None:
+            self.exportador.cancelar()
+            self.exportacion_label.config(text="Cancelando exportación...")
+            return
+        
+        output_dir = filedialog.askdirectory(
+            title="Carpeta para las facturas exportadas",
+            parent=self.window
+        )
+        if not output_dir:
+            return
+        
+        filtro = self.filtro_actual or FiltroVentas()
+        self.exportador = ExportadorFacturas(self.service)
+        self.btn_exportar.config(text="[ Cancelar Exportación ]")
+        self.exportacion_label.config(text="Preparando exportación...")
+        
+        def trabajo(exportador: ExportadorFacturas):
+            try:
+                resultado = exportador.exportar(
+                    filtro,
+                    output_dir,
+                    progreso=lambda hechas, total: self.eventos_exportacion.put(("progreso", hechas, total))
+                )
+                self.eventos_exportacion.put(("fin", resultado))
+            except Exception as e:
+                self.eventos_exportacion.put(("error", e))
+        
+        threading.Thread(target=trabajo, args=(self.exportador,), daemon=True).start()
+        self.window.after(200, self.revisar_exportacion)
+    
+    def revisar_exportacion(self):
+        """Muestra el progreso de la exportación y su resultado al terminar."""
+        try:
+            if not self.window.winfo_exists():
+                return
+        except tk.TclError:
+            return
+        
+        while True:
+            try:
+                evento = self.eventos_exportacion.get_nowait()
+            except queue.Empty:
+                break
+            
+            if evento[0] == "progreso":
+                _, hechas, total = evento
+                self.exportacion_label.config(text=f"Exportando facturas: {hechas} de {total}")
+            else:
+                self.exportador = None
+                self.btn_exportar.config(text="[ Exportar Facturas ]")
+                self.exportacion_label.config(text="")
+                if evento[0] == "error":
+                    messagebox.showerror(
+                        "Error",
+                        f"Error al exportar facturas: {str(evento[1])}",
+                        parent=self.window
+                    )
+                else:
+                    self.mostrar_resultado_exportacion(evento[1])
+                return
+        
+        self.window.after(200, self.revisar_exportacion)
+    
+    def mostrar_resultado_exportacion(self, resultado: ResultadoExportacion):
+        """
+        Informa el resultado de una exportación de facturas.
+        
+        Args:
+            resultado: Resultado devuelto por ExportadorFacturas
+        """
+        mensaje = f"Facturas generadas: {len(resultado.generadas)} de {resultado.total}"
+        if resultado.cancelado:
+            mensaje += "\n\nLa exportación fue cancelada."
+        if resultado.archivo_combinado:
+            mensaje += f"\n\nArchivo combinado:\n{resultado.archivo_combinado}"
+        if resultado.errores:
+            detalle = "\n".join(f"{numero}: {error}" for numero, error in resultado.errores[:5])
+            mensaje += f"\n\nErrores ({len(resultado.errores)}):\n{detalle}"
+        
+        if resultado.exitoso or resultado.cancelado:
+            messagebox.showinfo("Exportar Facturas", mensaje, parent=self.window)
+        else:
+            messagebox.showwarning("Exportar Facturas", mensaje, parent=self.window)
+    
     def limpiar_filtros(self):
         """Limpia todos los filtros y recarga todas las ventas."""
         self.fecha_dia_var.set("")
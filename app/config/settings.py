@@ -63,6 +63,83 @@ class Settings:
     
     # Configuración de base de datos
     DATABASE_PATH: str = "inventario.db"
+    SALES_DATABASE_PATH: str = "Ventas.DB"
+    
+    # Pool de conexiones compartido por los repositorios
+    DB_POOL_SIZE: int = 5                   # Conexiones inactivas conservadas por archivo
+    DB_STATEMENT_CACHE_SIZE: int = 128      # Sentencias preparadas cacheadas por conexión
+    DB_HEALTH_CHECK_INTERVAL: float = 30.0  # Segundos de inactividad antes de verificar
+    
+    # Perfil de rendimiento de SQLite aplicado al crear cada conexión
+    # ("safe", "balanced" o "throughput")
+    DB_PERFORMANCE_PROFILE: str = "balanced"
+    DB_PERFORMANCE_PROFILES = {
+        # Valores por defecto de SQLite: máxima durabilidad, un fsync por commit
+        "safe": {
+            "journal_mode": "DELETE",
+            "synchronous": "FULL",
+            "cache_size": -2000,          # KiB (negativo) o páginas (positivo)
+            "mmap_size": 0,
+            "temp_store": "DEFAULT",
+            "busy_timeout": 5000,         # Milisegundos
+        },
+        # WAL + NORMAL: no se pierde integridad, solo el último commit ante un corte de luz
+        "balanced": {
+            "journal_mode": "WAL",
+            "synchronous": "NORMAL",
+            "cache_size": -16000,
+            "mmap_size": 64 * 1024 * 1024,
+            "temp_store": "MEMORY",
+            "busy_timeout": 5000,
+        },
+        # Sin fsync: máximo rendimiento, solo para cajas con UPS o datos reconstruibles
+        "throughput": {
+            "journal_mode": "WAL",
+            "synchronous": "OFF",
+            "cache_size": -64000,
+            "mmap_size": 256 * 1024 * 1024,
+            "temp_store": "MEMORY",
+            "busy_timeout": 10000,
+        },
+    }
+    
+    # Numeración de facturas: cada terminal reserva bloques y los entrega desde memoria
+    INVOICE_BLOCK_SIZE: int = 100
+    INVOICE_TERMINAL_ID: str = ""  # Vacío = nombre del equipo; se le agrega ":<PID>" de cada proceso
+    
+    # Diario local de ventas: acepta la venta aunque la base de datos esté bloqueada
+    SALES_JOURNAL_PATH: str = "ventas_pendientes.jsonl"  # Relativa: junto a SALES_DATABASE_PATH
+    SALES_JOURNAL_LOCK_TIMEOUT_MS: int = 200   # Espera máxima antes de dejar la venta en el diario
+    SALES_JOURNAL_RETRY_SECONDS: float = 2.0   # Reintento del aplicador mientras siga bloqueada
+    
+    # Hilos que generan facturas PDF en segundo plano
+    PDF_WORKERS: int = 1
+    
+    # Productos con menos unidades que este umbral se cuentan como bajo stock en el panel
+    LOW_STOCK_THRESHOLD: int = 10
+    
+    # Máximo de resultados de la búsqueda de productos por texto en la caja
+    PRODUCT_SEARCH_LIMIT: int = 100
+    PRODUCT_SEARCH_DEBOUNCE_MS: int = 200  # Pausa al escribir antes de lanzar la búsqueda automática
+    
+    # Iniciar la caja en modo escáner (cada código leído se agrega al carrito sin diálogos)
+    SCANNER_MODE: bool = False
+    
+    # Comprobante por defecto de cada venta: "pdf", "recibo" o "ambos"
+    SALE_DOCUMENT_MODE: str = "pdf"
+    
+    # Recibos térmicos
+    RECEIPT_WIDTH_MM: int = 80              # 58 u 80
+    RECEIPT_FORMAT: str = "escpos"          # "escpos" o "texto"
+    RECEIPT_OUTPUT: str = "recibos"         # Directorio, dispositivo (/dev/usb/lp0) o tubería
+    RECEIPT_DEVICE_TIMEOUT_S: float = 3.0   # Espera máxima al escribir en un dispositivo o tubería
+    
+    # Exportación de facturas por lotes (0 = un proceso por núcleo)
+    EXPORT_WORKERS: int = 0
+    EXPORT_BATCH_SIZE: int = 25             # Facturas por tarea enviada a cada proceso
+    
+    # Ventas cargadas por página en el listado de Cierre de Caja
+    CASH_CLOSURE_PAGE_SIZE: int = 100
     
     # Configuración de interfaz
     WINDOW_TITLE: str = "⚡ Sistema de Gestión de Inventarios"
@@ -1,8 +1,9 @@
 """Repositorio para acceso a datos de categorías."""
 import sqlite3
 from typing import List, Optional
-from contextlib import contextmanager
 
+from ...database.connection_manager import get_connection_manager
+from ...database.migrations import ensure_schema
 from ..domain.models import Categoria
 
 
@@ -17,58 +18,11 @@ class CategoriaRepository:
             db_path: Ruta al archivo de base de datos SQLite
         """
         self.db_path = db_path
-        self._init_database()
-        self._init_default_categorias()
+        ensure_schema(self.db_path, "inventario")
     
-    def _init_database(self):
-        """Inicializa la base de datos y crea las tablas si no existen."""
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS categorias (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    nombre TEXT NOT NULL UNIQUE,
-                    descripcion TEXT
-                )
-            """)
-            conn.commit()
-    
-    def _init_default_categorias(self):
-        """Inicializa categorías por defecto si la tabla está vacía."""
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT COUNT(*) FROM categorias")
-            count = cursor.fetchone()[0]
-            
-            if count == 0:
-                categorias_default = [
-                    ("Electrónica", "Productos electrónicos"),
-                    ("Ropa", "Ropa y accesorios"),
-                    ("Alimentos", "Productos alimenticios"),
-                    ("Hogar", "Artículos para el hogar"),
-                    ("Deportes", "Artículos deportivos"),
-                    ("Libros", "Libros y material educativo"),
-                    ("Juguetes", "Juguetes y juegos"),
-                    ("Belleza", "Productos de belleza y cuidado personal"),
-                    ("Automotriz", "Accesorios y repuestos automotrices"),
-                    ("Oficina", "Artículos de oficina y papelería")
-                ]
-                
-                for nombre, descripcion in categorias_default:
-                    cursor.execute(
-                        "INSERT INTO categorias (nombre, descripcion) VALUES (?, ?)",
-                        (nombre, descripcion)
-                    )
-                conn.commit()
-    
-    @contextmanager
     def _get_connection(self):
-        """Context manager para obtener conexiones a la base de datos."""
-        conn = sqlite3.connect(self.db_path)
-        try:
-            yield conn
-        finally:
-            conn.close()
+        """Context manager para obtener conexiones del pool compartido."""
+        return get_connection_manager(self.db_path).connection()
     
     def create(self, categoria: Categoria) -> bool:
         """
@@ -1,6 +1,6 @@
 """Repositorio para acceso a datos de temas."""
-import sqlite3
-from contextlib import contextmanager
+from ...database.connection_manager import get_connection_manager
+from ...database.migrations import ensure_schema
 
 
 class ThemeRepository:
@@ -14,37 +14,11 @@ class ThemeRepository:
             db_path: Ruta al archivo de base de datos SQLite
         """
         self.db_path = db_path
-        self._init_database()
+        ensure_schema(self.db_path, "inventario")
     
-    def _init_database(self):
-        """Inicializa la base de datos y crea las tablas si no existen."""
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS app_settings (
-                    key TEXT PRIMARY KEY,
-                    value TEXT NOT NULL
-                )
-            """)
-            conn.commit()
-            
-            # Inicializar tema por defecto si no existe
-            cursor.execute("SELECT value FROM app_settings WHERE key = 'theme'")
-            if not cursor.fetchone():
-                cursor.execute(
-                    "INSERT INTO app_settings (key, value) VALUES (?, ?)",
-                    ("theme", "dark")
-                )
-                conn.commit()
-    
-    @contextmanager
     def _get_connection(self):
-        """Context manager para obtener conexiones a la base de datos."""
-        conn = sqlite3.connect(self.db_path)
-        try:
-            yield conn
-        finally:
-            conn.close()
+        """Context manager para obtener conexiones del pool compartido."""
+        return get_connection_manager(self.db_path).connection()
     
     def get_theme(self) -> str:
         """
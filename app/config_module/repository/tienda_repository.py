@@ -1,8 +1,8 @@
 """Repositorio para acceso a datos de información de tienda."""
-import sqlite3
-from contextlib import contextmanager
 from typing import Optional
 
+from ...database.connection_manager import get_connection_manager
+from ...database.migrations import ensure_schema
 from ..domain.models import TiendaInfo
 
 
@@ -17,29 +17,11 @@ class TiendaRepository:
             db_path: Ruta al archivo de base de datos SQLite
         """
         self.db_path = db_path
-        self._init_database()
+        ensure_schema(self.db_path, "inventario")
     
-    def _init_database(self):
-        """Inicializa la base de datos y crea las tablas si no existen."""
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS tienda_info (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    nombre TEXT NOT NULL,
-                    descripcion TEXT
-                )
-            """)
-            conn.commit()
-    
-    @contextmanager
     def _get_connection(self):
-        """Context manager para obtener conexiones a la base de datos."""
-        conn = sqlite3.connect(self.db_path)
-        try:
-            yield conn
-        finally:
-            conn.close()
+        """Context manager para obtener conexiones del pool compartido."""
+        return get_connection_manager(self.db_path).connection()
     
     def get_tienda_info(self) -> Optional[TiendaInfo]:
         """
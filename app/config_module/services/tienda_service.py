@@ -5,6 +5,16 @@ from ..domain.models import TiendaInfo
 from ..repository.tienda_repository import TiendaRepository
 
 
+# Se incrementa cada vez que se guarda la información de la tienda; permite
+# a quien la cachea (p. ej. la plantilla de facturas) saber si cambió
+_revision = 0
+
+
+def revision_tienda() -> int:
+    """Obtiene la revisión actual de la información de la tienda en este proceso."""
+    return _revision
+
+
 class TiendaService:
     """Servicio para gestionar la información de la tienda."""
     
@@ -45,6 +55,8 @@ class TiendaService:
         
         exito = self.repository.create_or_update_tienda_info(nombre, descripcion)
         if exito:
+            global _revision
+            _revision += 1
             return True, "Información de la tienda guardada exitosamente."
         else:
             return False, "Error al guardar la información de la tienda."
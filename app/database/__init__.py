@@ -0,0 +1,18 @@
+"""Módulo de base de datos - Conexiones compartidas y migraciones."""
+from .connection_manager import (
+    ConnectionManager,
+    apply_performance_profile,
+    get_connection_manager,
+    close_all_connections,
+    fetch_in_batches
+)
+from .migrations import ensure_schema
+
+__all__ = [
+    "ConnectionManager",
+    "apply_performance_profile",
+    "get_connection_manager",
+    "close_all_connections",
+    "fetch_in_batches",
+    "ensure_schema"
+]
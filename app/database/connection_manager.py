@@ -0,0 +1,352 @@
+"""Gestor de conexiones SQLite compartido por todos los repositorios."""
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from ..config.settings import Settings
+
+
+def apply_performance_profile(conn: sqlite3.Connection, profile: Dict[str, Any],
+                              schema: str = "main"):
+    """
+    Aplica los PRAGMA de un perfil de rendimiento a una conexión.
+
+    Args:
+        conn: Conexión a configurar
+        profile: Diccionario con journal_mode, synchronous, cache_size,
+            mmap_size, temp_store y busy_timeout
+        schema: Esquema al que se aplican los PRAGMA por base de datos
+    """
+    # busy_timeout y temp_store son por conexión, el resto por esquema
+    conn.execute(f"PRAGMA busy_timeout = {int(profile['busy_timeout'])}")
+    conn.execute(f"PRAGMA temp_store = {profile['temp_store']}")
+    conn.execute(f"PRAGMA {schema}.journal_mode = {profile['journal_mode']}").fetchone()
+    conn.execute(f"PRAGMA {schema}.synchronous = {profile['synchronous']}")
+    conn.execute(f"PRAGMA {schema}.cache_size = {int(profile['cache_size'])}")
+    conn.execute(f"PRAGMA {schema}.mmap_size = {int(profile['mmap_size'])}").fetchone()
+
+
+def fetch_in_batches(cursor: sqlite3.Cursor, batch_size: int) -> Iterator[tuple]:
+    """
+    Recorre el resultado de una consulta leyendo lotes con fetchmany.
+
+    Args:
+        cursor: Cursor con la consulta ya ejecutada
+        batch_size: Filas leídas por lote
+
+    Yields:
+        tuple: Cada fila del resultado
+    """
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            return
+        yield from rows
+
+
+class ConnectionManager:
+    """
+    Pool de conexiones para un archivo de base de datos SQLite.
+
+    Cada hilo obtiene su propia conexión mientras la usa; al liberarla
+    vuelve al pool para ser reutilizada, de modo que abrir una conexión
+    deja de estar en el camino crítico de cada operación.
+    """
+
+    def __init__(self, db_path: str, pool_size: Optional[int] = None,
+                 cached_statements: Optional[int] = None,
+                 health_check_interval: Optional[float] = None,
+                 profile: Optional[str] = None):
+        """
+        Inicializa el gestor.
+
+        Args:
+            db_path: Ruta al archivo de base de datos SQLite
+            pool_size: Máximo de conexiones inactivas que se conservan
+            cached_statements: Tamaño de la caché de sentencias por conexión
+            health_check_interval: Segundos de inactividad tras los cuales
+                se verifica la conexión antes de reutilizarla
+            profile: Perfil de rendimiento (ver Settings.DB_PERFORMANCE_PROFILES)
+        """
+        self.db_path = db_path
+        self.pool_size = pool_size if pool_size is not None else Settings.DB_POOL_SIZE
+        self.cached_statements = (
+            cached_statements if cached_statements is not None
+            else Settings.DB_STATEMENT_CACHE_SIZE
+        )
+        self.health_check_interval = (
+            health_check_interval if health_check_interval is not None
+            else Settings.DB_HEALTH_CHECK_INTERVAL
+        )
+        self.profile = profile or Settings.DB_PERFORMANCE_PROFILE
+        if self.profile not in Settings.DB_PERFORMANCE_PROFILES:
+            raise ValueError(f"Perfil de rendimiento desconocido: '{self.profile}'")
+
+        self._lock = threading.Lock()
+        self._idle: List[sqlite3.Connection] = []
+        self._last_used: Dict[int, float] = {}
+        self._attachments: Dict[str, str] = {}
+        self._attached: Dict[int, Dict[str, str]] = {}
+        self._local = threading.local()
+        self._closed = False
+
+    def _create_connection(self) -> sqlite3.Connection:
+        """Crea una nueva conexión configurada."""
+        # check_same_thread=False: la conexión puede pasar a otro hilo al
+        # volver al pool, pero nunca la usan dos hilos a la vez.
+        conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            cached_statements=self.cached_statements
+        )
+        apply_performance_profile(conn, Settings.DB_PERFORMANCE_PROFILES[self.profile])
+        return conn
+
+    def _is_healthy(self, conn: sqlite3.Connection) -> bool:
+        """Verifica que una conexión siga siendo utilizable."""
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def _discard(self, conn: sqlite3.Connection):
+        """Cierra una conexión y olvida su estado."""
+        self._last_used.pop(id(conn), None)
+        self._attached.pop(id(conn), None)
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+    def attach(self, alias: str, db_path: str):
+        """
+        Registra una base de datos que se adjunta (ATTACH) a todas las conexiones.
+
+        Permite que una sola conexión, y por lo tanto una sola transacción,
+        escriba en varios archivos. Con journal_mode=WAL la transacción es
+        atómica dentro de cada archivo; ante un corte de energía durante el
+        COMMIT un archivo podría quedar confirmado y el otro no.
+
+        Args:
+            alias: Nombre del esquema adjunto (p. ej. "inventario")
+            db_path: Ruta al archivo de base de datos a adjuntar
+        """
+        if not alias.isidentifier():
+            raise ValueError(f"Alias de esquema inválido: '{alias}'")
+        with self._lock:
+            self._attachments[alias] = os.path.abspath(db_path)
+
+    def _ensure_attached(self, conn: sqlite3.Connection):
+        """Adjunta a la conexión las bases de datos registradas que le falten."""
+        with self._lock:
+            attachments = dict(self._attachments)
+        if not attachments:
+            return
+
+        attached = self._attached.setdefault(id(conn), {})
+        for alias, db_path in attachments.items():
+            if attached.get(alias) == db_path:
+                continue
+            if alias in attached:
+                conn.execute(f"DETACH DATABASE {alias}")
+            conn.execute(f"ATTACH DATABASE ? AS {alias}", (db_path,))
+            apply_performance_profile(
+                conn, Settings.DB_PERFORMANCE_PROFILES[self.profile], schema=alias
+            )
+            attached[alias] = db_path
+
+    def _acquire(self) -> sqlite3.Connection:
+        """Toma una conexión del pool o crea una nueva."""
+        while True:
+            with self._lock:
+                if self._closed:
+                    raise sqlite3.ProgrammingError(
+                        f"El gestor de conexiones de '{self.db_path}' está cerrado."
+                    )
+                conn = self._idle.pop() if self._idle else None
+                last_used = self._last_used.get(id(conn), 0.0) if conn else 0.0
+
+            if conn is None:
+                conn = self._create_connection()
+            elif (time.monotonic() - last_used >= self.health_check_interval
+                    and not self._is_healthy(conn)):
+                # Solo se verifica la salud si la conexión estuvo inactiva un tiempo
+                self._discard(conn)
+                continue
+
+            self._ensure_attached(conn)
+            return conn
+
+    def _release(self, conn: sqlite3.Connection):
+        """Devuelve una conexión al pool (o la cierra si el pool está lleno)."""
+        # No dejar transacciones abiertas en conexiones compartidas
+        if conn.in_transaction:
+            try:
+                conn.rollback()
+            except sqlite3.Error:
+                self._discard(conn)
+                return
+
+        with self._lock:
+            if not self._closed and len(self._idle) < self.pool_size:
+                self._last_used[id(conn)] = time.monotonic()
+                self._idle.append(conn)
+                return
+        self._discard(conn)
+
+    @contextmanager
+    def connection(self):
+        """
+        Context manager que entrega la conexión del hilo actual.
+
+        Las llamadas anidadas en el mismo hilo reutilizan la misma conexión;
+        se devuelve al pool al salir del bloque más externo. No debe usarse
+        en generadores que hacen yield dentro del bloque (ver
+        dedicated_connection).
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            self._local.depth += 1
+            try:
+                yield conn
+            finally:
+                self._local.depth -= 1
+            return
+
+        conn = self._acquire()
+        self._local.conn = conn
+        self._local.depth = 1
+        try:
+            yield conn
+        finally:
+            self._local.conn = None
+            self._local.depth = 0
+            self._release(conn)
+
+    @contextmanager
+    def dedicated_connection(self):
+        """
+        Context manager que entrega una conexión del pool sin asociarla al hilo.
+
+        Es para generadores que van entregando filas (yield) mientras leen:
+        connection() comparte una sola conexión por hilo, y otra consulta
+        hecha entre dos yield (o un segundo generador) la usaría o la
+        devolvería al pool mientras el cursor sigue leyendo. La conexión
+        dedicada la usa solo quien la pidió y vuelve al pool al salir del
+        bloque (al agotarse o cerrarse el generador).
+        """
+        conn = self._acquire()
+        try:
+            yield conn
+        finally:
+            self._release(conn)
+
+    @contextmanager
+    def transaction(self, busy_timeout_ms: Optional[int] = None):
+        """
+        Context manager que ejecuta un bloque en una transacción BEGIN IMMEDIATE.
+
+        Confirma al salir del bloque y revierte si se produce una excepción.
+        Las bases de datos registradas con attach() están disponibles.
+
+        Args:
+            busy_timeout_ms: Espera máxima por un bloqueo solo para esta
+                transacción (si None, la del perfil de rendimiento)
+
+        Yields:
+            sqlite3.Cursor: Cursor de la conexión del hilo actual
+        """
+        with self.connection() as conn:
+            if conn.in_transaction:
+                raise sqlite3.ProgrammingError("Ya hay una transacción abierta en esta conexión.")
+            self._ensure_attached(conn)
+            if busy_timeout_ms is not None:
+                conn.execute(f"PRAGMA busy_timeout = {int(busy_timeout_ms)}")
+            try:
+                cursor = conn.cursor()
+                cursor.execute("BEGIN IMMEDIATE")
+                try:
+                    yield cursor
+                    conn.commit()
+                except BaseException:
+                    conn.rollback()
+                    raise
+            finally:
+                if busy_timeout_ms is not None:
+                    busy_timeout = Settings.DB_PERFORMANCE_PROFILES[self.profile]["busy_timeout"]
+                    conn.execute(f"PRAGMA busy_timeout = {int(busy_timeout)}")
+
+    def health_check(self) -> bool:
+        """
+        Verifica todas las conexiones inactivas y descarta las inválidas.
+
+        Returns:
+            bool: True si la base de datos responde correctamente
+        """
+        with self._lock:
+            idle = list(self._idle)
+            self._idle.clear()
+
+        for conn in idle:
+            if self._is_healthy(conn):
+                self._release(conn)
+            else:
+                self._discard(conn)
+
+        try:
+            with self.connection() as conn:
+                return self._is_healthy(conn)
+        except sqlite3.Error:
+            return False
+
+    def close(self):
+        """Cierra todas las conexiones inactivas y deshabilita el gestor."""
+        with self._lock:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+        for conn in idle:
+            self._discard(conn)
+
+
+_managers: Dict[str, ConnectionManager] = {}
+_managers_lock = threading.Lock()
+
+
+def _normalize_path(db_path: str) -> str:
+    """Normaliza la ruta para que cada archivo tenga un único gestor."""
+    if db_path == ":memory:":
+        return db_path
+    return os.path.abspath(db_path)
+
+
+def get_connection_manager(db_path: str) -> ConnectionManager:
+    """
+    Obtiene el gestor de conexiones compartido para un archivo de base de datos.
+
+    Args:
+        db_path: Ruta al archivo de base de datos SQLite
+
+    Returns:
+        ConnectionManager: Gestor único por archivo dentro del proceso
+    """
+    key = _normalize_path(db_path)
+    with _managers_lock:
+        manager = _managers.get(key)
+        if manager is None or manager._closed:
+            manager = ConnectionManager(db_path)
+            _managers[key] = manager
+        return manager
+
+
+def close_all_connections():
+    """Cierra todos los gestores de conexiones del proceso."""
+    with _managers_lock:
+        managers = list(_managers.values())
+        _managers.clear()
+    for manager in managers:
+        manager.close()
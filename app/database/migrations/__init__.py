@@ -0,0 +1,147 @@
+"""
+Motor de migraciones versionadas del esquema SQLite.
+
+Cada base de datos tiene una lista ordenada de migraciones; las versiones
+aplicadas se registran en la tabla schema_version. ensure_schema se ejecuta
+una sola vez por archivo y esquema dentro del proceso, de modo que crear
+repositorios deja de ejecutar DDL en cada instancia.
+"""
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+from ..connection_manager import get_connection_manager, _normalize_path
+from .base import Migration
+from . import inventario, ventas
+
+
+SCHEMAS: Dict[str, List[Migration]] = {
+    "inventario": inventario.MIGRATIONS,
+    "ventas": ventas.MIGRATIONS,
+}
+
+_applied: Dict[Tuple[str, str], int] = {}
+_applied_lock = threading.Lock()
+
+
+def _create_version_table(conn: sqlite3.Connection):
+    """Crea la tabla de control de versiones si no existe."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            schema TEXT NOT NULL,
+            version INTEGER NOT NULL,
+            description TEXT NOT NULL,
+            applied_at TIMESTAMP NOT NULL,
+            PRIMARY KEY (schema, version)
+        )
+    """)
+
+
+def current_version(conn: sqlite3.Connection, schema: str) -> int:
+    """
+    Obtiene la última versión aplicada de un esquema.
+
+    Args:
+        conn: Conexión a la base de datos
+        schema: Nombre del esquema (ver SCHEMAS)
+
+    Returns:
+        int: Versión actual (0 si no se ha aplicado ninguna migración)
+    """
+    _create_version_table(conn)
+    row = conn.execute(
+        "SELECT MAX(version) FROM schema_version WHERE schema = ?", (schema,)
+    ).fetchone()
+    return row[0] or 0
+
+
+def migrate(conn: sqlite3.Connection, schema: str) -> int:
+    """
+    Aplica las migraciones pendientes de un esquema.
+
+    Cada migración se ejecuta en su propia transacción junto con su registro
+    en schema_version; si falla, se revierte y se propaga el error.
+
+    Args:
+        conn: Conexión a la base de datos
+        schema: Nombre del esquema (ver SCHEMAS)
+
+    Returns:
+        int: Versión del esquema tras aplicar las migraciones
+
+    Raises:
+        ValueError: Si el esquema no existe
+    """
+    if schema not in SCHEMAS:
+        raise ValueError(f"Esquema desconocido: '{schema}'")
+
+    version = current_version(conn, schema)
+    conn.commit()
+
+    for migration in sorted(SCHEMAS[schema], key=lambda m: m.version):
+        if migration.version <= version:
+            continue
+
+        # BEGIN IMMEDIATE evita que otro proceso aplique la misma migración
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            version = current_version(conn, schema)
+            if migration.version > version:
+                migration.apply(conn.cursor())
+                conn.execute(
+                    "INSERT INTO schema_version (schema, version, description, applied_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (schema, migration.version, migration.description, datetime.now())
+                )
+                version = migration.version
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+    return version
+
+
+def ensure_schema(db_path: str, schema: str) -> int:
+    """
+    Garantiza que la base de datos tenga el esquema actualizado.
+
+    Solo la primera llamada por archivo y esquema consulta la base de datos;
+    las siguientes regresan inmediatamente.
+
+    Args:
+        db_path: Ruta al archivo de base de datos SQLite
+        schema: Nombre del esquema (ver SCHEMAS)
+
+    Returns:
+        int: Versión del esquema
+    """
+    key = (_normalize_path(db_path), schema)
+    version = _applied.get(key)
+    if version is not None:
+        return version
+
+    with _applied_lock:
+        version = _applied.get(key)
+        if version is None:
+            with get_connection_manager(db_path).connection() as conn:
+                version = migrate(conn, schema)
+            _applied[key] = version
+        return version
+
+
+def reset_schema_cache():
+    """Olvida qué esquemas se verificaron (p. ej. tras reemplazar un archivo)."""
+    with _applied_lock:
+        _applied.clear()
+
+
+__all__ = [
+    "Migration",
+    "SCHEMAS",
+    "current_version",
+    "migrate",
+    "ensure_schema",
+    "reset_schema_cache",
+]
@@ -0,0 +1,38 @@
+"""Definición de una migración de esquema y utilidades comunes."""
+import sqlite3
+from dataclasses import dataclass
+from typing import Callable
+
+from ...utils.fechas import normalizar_fecha
+
+
+@dataclass(frozen=True)
+class Migration:
+    """Paso versionado del esquema de una base de datos."""
+    
+    version: int
+    description: str
+    apply: Callable[[sqlite3.Cursor], None]
+
+
+def normalize_date_column(cursor: sqlite3.Cursor, table: str, column: str = "fecha"):
+    """
+    Reescribe una columna de fecha al formato de ancho fijo ordenable.
+
+    Los valores nulos o que no se pueden interpretar se dejan como están:
+    reemplazarlos por una fecha inventada movería registros históricos a
+    otro día en los reportes.
+
+    Args:
+        cursor: Cursor de la transacción de la migración
+        table: Tabla a convertir
+        column: Columna de fecha
+    """
+    cursor.execute(f"SELECT rowid, {column} FROM {table}")
+    cambios = []
+    for rowid, valor in cursor.fetchall():
+        normalizada = normalizar_fecha(valor)
+        if normalizada is not None and normalizada != valor:
+            cambios.append((normalizada, rowid))
+    if cambios:
+        cursor.executemany(f"UPDATE {table} SET {column} = ? WHERE rowid = ?", cambios)
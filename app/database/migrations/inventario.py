@@ -0,0 +1,277 @@
+"""Migraciones de la base de datos de inventario (inventario.db)."""
+import sqlite3
+
+from ...utils.texto import normalizar_texto
+from .base import Migration, normalize_date_column
+
+
+def _columnas(cursor: sqlite3.Cursor, tabla: str) -> list:
+    """Obtiene los nombres de columna de una tabla."""
+    cursor.execute(f"PRAGMA table_info({tabla})")
+    return [row[1] for row in cursor.fetchall()]
+
+
+def _crear_productos(cursor: sqlite3.Cursor):
+    """Tabla de productos, incluyendo columnas añadidas en versiones antiguas."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS productos (
+            codigo TEXT PRIMARY KEY,
+            nombre TEXT NOT NULL,
+            categoria TEXT NOT NULL,
+            cantidad INTEGER NOT NULL,
+            precio_unitario REAL NOT NULL,
+            ganancia REAL NOT NULL DEFAULT 0.0,
+            valor_venta REAL NOT NULL DEFAULT 0.0
+        )
+    """)
+    
+    # Bases de datos anteriores a las columnas de ganancia y valor de venta
+    columns = _columnas(cursor, "productos")
+    if 'ganancia' not in columns:
+        cursor.execute("ALTER TABLE productos ADD COLUMN ganancia REAL NOT NULL DEFAULT 0.0")
+    if 'valor_venta' not in columns:
+        cursor.execute("ALTER TABLE productos ADD COLUMN valor_venta REAL NOT NULL DEFAULT 0.0")
+        cursor.execute("""
+            UPDATE productos
+            SET valor_venta = precio_unitario + precio_unitario * (ganancia / 100.0)
+        """)
+
+
+def _crear_categorias(cursor: sqlite3.Cursor):
+    """Tabla de categorías con las categorías por defecto."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS categorias (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            nombre TEXT NOT NULL UNIQUE,
+            descripcion TEXT
+        )
+    """)
+    
+    cursor.execute("SELECT COUNT(*) FROM categorias")
+    if cursor.fetchone()[0] == 0:
+        categorias_default = [
+            ("Electrónica", "Productos electrónicos"),
+            ("Ropa", "Ropa y accesorios"),
+            ("Alimentos", "Productos alimenticios"),
+            ("Hogar", "Artículos para el hogar"),
+            ("Deportes", "Artículos deportivos"),
+            ("Libros", "Libros y material educativo"),
+            ("Juguetes", "Juguetes y juegos"),
+            ("Belleza", "Productos de belleza y cuidado personal"),
+            ("Automotriz", "Accesorios y repuestos automotrices"),
+            ("Oficina", "Artículos de oficina y papelería")
+        ]
+        cursor.executemany(
+            "INSERT INTO categorias (nombre, descripcion) VALUES (?, ?)",
+            categorias_default
+        )
+
+
+def _crear_app_settings(cursor: sqlite3.Cursor):
+    """Tabla de configuración de la aplicación con el tema por defecto."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS app_settings (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        )
+    """)
+    cursor.execute("INSERT OR IGNORE INTO app_settings (key, value) VALUES ('theme', 'dark')")
+
+
+def _crear_tienda_info(cursor: sqlite3.Cursor):
+    """Tabla de información de la tienda."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS tienda_info (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            nombre TEXT NOT NULL,
+            descripcion TEXT
+        )
+    """)
+
+
+def _crear_clientes(cursor: sqlite3.Cursor):
+    """Tabla de clientes."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS clientes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            nombre TEXT NOT NULL,
+            documento TEXT,
+            telefono TEXT,
+            email TEXT,
+            direccion TEXT,
+            fecha_registro TIMESTAMP NOT NULL
+        )
+    """)
+
+
+def _crear_gastos(cursor: sqlite3.Cursor):
+    """Tabla de gastos operativos."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS gastos (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            fecha TIMESTAMP NOT NULL,
+            categoria TEXT NOT NULL,
+            descripcion TEXT NOT NULL,
+            monto REAL NOT NULL,
+            metodo_pago TEXT NOT NULL,
+            observaciones TEXT
+        )
+    """)
+
+
+def _indexar_fechas_gastos(cursor: sqlite3.Cursor):
+    """Fechas de gastos en formato ordenable e índice por fecha."""
+    normalize_date_column(cursor, "gastos")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_gastos_fecha ON gastos(fecha)")
+
+
+def _indexar_busqueda_productos(cursor: sqlite3.Cursor, columna_id: str = "rowid"):
+    """
+    Índice FTS5 de código, nombre y categoría sincronizado con triggers.
+
+    Args:
+        cursor: Cursor de la transacción de la migración
+        columna_id: Columna de productos que identifica cada fila en el índice
+    """
+    try:
+        cursor.execute(f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS productos_fts USING fts5(
+                codigo, nombre, categoria,
+                content='productos', content_rowid='{columna_id}',
+                tokenize='unicode61 remove_diacritics 2'
+            )
+        """)
+    except sqlite3.OperationalError:
+        # SQLite compilado sin FTS5: ProductRepository busca con LIKE
+        return
+    
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS productos_fts_ai AFTER INSERT ON productos BEGIN
+            INSERT INTO productos_fts(rowid, codigo, nombre, categoria)
+            VALUES (new.{columna_id}, new.codigo, new.nombre, new.categoria);
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS productos_fts_ad AFTER DELETE ON productos BEGIN
+            INSERT INTO productos_fts(productos_fts, rowid, codigo, nombre, categoria)
+            VALUES ('delete', old.{columna_id}, old.codigo, old.nombre, old.categoria);
+        END
+    """)
+    # Solo las columnas indexadas: descontar stock en cada venta no toca el índice
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS productos_fts_au
+        AFTER UPDATE OF codigo, nombre, categoria ON productos BEGIN
+            INSERT INTO productos_fts(productos_fts, rowid, codigo, nombre, categoria)
+            VALUES ('delete', old.{columna_id}, old.codigo, old.nombre, old.categoria);
+            INSERT INTO productos_fts(rowid, codigo, nombre, categoria)
+            VALUES (new.{columna_id}, new.codigo, new.nombre, new.categoria);
+        END
+    """)
+    cursor.execute("INSERT INTO productos_fts(productos_fts) VALUES ('rebuild')")
+
+
+def _normalizar_nombres(cursor: sqlite3.Cursor):
+    """Columna nombre_normalizado (sin tildes ni mayúsculas) e índice en productos y clientes."""
+    for tabla in ("productos", "clientes"):
+        if "nombre_normalizado" not in _columnas(cursor, tabla):
+            cursor.execute(
+                f"ALTER TABLE {tabla} ADD COLUMN nombre_normalizado TEXT NOT NULL DEFAULT ''"
+            )
+        cursor.execute(f"SELECT rowid, nombre FROM {tabla}")
+        cursor.executemany(
+            f"UPDATE {tabla} SET nombre_normalizado = ? WHERE rowid = ?",
+            [(normalizar_texto(nombre), rowid) for rowid, nombre in cursor.fetchall()]
+        )
+        cursor.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_{tabla}_nombre_normalizado "
+            f"ON {tabla}(nombre_normalizado)"
+        )
+
+
+def _indexar_documento_clientes(cursor: sqlite3.Cursor):
+    """Índice de búsqueda de clientes por documento."""
+    # No es UNIQUE: el documento es opcional y puede haber duplicados previos
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_clientes_documento ON clientes(documento)")
+
+
+def _contar_cambios_productos(cursor: sqlite3.Cursor):
+    """Contador de cambios de productos que avanzan triggers en cada escritura."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS productos_revision (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            revision INTEGER NOT NULL
+        )
+    """)
+    cursor.execute("INSERT OR IGNORE INTO productos_revision (id, revision) VALUES (1, 0)")
+    _crear_triggers_revision(cursor)
+
+
+def _crear_triggers_revision(cursor: sqlite3.Cursor):
+    """Triggers que avanzan productos_revision en cada escritura de productos."""
+    # Cualquier escritor (esta aplicación, otra instancia o una herramienta
+    # externa) avanza el contador; CatalogoProductos lo usa para saber si
+    # todos los cambios desde su última lectura fueron propios
+    for evento, sufijo in (("INSERT", "ai"), ("UPDATE", "au"), ("DELETE", "ad")):
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS productos_revision_{sufijo}
+            AFTER {evento} ON productos BEGIN
+                UPDATE productos_revision SET revision = revision + 1 WHERE id = 1;
+            END
+        """)
+
+
+def _fijar_id_productos(cursor: sqlite3.Cursor):
+    """
+    Reconstruye productos con una clave entera explícita (id) para el índice FTS5.
+
+    Con codigo TEXT PRIMARY KEY el rowid es implícito y VACUUM puede
+    renumerarlo, dejando productos_fts apuntando a filas equivocadas. Una
+    columna INTEGER PRIMARY KEY es el rowid y VACUUM la conserva. codigo
+    sigue siendo UNIQUE (lo usan las búsquedas y ON CONFLICT(codigo)).
+    """
+    cursor.execute("""
+        CREATE TABLE productos_nueva (
+            id INTEGER PRIMARY KEY,
+            codigo TEXT NOT NULL UNIQUE,
+            nombre TEXT NOT NULL,
+            categoria TEXT NOT NULL,
+            cantidad INTEGER NOT NULL,
+            precio_unitario REAL NOT NULL,
+            ganancia REAL NOT NULL DEFAULT 0.0,
+            valor_venta REAL NOT NULL DEFAULT 0.0,
+            nombre_normalizado TEXT NOT NULL DEFAULT ''
+        )
+    """)
+    cursor.execute("""
+        INSERT INTO productos_nueva
+            (id, codigo, nombre, categoria, cantidad, precio_unitario, ganancia, valor_venta,
+             nombre_normalizado)
+        SELECT rowid, codigo, nombre, categoria, cantidad, precio_unitario, ganancia, valor_venta,
+               nombre_normalizado
+        FROM productos
+    """)
+    # DROP TABLE elimina también sus índices y triggers; se recrean sobre la tabla nueva
+    cursor.execute("DROP TABLE IF EXISTS productos_fts")
+    cursor.execute("DROP TABLE productos")
+    cursor.execute("ALTER TABLE productos_nueva RENAME TO productos")
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_productos_nombre_normalizado ON productos(nombre_normalizado)"
+    )
+    _indexar_busqueda_productos(cursor, "id")
+    _crear_triggers_revision(cursor)
+
+
+MIGRATIONS = [
+    Migration(1, "Tabla de productos con ganancia y valor de venta", _crear_productos),
+    Migration(2, "Tabla de categorías con valores por defecto", _crear_categorias),
+    Migration(3, "Configuración de la aplicación (tema)", _crear_app_settings),
+    Migration(4, "Información de la tienda", _crear_tienda_info),
+    Migration(5, "Tabla de clientes", _crear_clientes),
+    Migration(6, "Tabla de gastos", _crear_gastos),
+    Migration(7, "Fechas normalizadas e índice de gastos por fecha", _indexar_fechas_gastos),
+    Migration(8, "Índice de búsqueda de texto completo de productos", _indexar_busqueda_productos),
+    Migration(9, "Nombres normalizados e indexados de productos y clientes", _normalizar_nombres),
+    Migration(10, "Índice de clientes por documento", _indexar_documento_clientes),
+    Migration(11, "Contador de cambios de productos", _contar_cambios_productos),
+    Migration(12, "Clave entera de productos para el índice de búsqueda", _fijar_id_productos),
+]
@@ -0,0 +1,152 @@
+"""Migraciones de la base de datos de ventas (Ventas.DB)."""
+import sqlite3
+
+from .base import Migration, normalize_date_column
+
+
+def _crear_ventas(cursor: sqlite3.Cursor):
+    """Tablas de ventas, items y numeración de facturas."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS ventas (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            numero_factura TEXT UNIQUE NOT NULL,
+            fecha TIMESTAMP NOT NULL,
+            cliente_id INTEGER,
+            subtotal REAL NOT NULL,
+            descuento_total REAL NOT NULL DEFAULT 0,
+            impuesto_total REAL NOT NULL DEFAULT 0,
+            total REAL NOT NULL,
+            metodo_pago TEXT NOT NULL,
+            observaciones TEXT,
+            FOREIGN KEY (cliente_id) REFERENCES clientes(id)
+        )
+    """)
+    
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS items_venta (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            venta_id INTEGER NOT NULL,
+            codigo_producto TEXT NOT NULL,
+            nombre_producto TEXT NOT NULL,
+            cantidad INTEGER NOT NULL,
+            precio_unitario REAL NOT NULL,
+            descuento REAL NOT NULL DEFAULT 0,
+            impuesto REAL NOT NULL DEFAULT 0,
+            subtotal REAL NOT NULL,
+            FOREIGN KEY (venta_id) REFERENCES ventas(id) ON DELETE CASCADE
+        )
+    """)
+    
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS configuracion_factura (
+            clave TEXT PRIMARY KEY,
+            valor TEXT NOT NULL
+        )
+    """)
+    cursor.execute(
+        "INSERT OR IGNORE INTO configuracion_factura (clave, valor) VALUES ('ultimo_numero', '0')"
+    )
+
+
+def _agregar_id_venta(cursor: sqlite3.Cursor):
+    """Columna id_venta en items_venta (espejo de venta_id)."""
+    cursor.execute("PRAGMA table_info(items_venta)")
+    if 'id_venta' not in [row[1] for row in cursor.fetchall()]:
+        cursor.execute("ALTER TABLE items_venta ADD COLUMN id_venta INTEGER")
+        cursor.execute("UPDATE items_venta SET id_venta = venta_id WHERE id_venta IS NULL")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_items_venta_id_venta ON items_venta(id_venta)")
+
+
+def _indexar_fechas(cursor: sqlite3.Cursor):
+    """Fechas en formato ordenable e índices para filtros por fecha e items."""
+    normalize_date_column(cursor, "ventas")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_ventas_fecha ON ventas(fecha)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_items_venta_venta_id ON items_venta(venta_id)")
+
+
+def _crear_bloques_factura(cursor: sqlite3.Cursor):
+    """Bloques de números de factura reservados por terminal y huecos auditables."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS bloques_factura (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            terminal TEXT NOT NULL,
+            inicio INTEGER NOT NULL,
+            fin INTEGER NOT NULL,
+            fecha_reserva TIMESTAMP NOT NULL,
+            fecha_cierre TIMESTAMP
+        )
+    """)
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_bloques_factura_abiertos "
+        "ON bloques_factura(terminal) WHERE fecha_cierre IS NULL"
+    )
+    
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS huecos_factura (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            bloque_id INTEGER NOT NULL,
+            numero_inicio INTEGER NOT NULL,
+            numero_fin INTEGER NOT NULL,
+            motivo TEXT NOT NULL,
+            fecha TIMESTAMP NOT NULL,
+            FOREIGN KEY (bloque_id) REFERENCES bloques_factura(id)
+        )
+    """)
+
+
+def _resumir_ventas_por_dia(cursor: sqlite3.Cursor):
+    """Cantidad y total de ventas por día, mantenidos con triggers."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS ventas_por_dia (
+            dia TEXT PRIMARY KEY,
+            cantidad INTEGER NOT NULL DEFAULT 0,
+            total_centavos INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID
+    """)
+    # El día son los 10 primeros caracteres de la fecha normalizada (YYYY-MM-DD)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS ventas_por_dia_ai AFTER INSERT ON ventas BEGIN
+            INSERT INTO ventas_por_dia(dia, cantidad, total_centavos)
+            VALUES (substr(new.fecha, 1, 10), 1, CAST(ROUND(new.total * 100) AS INTEGER))
+            ON CONFLICT(dia) DO UPDATE SET
+                cantidad = cantidad + 1,
+                total_centavos = total_centavos + excluded.total_centavos;
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS ventas_por_dia_ad AFTER DELETE ON ventas BEGIN
+            UPDATE ventas_por_dia SET
+                cantidad = cantidad - 1,
+                total_centavos = total_centavos - CAST(ROUND(old.total * 100) AS INTEGER)
+            WHERE dia = substr(old.fecha, 1, 10);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS ventas_por_dia_au
+        AFTER UPDATE OF fecha, total ON ventas BEGIN
+            UPDATE ventas_por_dia SET
+                cantidad = cantidad - 1,
+                total_centavos = total_centavos - CAST(ROUND(old.total * 100) AS INTEGER)
+            WHERE dia = substr(old.fecha, 1, 10);
+            INSERT INTO ventas_por_dia(dia, cantidad, total_centavos)
+            VALUES (substr(new.fecha, 1, 10), 1, CAST(ROUND(new.total * 100) AS INTEGER))
+            ON CONFLICT(dia) DO UPDATE SET
+                cantidad = cantidad + 1,
+                total_centavos = total_centavos + excluded.total_centavos;
+        END
+    """)
+    cursor.execute("DELETE FROM ventas_por_dia")
+    cursor.execute("""
+        INSERT INTO ventas_por_dia(dia, cantidad, total_centavos)
+        SELECT substr(fecha, 1, 10), COUNT(*), SUM(CAST(ROUND(total * 100) AS INTEGER))
+        FROM ventas GROUP BY substr(fecha, 1, 10)
+    """)
+
+
+MIGRATIONS = [
+    Migration(1, "Tablas de ventas, items y numeración de facturas", _crear_ventas),
+    Migration(2, "Columna id_venta en items_venta", _agregar_id_venta),
+    Migration(3, "Fechas normalizadas e índices de ventas por fecha", _indexar_fechas),
+    Migration(4, "Bloques de numeración de facturas y huecos", _crear_bloques_factura),
+    Migration(5, "Resumen de ventas por día para el panel principal", _resumir_ventas_por_dia),
+]
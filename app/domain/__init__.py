@@ -1,5 +1,4 @@
 """Módulo de dominio - Modelos de datos."""
-from .models import Producto
-
-__all__ = ["Producto"]
+from .models import EstadisticasPanel, Producto, ResumenInventario, ResumenOperacionMasiva
 
+__all__ = ["EstadisticasPanel", "Producto", "ResumenInventario", "ResumenOperacionMasiva"]
@@ -1,6 +1,6 @@
 """Modelos de dominio del sistema de inventario."""
-from dataclasses import dataclass
-from typing import Optional, Tuple
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
 
 
 @dataclass
@@ -107,3 +107,55 @@ class Producto:
         
         return producto
 
+
+@dataclass
+class ResumenOperacionMasiva:
+    """Resultado de una carga o eliminación masiva de productos."""
+    
+    insertados: int = 0
+    actualizados: int = 0
+    eliminados: int = 0
+    rechazados: List[Tuple[str, str]] = field(default_factory=list)  # (código, motivo)
+    no_encontrados: List[str] = field(default_factory=list)
+    
+    @property
+    def exitoso(self) -> bool:
+        """Indica si todos los registros se procesaron sin rechazos."""
+        return not self.rechazados and not self.no_encontrados
+    
+    def mensaje(self) -> str:
+        """Genera un mensaje de resumen para mostrar al usuario."""
+        partes = []
+        if self.insertados or self.actualizados:
+            partes.append(f"{self.insertados} agregados, {self.actualizados} actualizados")
+        if self.eliminados:
+            partes.append(f"{self.eliminados} eliminados")
+        if self.rechazados:
+            partes.append(f"{len(self.rechazados)} rechazados")
+        if self.no_encontrados:
+            partes.append(f"{len(self.no_encontrados)} no encontrados")
+        return ", ".join(partes) + "." if partes else "No se procesó ningún producto."
+
+
+@dataclass
+class ResumenInventario:
+    """Totales del inventario para el panel principal."""
+    
+    total_productos: int = 0
+    valor_total: float = 0.0
+    bajo_stock: int = 0
+
+
+@dataclass
+class EstadisticasPanel:
+    """Cifras del panel de resumen de la ventana principal."""
+    
+    total_productos: int = 0
+    valor_total_inventario: float = 0.0
+    productos_bajo_stock: int = 0
+    total_ventas: int = 0
+    total_ingresos: float = 0.0
+    ventas_hoy: int = 0
+    ingresos_hoy: float = 0.0
+    ventas_mes: int = 0
+    ingresos_mes: float = 0.0
@@ -11,7 +11,8 @@ from .form_handlers import load_product_to_form
 def refresh_table(
     tree: ttk.Treeview,
     service: InventoryService,
-    summary_labels: Dict[str, tk.Label]
+    summary_labels: Dict[str, tk.Label],
+    filtro: str = ""
 ):
     """
     Actualiza la tabla y el resumen con los productos actuales.
@@ -20,13 +21,14 @@ def refresh_table(
         tree: Treeview a actualizar
         service: Servicio de inventario
         summary_labels: Labels del resumen para actualizar
+        filtro: Texto de búsqueda (vacío = todos los productos)
     """
     # Limpiar tabla
     for item in tree.get_children():
         tree.delete(item)
     
-    # Obtener todos los productos
-    productos = service.obtener_todos_los_productos()
+    # Obtener los productos que coinciden con la búsqueda
+    productos = service.buscar_productos(filtro)
     
     # Variables para resumen
     total_productos = len(productos)
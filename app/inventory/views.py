@@ -78,6 +78,8 @@ class InventoryGUI:
         
         # Referencias a widgets
         self.tree = None
+        self.buscar_entry: Optional[tk.Entry] = None
+        self._busqueda_programada = None
         self.summary_labels: Dict[str, tk.Label] = {}
         
         # Crear interfaz
@@ -132,8 +134,10 @@ class InventoryGUI:
         bottom_frame.grid_rowconfigure(1, weight=0)  # Resumen fijo
         
         # Tabla de datos
-        self.tree = create_table_widget(bottom_frame)
+        self.tree, self.buscar_entry = create_table_widget(bottom_frame)
         self.tree.bind("<<TreeviewSelect>>", self._on_producto_seleccionado_event)
+        self.buscar_entry.bind("<KeyRelease>", self._on_busqueda_cambio)
+        self.buscar_entry.bind("<Return>", lambda e: self.refresh())
         
         # Resumen total
         self.summary_labels = create_summary_widget(bottom_frame, self.recalcular)
@@ -175,6 +179,12 @@ class InventoryGUI:
             self.codigo_lateral_entry
         )
     
+    def _on_busqueda_cambio(self, event=None):
+        """Filtra la tabla cuando el usuario deja de escribir."""
+        if self._busqueda_programada is not None:
+            self.window.after_cancel(self._busqueda_programada)
+        self._busqueda_programada = self.window.after(250, self.refresh)
+    
     def on_calculo_cambio(self, event=None):
         """Recalcula los valores cuando cambian cantidad, precio o ganancia."""
         # Este método puede usarse para mostrar cálculos en tiempo real si se desea
@@ -236,8 +246,10 @@ class InventoryGUI:
         self.producto_seleccionado = None
     
     def refresh(self):
-        """Actualiza la tabla y el resumen."""
-        refresh_table(self.tree, self.service, self.summary_labels)
+        """Actualiza la tabla y el resumen (solo con los productos que coinciden con la búsqueda)."""
+        self._busqueda_programada = None
+        filtro = self.buscar_entry.get() if self.buscar_entry is not None else ""
+        refresh_table(self.tree, self.service, self.summary_labels, filtro)
     
     def _cargar_categorias(self):
         """Carga las categorías disponibles."""
@@ -1,11 +1,12 @@
 """Widget de la tabla de productos."""
 import tkinter as tk
 from tkinter import ttk
+from typing import Tuple
 
 from ...config.settings import COLORS
 
 
-def create_table_widget(parent: tk.Frame) -> ttk.Treeview:
+def create_table_widget(parent: tk.Frame) -> Tuple[ttk.Treeview, tk.Entry]:
     """
     Crea el widget de tabla para mostrar los productos.
     
@@ -13,7 +14,7 @@ def create_table_widget(parent: tk.Frame) -> ttk.Treeview:
         parent: Frame padre
         
     Returns:
-        Treeview configurado para mostrar productos
+        Tuple con (Treeview configurado para mostrar productos, Entry de búsqueda)
     """
     c = COLORS
     
@@ -25,8 +26,12 @@ def create_table_widget(parent: tk.Frame) -> ttk.Treeview:
     table_frame.grid_columnconfigure(0, weight=1)
     table_frame.grid_rowconfigure(1, weight=1)  # Permitir que la tabla se expanda
     
+    header_frame = tk.Frame(table_frame, bg=c["bg_dark"])
+    header_frame.grid(row=0, column=0, sticky="ew", padx=10)
+    header_frame.grid_columnconfigure(0, weight=1)
+    
     table_title = tk.Label(
-        table_frame,
+        header_frame,
         text="Tabla de datos",
         font=(Settings.FONT_PRIMARY, 12, "bold"),
         fg=c["red_primary"],
@@ -35,6 +40,27 @@ def create_table_widget(parent: tk.Frame) -> ttk.Treeview:
     )
     table_title.grid(row=0, column=0, sticky="ew")
     
+    # Búsqueda por código, nombre o categoría
+    buscar_label = tk.Label(
+        header_frame,
+        text="Buscar:",
+        font=(Settings.FONT_PRIMARY, 10),
+        fg=c["text_secondary"],
+        bg=c["bg_dark"]
+    )
+    buscar_label.grid(row=0, column=1, sticky="e", padx=(0, 5))
+    
+    buscar_entry = tk.Entry(
+        header_frame,
+        font=(Settings.FONT_PRIMARY, 11),
+        bg=c["bg_medium"],
+        fg=c["text_primary"],
+        relief=tk.FLAT,
+        insertbackground=c["text_primary"],
+        width=30
+    )
+    buscar_entry.grid(row=0, column=2, sticky="e")
+    
     # Frame para tabla con scrollbars usando grid para mejor control
     table_container = tk.Frame(table_frame, bg=c["bg_dark"])
     table_container.grid(row=1, column=0, sticky="nsew", padx=10, pady=(0, 10))
@@ -100,5 +126,5 @@ def create_table_widget(parent: tk.Frame) -> ttk.Treeview:
     tree.column("valor_ganancia", width=120, anchor=tk.E)
     tree.column("subtotal", width=100, anchor=tk.E)
     
-    return tree
+    return tree, buscar_entry
 
@@ -2,7 +2,7 @@
 import tkinter as tk
 from tkinter import ttk
 import webbrowser
-from datetime import datetime, date
+from dataclasses import asdict
 
 from .config.settings import Settings, COLORS, set_theme, get_current_theme
 from .ui.styles import StyleManager
@@ -13,9 +13,10 @@ from .sales.views import SalesGUI
 from .cash_closure.ui.views import CashClosureGUI
 from .config_module.views import ConfigGUI
 from .repository.product_repository import ProductRepository
-from .sales.repository.venta_repository import VentaRepository
+from .services.dashboard_service import DashboardService
 from .services.inventory_service import InventoryService
 from .cash_closure.services.cash_closure_service import CashClosureService
+from .domain.models import EstadisticasPanel
 
 
 class MainWindow:
@@ -69,9 +70,11 @@ class MainWindow:
         
         # Inicializar servicios para obtener datos del resumen
         self.product_repository = ProductRepository()
-        self.venta_repository = VentaRepository()
         self.inventory_service = InventoryService(self.product_repository)
         self.cash_closure_service = CashClosureService()
+        self.dashboard_service = DashboardService(
+            self.product_repository, self.cash_closure_service.repository
+        )
         self.tienda_service = TiendaService()
         
         # Crear interfaz
@@ -141,60 +144,10 @@ class MainWindow:
     def get_summary_data(self):
         """Obtiene los datos del resumen del sistema."""
         try:
-            # Datos de inventario
-            productos = self.product_repository.get_all()
-            total_productos = len(productos)
-            valor_total_inventario = self.product_repository.calculate_total_value()
-            productos_bajo_stock = sum(1 for p in productos if p.cantidad < 10)
-            
-            # Datos de ventas
-            ventas = self.venta_repository.get_all()
-            total_ventas = len(ventas)
-            total_ingresos = sum(v.total for v in ventas)
-            
-            # Ventas del día
-            hoy = date.today()
-            ventas_hoy = [
-                v for v in ventas 
-                if isinstance(v.fecha, datetime) and v.fecha.date() == hoy
-            ]
-            ingresos_hoy = sum(v.total for v in ventas_hoy)
-            
-            # Ventas del mes
-            mes_actual = hoy.month
-            año_actual = hoy.year
-            ventas_mes = [
-                v for v in ventas
-                if isinstance(v.fecha, datetime) and 
-                   v.fecha.date().month == mes_actual and 
-                   v.fecha.date().year == año_actual
-            ]
-            ingresos_mes = sum(v.total for v in ventas_mes)
-            
-            return {
-                "total_productos": total_productos,
-                "valor_total_inventario": valor_total_inventario,
-                "productos_bajo_stock": productos_bajo_stock,
-                "total_ventas": total_ventas,
-                "total_ingresos": total_ingresos,
-                "ventas_hoy": len(ventas_hoy),
-                "ingresos_hoy": ingresos_hoy,
-                "ventas_mes": len(ventas_mes),
-                "ingresos_mes": ingresos_mes
-            }
+            return asdict(self.dashboard_service.obtener_estadisticas())
         except Exception as e:
             # En caso de error, retornar valores por defecto
-            return {
-                "total_productos": 0,
-                "valor_total_inventario": 0.0,
-                "productos_bajo_stock": 0,
-                "total_ventas": 0,
-                "total_ingresos": 0.0,
-                "ventas_hoy": 0,
-                "ingresos_hoy": 0.0,
-                "ventas_mes": 0,
-                "ingresos_mes": 0.0
-            }
+            return asdict(EstadisticasPanel())
     
     def create_summary_frame(self, parent: tk.Frame, colors: dict):
         """Crea el frame de resumen con las tarjetas."""
@@ -418,7 +371,7 @@ class MainWindow:
         inventory_text = (
             f"Total de Productos: {data['total_productos']}\n"
             f"Valor Total: {format_currency(data['valor_total_inventario'])}\n"
-            f"Bajo Stock (<10): {data['productos_bajo_stock']}"
+            f"Bajo Stock (<{Settings.LOW_STOCK_THRESHOLD}): {data['productos_bajo_stock']}"
         )
         self.inventory_card["content_label"].config(text=inventory_text)
         
@@ -1,5 +1,5 @@
 """Módulo de repositorios - Acceso a datos."""
+from .catalogo_productos import CatalogoProductos, get_catalogo_productos
 from .product_repository import ProductRepository
 
-__all__ = ["ProductRepository"]
-
+__all__ = ["CatalogoProductos", "get_catalogo_productos", "ProductRepository"]
@@ -0,0 +1,266 @@
+"""Caché en memoria del catálogo de productos."""
+import dataclasses
+import sqlite3
+import threading
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Set, Tuple
+
+from ..database.connection_manager import _normalize_path
+from ..domain.models import Producto
+from .indice_trigramas import IndiceTrigramas
+
+if TYPE_CHECKING:
+    from .product_repository import ProductRepository
+
+
+class CatalogoProductos:
+    """
+    Copia en memoria de la tabla productos indexada por código.
+    
+    Para autocompletar mantiene además un IndiceTrigramas de nombres,
+    categorías y códigos, que se construye en la primera búsqueda y se actualiza con las
+    mismas invalidaciones que los productos.
+    
+    Los cambios hechos por este proceso a través de ProductRepository
+    invalidan solo los productos afectados, que se vuelven a leer en la
+    siguiente consulta. Cualquier cambio en la base se detecta con PRAGMA
+    data_version sobre una conexión propia; entonces se compara el contador
+    productos_revision con la revisión esperada, que solo avanzan las
+    invalidaciones propias. Si no coincide, otro proceso (o un cambio sin
+    invalidación) escribió productos y se recarga todo. Las consultas
+    devuelven copias, de modo que modificar un producto obtenido no altera
+    la caché.
+    
+    El stock mostrado es orientativo: registrar una venta siempre lo vuelve
+    a validar dentro de la transacción.
+    """
+    
+    def __init__(self, repository: "ProductRepository"):
+        """
+        Inicializa el catálogo (los productos se cargan en la primera consulta).
+        
+        Args:
+            repository: Repositorio de productos
+        """
+        self.repository = repository
+        self._lock = threading.RLock()
+        self._productos: Dict[str, Producto] = {}
+        self._sucios: Set[str] = set()
+        self._indice: Optional[IndiceTrigramas] = None
+        self._cargado = False
+        self._version: Optional[int] = None
+        self._revision: Optional[int] = None
+        self._conexion_version: Optional[sqlite3.Connection] = None
+    
+    def _conexion(self) -> sqlite3.Connection:
+        """Conexión propia que nunca escribe (data_version solo cambia por escrituras de otras)."""
+        if self._conexion_version is None:
+            self._conexion_version = sqlite3.connect(
+                self.repository.db_path, check_same_thread=False
+            )
+        return self._conexion_version
+    
+    def _version_actual(self) -> int:
+        """Lee PRAGMA data_version: cambia con cualquier escritura confirmada en la base."""
+        return self._conexion().execute("PRAGMA data_version").fetchone()[0]
+    
+    def _revision_actual(self) -> int:
+        """Lee el contador productos_revision: cambia solo con escrituras de productos."""
+        return self.repository.obtener_revision(self._conexion().cursor())
+    
+    def _sincronizar(self):
+        """Recarga todo si otro proceso cambió productos, o solo los productos invalidados."""
+        version = self._version_actual()
+        if self._cargado and version != self._version:
+            # Cambió la base: si todas las escrituras de productos fueron
+            # propias, la revisión es la que dejaron las invalidaciones
+            if self._revision_actual() != self._revision:
+                self._cargado = False
+            self._version = version
+        
+        if not self._cargado:
+            # La revisión se lee antes que los productos: si alguien escribe
+            # en medio, la revisión queda atrás y provoca otra recarga
+            self._revision = self._revision_actual()
+            self._productos = {p.codigo: p for p in self.repository.get_all()}
+            self._sucios.clear()
+            self._indice = None  # Se reconstruye en la próxima búsqueda
+            self._cargado = True
+            self._version = version
+            return
+        
+        if self._sucios:
+            codigos = list(self._sucios)
+            self._sucios.clear()
+            anteriores = {codigo: self._productos.pop(codigo, None) for codigo in codigos}
+            for producto in self.repository.get_by_codes(codigos):
+                self._productos[producto.codigo] = producto
+            if self._indice is not None:
+                # Una venta solo cambia el stock: el índice se toca si
+                # cambió el nombre o la categoría
+                for codigo, anterior in anteriores.items():
+                    actual = self._productos.get(codigo)
+                    if actual is None:
+                        self._indice.quitar(codigo)
+                    elif (anterior is None or anterior.nombre != actual.nombre
+                          or anterior.categoria != actual.categoria):
+                        self._indice.agregar(codigo, actual.nombre, actual.categoria)
+    
+    def invalidar(self, codigos: Iterable[str],
+                  revisiones: Optional[Tuple[int, int]] = None):
+        """
+        Marca productos como modificados por este proceso.
+        
+        Se debe llamar después de confirmar la transacción que los modificó.
+        La revisión esperada solo avanza si la transacción empezó justo en
+        ella; si no, hubo escrituras ajenas en medio (o invalidaciones
+        propias fuera de orden) y la siguiente consulta recarga todo.
+        
+        Args:
+            codigos: Códigos de los productos creados, modificados o eliminados
+            revisiones: (antes, después) del contador productos_revision
+                leídos dentro de la transacción (None = recargar todo)
+        """
+        with self._lock:
+            self._sucios.update(codigos)
+            if not self._cargado:
+                return
+            if revisiones is not None and revisiones[0] == self._revision:
+                self._revision = revisiones[1]
+            else:
+                self._cargado = False
+    
+    def recargar(self):
+        """Descarta la caché; la siguiente consulta vuelve a leer todos los productos."""
+        with self._lock:
+            self._cargado = False
+            self._sucios.clear()
+            self._indice = None
+    
+    def obtener(self, codigo: str) -> Optional[Producto]:
+        """
+        Obtiene un producto por su código.
+        
+        Args:
+            codigo: Código del producto
+        
+        Returns:
+            Producto si existe, None en caso contrario
+        """
+        with self._lock:
+            self._sincronizar()
+            producto = self._productos.get(codigo)
+            return dataclasses.replace(producto) if producto else None
+    
+    def obtener_varios(self, codigos: Iterable[str]) -> Dict[str, Producto]:
+        """
+        Obtiene varios productos por código con una sola verificación de cambios.
+        
+        Args:
+            codigos: Códigos de los productos
+        
+        Returns:
+            Diccionario código -> producto (los códigos inexistentes se omiten)
+        """
+        with self._lock:
+            self._sincronizar()
+            return {
+                codigo: dataclasses.replace(self._productos[codigo])
+                for codigo in codigos if codigo in self._productos
+            }
+    
+    def todos(self) -> List[Producto]:
+        """
+        Obtiene todos los productos.
+        
+        Returns:
+            Lista de productos
+        """
+        with self._lock:
+            self._sincronizar()
+            return [dataclasses.replace(p) for p in self._productos.values()]
+    
+    def disponibles(self) -> List[Producto]:
+        """
+        Obtiene los productos con stock mayor a 0.
+        
+        Returns:
+            Lista de productos disponibles
+        """
+        with self._lock:
+            self._sincronizar()
+            return [dataclasses.replace(p) for p in self._productos.values() if p.cantidad > 0]
+    
+    def buscar(self, texto: str, limite: Optional[int] = None) -> List[Producto]:
+        """
+        Busca productos por código, nombre o categoría para autocompletar, sin consultar SQLite.
+        
+        Tolera fragmentos y errores de tipeo (ver IndiceTrigramas.buscar).
+        
+        Args:
+            texto: Texto escrito por el usuario
+            limite: Máximo de resultados (None = todos los que coinciden)
+        
+        Returns:
+            Lista de productos, los más relevantes primero
+        """
+        with self._lock:
+            self._sincronizar()
+            if self._indice is None:
+                self._indice = IndiceTrigramas()
+                self._indice.reconstruir(
+                    (codigo, producto.nombre, producto.categoria)
+                    for codigo, producto in self._productos.items()
+                )
+            return [
+                dataclasses.replace(self._productos[codigo])
+                for codigo in self._indice.buscar(texto, limite)
+            ]
+    
+    def cerrar(self):
+        """Cierra la conexión usada para detectar cambios."""
+        with self._lock:
+            if self._conexion_version is not None:
+                self._conexion_version.close()
+                self._conexion_version = None
+            self._cargado = False
+            self._indice = None
+
+
+_catalogos: Dict[str, CatalogoProductos] = {}
+_catalogos_lock = threading.Lock()
+
+
+def get_catalogo_productos(repository: "ProductRepository") -> CatalogoProductos:
+    """
+    Obtiene el catálogo compartido para la base de datos del repositorio.
+    
+    Args:
+        repository: Repositorio de productos
+    
+    Returns:
+        CatalogoProductos: Catálogo único por archivo dentro del proceso
+    """
+    key = _normalize_path(repository.db_path)
+    with _catalogos_lock:
+        catalogo = _catalogos.get(key)
+        if catalogo is None:
+            catalogo = CatalogoProductos(repository)
+            _catalogos[key] = catalogo
+        return catalogo
+
+
+def invalidar_catalogo(db_path: str, codigos: Iterable[str],
+                       revisiones: Optional[Tuple[int, int]] = None):
+    """
+    Invalida productos en el catálogo de una base de datos, si existe.
+    
+    Args:
+        db_path: Ruta de la base de datos de inventario
+        codigos: Códigos de los productos modificados
+        revisiones: (antes, después) del contador productos_revision en la
+            transacción que los modificó (ver CatalogoProductos.invalidar)
+    """
+    with _catalogos_lock:
+        catalogo = _catalogos.get(_normalize_path(db_path))
+    if catalogo is not None:
+        catalogo.invalidar(codigos, revisiones)
@@ -0,0 +1,405 @@
+"""Índice de trigramas en memoria para autocompletar productos."""
+import bisect
+import heapq
+import math
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from ..utils.texto import normalizar_texto
+
+
+def trigramas(palabra: str, prefijo: bool = False) -> FrozenSet[str]:
+    """
+    Obtiene los trigramas de una palabra ya normalizada.
+
+    La palabra se rellena con dos espacios delante y uno detrás ("pan" ->
+    "  p", " pa", "pan", "an "), de modo que el inicio de la palabra pesa y
+    las palabras de una o dos letras también generan trigramas.
+
+    Args:
+        palabra: Palabra normalizada
+        prefijo: Si True, la palabra aún se está escribiendo y no aporta el
+            trigrama de fin de palabra
+
+    Returns:
+        FrozenSet[str]: Trigramas de la palabra
+    """
+    relleno = f"  {palabra}" if prefijo else f"  {palabra} "
+    return frozenset(relleno[i:i + 3] for i in range(len(relleno) - 2))
+
+
+# Rango de una coincidencia: (tipo, -similitud); menor es mejor
+Rango = Tuple[int, float]
+
+
+class _Documento(NamedTuple):
+    """Palabras indexadas de un producto."""
+    palabras: FrozenSet[str]   # Nombre y categoría
+    nombre: FrozenSet[str]     # Solo el nombre
+    longitud: int              # Largo del nombre normalizado
+
+
+def _documento(nombre: str, categoria: str) -> _Documento:
+    """Normaliza y separa en palabras el nombre y la categoría de un producto."""
+    nombre = normalizar_texto(nombre)
+    palabras_nombre = frozenset(nombre.split())
+    return _Documento(
+        palabras_nombre | frozenset(normalizar_texto(categoria).split()),
+        palabras_nombre,
+        len(nombre)
+    )
+
+
+class IndiceTrigramas:
+    """
+    Índice en memoria de nombres, categorías y códigos de productos para autocompletar.
+
+    Las palabras del nombre y de la categoría se indexan por palabra
+    (palabra -> códigos) y el vocabulario por trigramas (trigrama ->
+    palabras); los códigos, en una lista ordenada para buscar por prefijo.
+    Cada palabra escrita se resuelve primero contra el vocabulario (igual,
+    prefijo o parecida por trigramas, para tolerar errores de tipeo) y solo
+    después se puntúan los productos de las palabras encontradas; el límite
+    se aplica con heapq.nsmallest sobre el puntaje, así que los N primeros
+    son siempre los N más relevantes.
+
+    No es seguro para hilos; CatalogoProductos lo usa con su propio lock.
+    """
+
+    # Proporción mínima de trigramas en común para aceptar una palabra parecida
+    SIMILITUD_MINIMA = 0.6
+
+    # Tipos de coincidencia de una palabra escrita, del más al menos relevante;
+    # una coincidencia solo en la categoría cuenta después de las del nombre
+    IGUAL, PREFIJO, PARECIDA = 0, 1, 2
+    SOLO_CATEGORIA = 3
+
+    def __init__(self):
+        """Inicializa el índice vacío."""
+        self._documentos: Dict[str, _Documento] = {}      # código -> palabras del producto
+        self._palabras: Dict[str, Set[str]] = {}          # palabra -> códigos
+        self._en_nombre: Dict[str, int] = {}              # palabra -> productos que la tienen en el nombre
+        self._vocabulario: List[str] = []                 # palabras ordenadas
+        self._trigramas: Dict[str, Set[str]] = {}         # trigrama -> palabras
+        self._codigos: List[Tuple[str, str]] = []         # (código normalizado, código) ordenados
+        self._por_longitud: List[Tuple[int, str]] = []    # (largo del nombre, código) ordenados
+
+    def __len__(self) -> int:
+        """Número de productos indexados."""
+        return len(self._documentos)
+
+    def _agregar_palabra(self, palabra: str):
+        """Incorpora una palabra nueva al vocabulario."""
+        bisect.insort(self._vocabulario, palabra)
+        for trigrama in trigramas(palabra):
+            self._trigramas.setdefault(trigrama, set()).add(palabra)
+
+    def _quitar_palabra(self, palabra: str):
+        """Retira del vocabulario una palabra que ya no usa ningún producto."""
+        del self._vocabulario[bisect.bisect_left(self._vocabulario, palabra)]
+        for trigrama in trigramas(palabra):
+            palabras = self._trigramas[trigrama]
+            palabras.discard(palabra)
+            if not palabras:
+                del self._trigramas[trigrama]
+
+    def agregar(self, codigo: str, nombre: str, categoria: str = ""):
+        """
+        Indexa un producto (reemplaza su entrada si ya existía).
+
+        Args:
+            codigo: Código del producto
+            nombre: Nombre del producto
+            categoria: Categoría del producto
+        """
+        self.quitar(codigo)
+        documento = _documento(nombre, categoria)
+        self._documentos[codigo] = documento
+        for palabra in documento.palabras:
+            codigos = self._palabras.get(palabra)
+            if codigos is None:
+                self._palabras[palabra] = {codigo}
+                self._agregar_palabra(palabra)
+            else:
+                codigos.add(codigo)
+        for palabra in documento.nombre:
+            self._en_nombre[palabra] = self._en_nombre.get(palabra, 0) + 1
+        bisect.insort(self._codigos, (normalizar_texto(codigo), codigo))
+        bisect.insort(self._por_longitud, (documento.longitud, codigo))
+
+    def quitar(self, codigo: str):
+        """
+        Retira un producto del índice.
+
+        Args:
+            codigo: Código del producto
+        """
+        documento = self._documentos.pop(codigo, None)
+        if documento is None:
+            return
+        for palabra in documento.palabras:
+            codigos = self._palabras[palabra]
+            codigos.discard(codigo)
+            if not codigos:
+                del self._palabras[palabra]
+                self._quitar_palabra(palabra)
+        for palabra in documento.nombre:
+            self._en_nombre[palabra] -= 1
+            if not self._en_nombre[palabra]:
+                del self._en_nombre[palabra]
+        for lista, entrada in ((self._codigos, (normalizar_texto(codigo), codigo)),
+                               (self._por_longitud, (documento.longitud, codigo))):
+            posicion = bisect.bisect_left(lista, entrada)
+            if posicion < len(lista) and lista[posicion] == entrada:
+                del lista[posicion]
+
+    def reconstruir(self, productos: Iterable[Tuple[str, str, str]]):
+        """
+        Vuelve a crear el índice desde cero.
+
+        Args:
+            productos: Tuplas (código, nombre, categoría)
+        """
+        self._documentos = {}
+        self._palabras = {}
+        self._en_nombre = {}
+        self._codigos = []
+        for codigo, nombre, categoria in productos:
+            documento = _documento(nombre, categoria)
+            self._documentos[codigo] = documento
+            for palabra in documento.palabras:
+                self._palabras.setdefault(palabra, set()).add(codigo)
+            for palabra in documento.nombre:
+                self._en_nombre[palabra] = self._en_nombre.get(palabra, 0) + 1
+            self._codigos.append((normalizar_texto(codigo), codigo))
+        self._codigos.sort()
+        self._por_longitud = sorted(
+            (documento.longitud, codigo) for codigo, documento in self._documentos.items()
+        )
+        self._vocabulario = sorted(self._palabras)
+        self._trigramas = {}
+        for palabra in self._vocabulario:
+            for trigrama in trigramas(palabra):
+                self._trigramas.setdefault(trigrama, set()).add(palabra)
+
+    def _codigos_con_prefijo(self, prefijo: str, limite: Optional[int]) -> List[str]:
+        """Códigos que empiezan por un prefijo, en orden (el igual va primero)."""
+        resultado = []
+        posicion = bisect.bisect_left(self._codigos, (prefijo, ""))
+        while posicion < len(self._codigos) and (limite is None or len(resultado) < limite):
+            normalizado, codigo = self._codigos[posicion]
+            if not normalizado.startswith(prefijo):
+                break
+            resultado.append(codigo)
+            posicion += 1
+        return resultado
+
+    def _palabras_coincidentes(self, palabra: str) -> Dict[str, Rango]:
+        """
+        Palabras del vocabulario que coinciden con una palabra escrita.
+
+        Args:
+            palabra: Palabra normalizada (se trata como prefijo)
+
+        Returns:
+            Diccionario palabra -> (tipo, -similitud): la igual y las que
+            empiezan por ella; si no hay ninguna, las parecidas por trigramas
+            (errores de tipeo) con su proporción de trigramas en común
+        """
+        coincidentes = {}
+        posicion = bisect.bisect_left(self._vocabulario, palabra)
+        while posicion < len(self._vocabulario) and self._vocabulario[posicion].startswith(palabra):
+            candidata = self._vocabulario[posicion]
+            tipo = self.IGUAL if candidata == palabra else self.PREFIJO
+            coincidentes[candidata] = (tipo, 0.0)
+            posicion += 1
+        if coincidentes or len(palabra) < 3:
+            return coincidentes
+
+        claves = trigramas(palabra, prefijo=True)
+        minimo = math.ceil(len(claves) * self.SIMILITUD_MINIMA)
+        listas = sorted((self._trigramas.get(clave, _VACIO) for clave in claves), key=len)
+        # Principio del palomar: una palabra con "minimo" trigramas en común
+        # aparece en alguna de las len(claves) - minimo + 1 listas más cortas
+        candidatas = set().union(*listas[:len(claves) - minimo + 1])
+        for candidata in candidatas:
+            comunes = len(claves & trigramas(candidata))
+            if comunes >= minimo:
+                coincidentes[candidata] = (self.PARECIDA, -comunes / len(claves))
+        return coincidentes
+
+    def _puntuar(self, documento: _Documento, coincidencias: List[Dict[str, Rango]]) -> Optional[Rango]:
+        """
+        Puntaje de un producto para las palabras escritas (menor es mejor).
+
+        Cada palabra escrita aporta su mejor coincidencia entre las palabras
+        del producto; si alguna no coincide con ninguna, el producto no
+        coincide.
+
+        Returns:
+            Suma de los rangos (tipo, -similitud), o None si no coincide
+        """
+        tipos, similitud = 0, 0.0
+        for coincidentes in coincidencias:
+            mejor = None
+            for palabra in documento.palabras:
+                rango = coincidentes.get(palabra)
+                if rango is None:
+                    continue
+                if palabra not in documento.nombre:
+                    rango = (rango[0] + self.SOLO_CATEGORIA, rango[1])
+                if mejor is None or rango < mejor:
+                    mejor = rango
+            if mejor is None:
+                return None
+            tipos += mejor[0]
+            similitud += mejor[1]
+        return tipos, similitud
+
+    def _considerar(self, codigo: str, coincidencias: List[Dict[str, Rango]],
+                    seleccion: "_Seleccion", vistos: Set[str]):
+        """Puntúa un producto aún no visto y lo ofrece a la selección."""
+        if codigo in vistos:
+            return
+        vistos.add(codigo)
+        documento = self._documentos[codigo]
+        puntaje = self._puntuar(documento, coincidencias)
+        if puntaje is not None:
+            seleccion.agregar(puntaje + (documento.longitud, codigo))
+
+    def buscar(self, texto: str, limite: Optional[int] = None) -> List[str]:
+        """
+        Busca los productos que coinciden con un texto, los más relevantes primero.
+
+        Primero van los productos cuyo código empieza por el texto, en el
+        orden de los códigos (el igual primero). Después, los productos en
+        cuyo nombre o categoría cada palabra escrita tiene una palabra igual,
+        que empieza por ella o, si ninguna empieza así, parecida (errores de
+        tipeo), ordenados por:
+
+        1. Tipo de coincidencia (igual, prefijo, parecida); las que solo
+           coinciden con la categoría van después de las del nombre.
+        2. Similitud de las palabras parecidas.
+        3. Largo del nombre (el más corto primero) y luego código, para que
+           el resultado sea estable.
+
+        Con límite se conservan los N mejores en un montículo (heapq). Los
+        candidatos se agrupan por la cota de su puntaje y los grupos se
+        recorren de mejor a peor, deteniéndose cuando ninguno restante puede
+        entrar entre los N: un grupo chico se puntúa completo y uno grande se
+        busca en el orden global por largo del nombre, donde sus N mejores
+        aparecen pronto.
+
+        Args:
+            texto: Texto escrito por el usuario
+            limite: Máximo de resultados (None = todos los que coinciden)
+
+        Returns:
+            Lista de códigos, los más relevantes primero
+        """
+        consulta = normalizar_texto(texto)
+        if not consulta or limite == 0:
+            return []
+
+        resultado = self._codigos_con_prefijo(consulta, limite)
+        if limite is not None and len(resultado) >= limite:
+            return resultado
+        vistos = set(resultado)
+
+        coincidencias = [self._palabras_coincidentes(palabra) for palabra in consulta.split()]
+        if not all(coincidencias):
+            return resultado
+
+        # La palabra escrita con menos productos da los candidatos; las demás
+        # solo pueden sumar al puntaje, como mínimo su mejor rango
+        guia = 0
+        if len(coincidencias) > 1:
+            tamanos = [sum(len(self._palabras[p]) for p in palabras) for palabras in coincidencias]
+            guia = min(range(len(coincidencias)), key=tamanos.__getitem__)
+        otras = [palabras.values() for i, palabras in enumerate(coincidencias) if i != guia]
+        base_tipo = sum(min(rango[0] for rango in rangos) for rangos in otras)
+        base_similitud = sum(min(rango[1] for rango in rangos) for rangos in otras)
+
+        # Grupos de palabras con el mismo rango; cada uno se recorre dos
+        # veces, por los productos que la tienen en el nombre y por los que
+        # solo la tienen en la categoría
+        por_rango: Dict[Rango, List[str]] = {}
+        for palabra, rango in coincidencias[guia].items():
+            por_rango.setdefault(rango, []).append(palabra)
+        grupos = sorted(
+            ((tipo + penalizacion + base_tipo, similitud + base_similitud), palabras, penalizacion == 0)
+            for (tipo, similitud), palabras in por_rango.items()
+            for penalizacion in (0, self.SOLO_CATEGORIA)
+        )
+
+        restantes = None if limite is None else limite - len(resultado)
+        seleccion = _Seleccion(restantes)
+        # Con una sola palabra escrita, todos los productos de un grupo tienen
+        # justo la cota como puntaje; si el grupo es grande, sus mejores
+        # aparecen antes recorriendo el orden global por largo del nombre
+        grande = (
+            math.isqrt(len(self._documentos) * restantes)
+            if restantes and len(coincidencias) == 1 else None
+        )
+        for cota, palabras, es_nombre in grupos:
+            if seleccion.descarta(cota):
+                break
+            en_nombre = sum(self._en_nombre.get(palabra, 0) for palabra in palabras)
+            tamano = en_nombre if es_nombre else (
+                sum(len(self._palabras[palabra]) for palabra in palabras) - en_nombre
+            )
+            if not tamano:
+                continue
+            if grande is not None and tamano > grande:
+                for longitud, codigo in self._por_longitud:
+                    if seleccion.descarta(cota + (longitud, codigo)):
+                        break
+                    self._considerar(codigo, coincidencias, seleccion, vistos)
+                continue
+            for palabra in palabras:
+                for codigo in self._palabras[palabra]:
+                    documento = self._documentos[codigo]
+                    if (palabra in documento.nombre) != es_nombre:
+                        continue
+                    if seleccion.descarta(cota + (documento.longitud, codigo)):
+                        continue
+                    self._considerar(codigo, coincidencias, seleccion, vistos)
+        return resultado + [puntaje[-1] for puntaje in seleccion.ordenados()]
+
+
+class _Peor:
+    """Puntaje con el orden invertido, para usar heapq como montículo de máximos."""
+
+    __slots__ = ("puntaje",)
+
+    def __init__(self, puntaje: tuple):
+        self.puntaje = puntaje
+
+    def __lt__(self, otro: "_Peor") -> bool:
+        return otro.puntaje < self.puntaje
+
+
+class _Seleccion:
+    """Los N menores puntajes agregados (todos si N es None)."""
+
+    def __init__(self, limite: Optional[int]):
+        self.limite = limite
+        self._monticulo: List[_Peor] = []  # La raíz es el peor de los elegidos
+
+    def agregar(self, puntaje: tuple):
+        """Agrega un puntaje si está entre los N menores."""
+        if self.limite is None or len(self._monticulo) < self.limite:
+            heapq.heappush(self._monticulo, _Peor(puntaje))
+        elif puntaje < self._monticulo[0].puntaje:
+            heapq.heapreplace(self._monticulo, _Peor(puntaje))
+
+    def descarta(self, cota: tuple) -> bool:
+        """Indica si un puntaje de al menos esta cota ya no puede entrar entre los N."""
+        return (self.limite is not None and len(self._monticulo) >= self.limite
+                and self._monticulo[0].puntaje < cota)
+
+    def ordenados(self) -> List[tuple]:
+        """Puntajes elegidos, de menor a mayor."""
+        return sorted(elegido.puntaje for elegido in self._monticulo)
+
+
+_VACIO: FrozenSet[str] = frozenset()
@@ -1,9 +1,14 @@
 """Repositorio para acceso a datos de productos."""
+import re
 import sqlite3
-from typing import List, Optional
-from contextlib import contextmanager
+from dataclasses import replace
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
 
-from ..domain.models import Producto
+from ..database.connection_manager import get_connection_manager
+from ..database.migrations import ensure_schema
+from ..domain.models import Producto, ResumenInventario
+from ..utils.texto import normalizar_texto, patron_like
+from .catalogo_productos import invalidar_catalogo
 
 
 class ProductRepository:
@@ -17,63 +22,46 @@ class ProductRepository:
             db_path: Ruta al archivo de base de datos SQLite
         """
         self.db_path = db_path
-        self._init_database()
+        self._indice_busqueda: Optional[bool] = None
+        ensure_schema(self.db_path, "inventario")
     
-    def _init_database(self):
-        """Inicializa la base de datos y crea las tablas si no existen."""
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS productos (
-                    codigo TEXT PRIMARY KEY,
-                    nombre TEXT NOT NULL,
-                    categoria TEXT NOT NULL,
-                    cantidad INTEGER NOT NULL,
-                    precio_unitario REAL NOT NULL,
-                    ganancia REAL NOT NULL DEFAULT 0.0,
-                    valor_venta REAL NOT NULL DEFAULT 0.0
-                )
-            """)
-            conn.commit()
+    def _get_connection(self):
+        """Context manager para obtener conexiones del pool compartido."""
+        return get_connection_manager(self.db_path).connection()
+    
+    def obtener_revision(self, cursor: sqlite3.Cursor, schema: str = "main") -> int:
+        """
+        Lee el contador de cambios de productos (lo avanzan triggers en cada escritura).
+        
+        Leído dentro de una transacción de escritura, antes y después de
+        modificar productos, da el rango de revisiones que corresponde solo a
+        esa transacción: ningún otro escritor puede confirmar en medio.
+        
+        Args:
+            cursor: Cursor de la conexión
+            schema: Esquema de la base de inventario (p. ej. si está adjunta)
             
-            # Migraciones: agregar columnas si no existen
-            try:
-                cursor.execute("PRAGMA table_info(productos)")
-                columns = [row[1] for row in cursor.fetchall()]
-                
-                # Migración: agregar columna ganancia si no existe
-                if 'ganancia' not in columns:
-                    cursor.execute("ALTER TABLE productos ADD COLUMN ganancia REAL NOT NULL DEFAULT 0.0")
-                    conn.commit()
-                
-                # Migración: agregar columna valor_venta si no existe
-                if 'valor_venta' not in columns:
-                    cursor.execute("ALTER TABLE productos ADD COLUMN valor_venta REAL NOT NULL DEFAULT 0.0")
-                    conn.commit()
-                    
-                    # Recalcular valor_venta para productos existentes
-                    cursor.execute("SELECT codigo, precio_unitario, ganancia FROM productos")
-                    productos = cursor.fetchall()
-                    for codigo, precio_unit, ganancia in productos:
-                        ganancia_unit = precio_unit * (ganancia / 100.0)
-                        valor_venta = precio_unit + ganancia_unit
-                        cursor.execute(
-                            "UPDATE productos SET valor_venta = ? WHERE codigo = ?",
-                            (valor_venta, codigo)
-                        )
-                    conn.commit()
-            except sqlite3.OperationalError:
-                # Error al agregar columna, puede que ya exista
-                pass
+        Returns:
+            int: Revisión actual
+        """
+        cursor.execute(f"SELECT revision FROM {schema}.productos_revision")
+        return cursor.fetchone()[0]
     
-    @contextmanager
-    def _get_connection(self):
-        """Context manager para obtener conexiones a la base de datos."""
-        conn = sqlite3.connect(self.db_path)
-        try:
-            yield conn
-        finally:
-            conn.close()
+    def notificar_cambios(self, codigos: Iterable[str],
+                          revisiones: Optional[Tuple[int, int]] = None):
+        """
+        Invalida en el catálogo en memoria los productos modificados.
+        
+        Los métodos de este repositorio que confirman su propia transacción
+        lo llaman solos; quien modifique productos dentro de una transacción
+        propia (p. ej. decrement_stock) debe llamarlo después del COMMIT.
+        
+        Args:
+            codigos: Códigos de los productos creados, modificados o eliminados
+            revisiones: (antes, después) de obtener_revision dentro de la
+                transacción; si None, el catálogo se recarga completo
+        """
+        invalidar_catalogo(self.db_path, codigos, revisiones)
     
     def create(self, product: Producto) -> bool:
         """
@@ -86,21 +74,23 @@ class ProductRepository:
             bool: True si se creó exitosamente, False si ya existe
         """
         try:
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
+            with get_connection_manager(self.db_path).transaction() as cursor:
                 # Asegurar que valor_venta esté calculado
                 if product.valor_venta == 0.0:
                     product.valor_venta = product.calcular_valor_venta()
                 
+                antes = self.obtener_revision(cursor)
                 cursor.execute(
-                    "INSERT INTO productos (codigo, nombre, categoria, cantidad, precio_unitario, ganancia, valor_venta) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    "INSERT INTO productos (codigo, nombre, categoria, cantidad, precio_unitario, ganancia, valor_venta, nombre_normalizado) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
                     (product.codigo, product.nombre, product.categoria, 
-                     product.cantidad, product.precio_unitario, product.ganancia, product.valor_venta)
+                     product.cantidad, product.precio_unitario, product.ganancia, product.valor_venta,
+                     normalizar_texto(product.nombre))
                 )
-                conn.commit()
-                return True
+                despues = self.obtener_revision(cursor)
         except sqlite3.IntegrityError:
             return False
+        self.notificar_cambios([product.codigo], (antes, despues))
+        return True
     
     def get_by_code(self, codigo: str) -> Optional[Producto]:
         """
@@ -138,6 +128,35 @@ class ProductRepository:
                     producto.valor_venta = producto.calcular_valor_venta()
             return productos
     
+    def get_by_codes(self, codigos: Iterable[str], batch_size: int = 500) -> List[Producto]:
+        """
+        Obtiene varios productos por código con consultas IN (...) por lotes.
+        
+        Args:
+            codigos: Códigos de los productos
+            batch_size: Códigos por consulta
+            
+        Returns:
+            Lista de los productos que existen (los códigos inexistentes se omiten)
+        """
+        codigos = list(dict.fromkeys(codigos))
+        productos = []
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            for inicio in range(0, len(codigos), batch_size):
+                lote = codigos[inicio:inicio + batch_size]
+                marcadores = ", ".join("?" * len(lote))
+                cursor.execute(
+                    "SELECT codigo, nombre, categoria, cantidad, precio_unitario, ganancia, valor_venta "
+                    f"FROM productos WHERE codigo IN ({marcadores})",
+                    lote
+                )
+                productos.extend(Producto.from_tuple(row) for row in cursor.fetchall())
+        for producto in productos:
+            if producto.valor_venta == 0.0:
+                producto.valor_venta = producto.calcular_valor_venta()
+        return productos
+    
     def update(self, codigo_original: str, product: Producto) -> bool:
         """
         Actualiza un producto existente.
@@ -150,22 +169,27 @@ class ProductRepository:
             bool: True si se actualizó exitosamente, False si no existe
         """
         try:
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
+            with get_connection_manager(self.db_path).transaction() as cursor:
                 # Asegurar que valor_venta esté calculado
                 if product.valor_venta == 0.0:
                     product.valor_venta = product.calcular_valor_venta()
                 
+                antes = self.obtener_revision(cursor)
                 cursor.execute("""
                     UPDATE productos 
-                    SET codigo = ?, nombre = ?, categoria = ?, cantidad = ?, precio_unitario = ?, ganancia = ?, valor_venta = ?
+                    SET codigo = ?, nombre = ?, categoria = ?, cantidad = ?, precio_unitario = ?, ganancia = ?, valor_venta = ?,
+                        nombre_normalizado = ?
                     WHERE codigo = ?
                 """, (product.codigo, product.nombre, product.categoria, 
-                      product.cantidad, product.precio_unitario, product.ganancia, product.valor_venta, codigo_original))
-                conn.commit()
-                return cursor.rowcount > 0
+                      product.cantidad, product.precio_unitario, product.ganancia, product.valor_venta,
+                      normalizar_texto(product.nombre), codigo_original))
+                actualizado = cursor.rowcount > 0
+                despues = self.obtener_revision(cursor)
         except sqlite3.IntegrityError:
             return False
+        if actualizado:
+            self.notificar_cambios([codigo_original, product.codigo], (antes, despues))
+        return actualizado
     
     def delete(self, codigo: str) -> bool:
         """
@@ -177,11 +201,14 @@ class ProductRepository:
         Returns:
             bool: True si se eliminó exitosamente, False si no existe
         """
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
+        with get_connection_manager(self.db_path).transaction() as cursor:
+            antes = self.obtener_revision(cursor)
             cursor.execute("DELETE FROM productos WHERE codigo = ?", (codigo,))
-            conn.commit()
-            return cursor.rowcount > 0
+            eliminado = cursor.rowcount > 0
+            despues = self.obtener_revision(cursor)
+        if eliminado:
+            self.notificar_cambios([codigo], (antes, despues))
+        return eliminado
     
     def exists(self, codigo: str) -> bool:
         """
@@ -195,6 +222,216 @@ class ProductRepository:
         """
         return self.get_by_code(codigo) is not None
     
+    def _existing_codes(self, cursor: sqlite3.Cursor, codigos: List[str],
+                        batch_size: int) -> Set[str]:
+        """Obtiene, por lotes de IN (...), cuáles de los códigos ya existen."""
+        existentes = set()
+        for inicio in range(0, len(codigos), batch_size):
+            lote = codigos[inicio:inicio + batch_size]
+            marcadores = ", ".join("?" * len(lote))
+            cursor.execute(f"SELECT codigo FROM productos WHERE codigo IN ({marcadores})", lote)
+            existentes.update(row[0] for row in cursor.fetchall())
+        return existentes
+    
+    def bulk_upsert(self, products: Iterable[Producto], batch_size: int = 500) -> Tuple[int, int]:
+        """
+        Inserta o actualiza muchos productos en una sola transacción.
+        
+        Si un código aparece varias veces, prevalece la última aparición.
+        Los productos recibidos no se modifican: el valor de venta faltante
+        se calcula sobre una copia.
+        
+        Si el llamador ya tiene una transacción abierta en la conexión del
+        hilo, se escribe dentro de ella sin confirmarla ni revertirla, y el
+        llamador debe llamar a notificar_cambios después de su COMMIT.
+        
+        Args:
+            products: Productos a guardar (ya validados)
+            batch_size: Productos por lote de consulta/executemany
+            
+        Returns:
+            Tuple[int, int]: (insertados, actualizados)
+        """
+        por_codigo = {}
+        for product in products:
+            if product.valor_venta == 0.0:
+                product = replace(product, valor_venta=product.calcular_valor_venta())
+            por_codigo[product.codigo] = product
+        if not por_codigo:
+            return 0, 0
+        
+        codigos = list(por_codigo)
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            try:
+                # Verificación y escritura en la misma transacción; solo se
+                # confirma o revierte la que se abre aquí
+                propia = not conn.in_transaction
+                if propia:
+                    cursor.execute("BEGIN IMMEDIATE")
+                antes = self.obtener_revision(cursor)
+                existentes = self._existing_codes(cursor, codigos, batch_size)
+                for inicio in range(0, len(codigos), batch_size):
+                    cursor.executemany(
+                        """INSERT INTO productos
+                               (codigo, nombre, categoria, cantidad, precio_unitario, ganancia, valor_venta,
+                                nombre_normalizado)
+                           VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                           ON CONFLICT(codigo) DO UPDATE SET
+                               nombre = excluded.nombre,
+                               nombre_normalizado = excluded.nombre_normalizado,
+                               categoria = excluded.categoria,
+                               cantidad = excluded.cantidad,
+                               precio_unitario = excluded.precio_unitario,
+                               ganancia = excluded.ganancia,
+                               valor_venta = excluded.valor_venta""",
+                        [
+                            (p.codigo, p.nombre, p.categoria, p.cantidad,
+                             p.precio_unitario, p.ganancia, p.valor_venta, normalizar_texto(p.nombre))
+                            for p in (por_codigo[c] for c in codigos[inicio:inicio + batch_size])
+                        ]
+                    )
+                despues = self.obtener_revision(cursor)
+                if propia:
+                    conn.commit()
+            except Exception:
+                if propia:
+                    conn.rollback()
+                raise
+        
+        if propia:
+            self.notificar_cambios(codigos, (antes, despues))
+        return len(codigos) - len(existentes), len(existentes)
+    
+    def bulk_delete(self, codigos: Iterable[str], batch_size: int = 500) -> Set[str]:
+        """
+        Elimina muchos productos en una sola transacción.
+        
+        Si el llamador ya tiene una transacción abierta en la conexión del
+        hilo, se escribe dentro de ella sin confirmarla ni revertirla, y el
+        llamador debe llamar a notificar_cambios después de su COMMIT.
+        
+        Args:
+            codigos: Códigos de los productos a eliminar
+            batch_size: Códigos por lote de consulta/executemany
+            
+        Returns:
+            Set[str]: Códigos que existían y fueron eliminados
+        """
+        codigos = list(dict.fromkeys(codigos))
+        if not codigos:
+            return set()
+        
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            try:
+                # Verificación y escritura en la misma transacción; solo se
+                # confirma o revierte la que se abre aquí
+                propia = not conn.in_transaction
+                if propia:
+                    cursor.execute("BEGIN IMMEDIATE")
+                antes = self.obtener_revision(cursor)
+                existentes = self._existing_codes(cursor, codigos, batch_size)
+                cursor.executemany(
+                    "DELETE FROM productos WHERE codigo = ?",
+                    [(codigo,) for codigo in existentes]
+                )
+                despues = self.obtener_revision(cursor)
+                if propia:
+                    conn.commit()
+            except Exception:
+                if propia:
+                    conn.rollback()
+                raise
+        
+        if propia:
+            self.notificar_cambios(existentes, (antes, despues))
+        return existentes
+    
+    def decrement_stock(self, cursor: sqlite3.Cursor, cantidades: Iterable[Tuple[str, int]],
+                        schema: str = "main", batch_size: int = 500,
+                        permitir_faltante: bool = False) -> List[str]:
+        """
+        Descuenta stock dentro de una transacción abierta por el llamador.
+        
+        Todas las líneas se validan con una consulta IN (...) y se descuentan
+        con un único executemany cuya condición "cantidad >= ?" impide dejar
+        stock negativo. Las líneas con el mismo código se suman.
+        
+        No confirma ni revierte: si algún producto no existe o no tiene stock
+        suficiente lanza ValueError y el llamador debe revertir la transacción.
+        
+        Con permitir_faltante (ventas ya aceptadas en caja que se guardan
+        desde el diario) no se lanza el error: el stock puede quedar negativo,
+        los productos inexistentes no se descuentan y los problemas se
+        devuelven para dejarlos registrados.
+        
+        Args:
+            cursor: Cursor de la transacción en curso
+            cantidades: Pares (código, cantidad a descontar)
+            schema: Esquema donde está la tabla productos ("main" o el alias
+                con el que se adjuntó la base de datos de inventario)
+            batch_size: Códigos por consulta IN (...)
+            permitir_faltante: Si True, registrar los faltantes en lugar de fallar
+            
+        Returns:
+            List[str]: Faltantes descontados igualmente (vacía si no hubo)
+            
+        Raises:
+            ValueError: Si algún producto no existe o tiene stock insuficiente;
+                el mensaje incluye todas las líneas con problemas, una por renglón
+        """
+        solicitadas: Dict[str, int] = {}
+        for codigo, cantidad in cantidades:
+            solicitadas[codigo] = solicitadas.get(codigo, 0) + cantidad
+        if not solicitadas:
+            return []
+        
+        codigos = list(solicitadas)
+        existentes: Dict[str, Tuple[str, int]] = {}
+        for inicio in range(0, len(codigos), batch_size):
+            lote = codigos[inicio:inicio + batch_size]
+            marcadores = ", ".join("?" * len(lote))
+            cursor.execute(
+                f"SELECT codigo, nombre, cantidad FROM {schema}.productos "
+                f"WHERE codigo IN ({marcadores})",
+                lote
+            )
+            existentes.update((codigo, (nombre, disponible))
+                              for codigo, nombre, disponible in cursor.fetchall())
+        
+        errores = []
+        for codigo, cantidad in solicitadas.items():
+            if codigo not in existentes:
+                errores.append(f"El producto '{codigo}' no existe en el inventario.")
+                continue
+            nombre, disponible = existentes[codigo]
+            if disponible < cantidad:
+                errores.append(
+                    f"Stock insuficiente para '{nombre}'. "
+                    f"Disponible: {disponible}, Solicitado: {cantidad}."
+                )
+        if errores and not permitir_faltante:
+            raise ValueError("\n".join(errores))
+        
+        if permitir_faltante:
+            cursor.executemany(
+                f"UPDATE {schema}.productos SET cantidad = cantidad - ? WHERE codigo = ?",
+                ((cantidad, codigo) for codigo, cantidad in solicitadas.items()
+                 if codigo in existentes)
+            )
+            return errores
+        
+        cursor.executemany(
+            f"UPDATE {schema}.productos SET cantidad = cantidad - ? "
+            f"WHERE codigo = ? AND cantidad >= ?",
+            ((cantidad, codigo, cantidad) for codigo, cantidad in solicitadas.items())
+        )
+        # La condición protege contra cambios concurrentes entre la lectura y el UPDATE
+        if cursor.rowcount != len(solicitadas):
+            raise ValueError("El stock cambió durante la venta. Intente nuevamente.")
+        return []
+    
     def calculate_total_value(self) -> float:
         """
         Calcula el valor total del inventario.
@@ -208,22 +445,116 @@ class ProductRepository:
             result = cursor.fetchone()[0]
             return result if result else 0.0
     
-    def buscar_por_nombre(self, nombre: str) -> List[Producto]:
+    def obtener_resumen(self, umbral_bajo_stock: int) -> ResumenInventario:
         """
-        Busca productos por nombre usando LIKE.
+        Calcula los totales del inventario en un solo recorrido de la tabla.
         
         Args:
-            nombre: Texto a buscar en el nombre del producto
-            
+            umbral_bajo_stock: Cantidad por debajo de la cual un producto tiene bajo stock
+        
         Returns:
-            Lista de productos que coinciden con el nombre
+            ResumenInventario con la cantidad de productos, el valor total y
+            los productos con bajo stock
         """
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
-                "SELECT codigo, nombre, categoria, cantidad, precio_unitario, ganancia, valor_venta FROM productos WHERE nombre LIKE ? ORDER BY nombre",
-                (f"%{nombre}%",)
+                "SELECT COUNT(*), COALESCE(SUM(cantidad * precio_unitario), 0.0), "
+                "COALESCE(SUM(cantidad < ?), 0) FROM productos",
+                (umbral_bajo_stock,)
             )
-            rows = cursor.fetchall()
+            total_productos, valor_total, bajo_stock = cursor.fetchone()
+            return ResumenInventario(total_productos, valor_total, bajo_stock)
+    
+    def _tiene_indice_busqueda(self) -> bool:
+        """Indica si la base de datos tiene el índice FTS5 (se consulta una sola vez)."""
+        if self._indice_busqueda is None:
+            with self._get_connection() as conn:
+                self._indice_busqueda = conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'productos_fts'"
+                ).fetchone() is not None
+        return self._indice_busqueda
+    
+    @staticmethod
+    def _consulta_fts(texto: str) -> Optional[str]:
+        """
+        Convierte el texto del usuario en una consulta FTS5 de prefijos.
+        
+        Cada palabra se busca como prefijo y todas deben aparecer ("coca 1"
+        -> "coca"* "1"*). Las comillas aíslan la sintaxis de FTS5.
+        
+        Args:
+            texto: Texto escrito por el usuario
+            
+        Returns:
+            Consulta MATCH, o None si el texto no tiene palabras
+        """
+        palabras = re.findall(r"\w+", texto)
+        if not palabras:
+            return None
+        return " ".join(f'"{palabra}"*' for palabra in palabras)
+    
+    def buscar_por_nombre(self, nombre: str, limite: Optional[int] = None,
+                          cancelado: Optional[Callable[[], bool]] = None) -> List[Producto]:
+        """
+        Busca productos por código, nombre o categoría con el índice FTS5.
+        
+        Las palabras se buscan como prefijos de palabra, sin distinguir
+        mayúsculas ni tildes, y los resultados se ordenan por relevancia
+        (bm25, con más peso para el código y el nombre). Si la base de datos
+        no tiene el índice se busca el texto dentro de nombre_normalizado.
+        
+        Args:
+            nombre: Texto a buscar
+            limite: Máximo de resultados (None = sin límite)
+            cancelado: Función que devuelve True si el resultado ya no hace
+                falta; se consulta mientras corre la consulta y la interrumpe
+            
+        Returns:
+            Lista de productos que coinciden, los más relevantes primero
+            (vacía si la búsqueda se canceló)
+        """
+        consulta = self._consulta_fts(nombre)
+        limite_sql = limite if limite is not None else -1
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            if cancelado is not None:
+                if cancelado():
+                    return []
+                conn.set_progress_handler(cancelado, 1000)
+            try:
+                rows = self._ejecutar_busqueda(cursor, nombre, consulta, limite_sql)
+            except sqlite3.OperationalError:
+                if cancelado is not None and cancelado():
+                    return []  # Interrumpida por el progress handler
+                raise
+            finally:
+                if cancelado is not None:
+                    conn.set_progress_handler(None, 0)
             return [Producto.from_tuple(row) for row in rows]
-
+    
+    def _ejecutar_busqueda(self, cursor: sqlite3.Cursor, nombre: str, consulta: Optional[str],
+                           limite_sql: int) -> List[tuple]:
+        """Ejecuta la búsqueda con FTS5 o, si no hay índice, con LIKE sobre el nombre normalizado."""
+        if consulta is not None and self._tiene_indice_busqueda():
+            cursor.execute(
+                """SELECT p.codigo, p.nombre, p.categoria, p.cantidad, p.precio_unitario,
+                          p.ganancia, p.valor_venta
+                   FROM productos_fts f
+                   JOIN productos p ON p.id = f.rowid
+                   WHERE productos_fts MATCH ?
+                   ORDER BY bm25(productos_fts, 10.0, 5.0, 1.0), p.nombre
+                   LIMIT ?""",
+                (consulta, limite_sql)
+            )
+        else:
+            # Las coincidencias se buscan recorriendo el índice de nombre_normalizado
+            # (más angosto que la tabla) y solo se leen las filas que coinciden
+            cursor.execute(
+                "SELECT codigo, nombre, categoria, cantidad, precio_unitario, ganancia, valor_venta "
+                "FROM productos WHERE rowid IN ("
+                "    SELECT rowid FROM productos WHERE nombre_normalizado LIKE ? ESCAPE '\\'"
+                ") ORDER BY nombre_normalizado LIMIT ?",
+                (patron_like(normalizar_texto(nombre)), limite_sql)
+            )
+        return cursor.fetchall()
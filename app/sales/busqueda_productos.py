@@ -0,0 +1,147 @@
+"""Búsqueda de productos mientras se escribe, en un hilo de trabajo."""
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional
+
+from ..config.settings import Settings
+from ..domain.models import Producto
+
+
+@dataclass
+class ResultadoBusqueda:
+    """Resultado de la última búsqueda solicitada."""
+
+    texto: str
+    productos: List[Producto] = field(default_factory=list)
+    error: Optional[Exception] = None
+
+
+class BuscadorProductos:
+    """
+    Ejecuta búsquedas de productos fuera del hilo de la interfaz.
+
+    Cada solicitud reemplaza a la anterior: el hilo espera a que pasen
+    Settings.PRODUCT_SEARCH_DEBOUNCE_MS sin nuevas solicitudes, ejecuta solo
+    la última y, si llega otra mientras la consulta corre, la interrumpe y
+    descarta su resultado. La interfaz recoge el resultado con resultado()
+    desde su propio hilo (por ejemplo, revisándolo con after()).
+    """
+
+    def __init__(self, buscar: Callable[[str, Callable[[], bool]], List[Producto]],
+                 retardo_ms: Optional[int] = None):
+        """
+        Inicializa el buscador (el hilo se inicia con la primera solicitud).
+
+        Args:
+            buscar: Función que recibe el texto y una función "cancelado" y
+                devuelve los productos encontrados
+            retardo_ms: Pausa sin escribir antes de buscar (si None,
+                Settings.PRODUCT_SEARCH_DEBOUNCE_MS)
+        """
+        self.buscar = buscar
+        self.retardo = (
+            retardo_ms if retardo_ms is not None else Settings.PRODUCT_SEARCH_DEBOUNCE_MS
+        ) / 1000
+        self._condicion = threading.Condition()
+        self._generacion = 0
+        self._texto: Optional[str] = None
+        self._solicitado_en = 0.0
+        self._resultado: Optional[ResultadoBusqueda] = None
+        self._pendiente = False
+        self._cerrado = False
+        self._hilo: Optional[threading.Thread] = None
+
+    def solicitar(self, texto: str):
+        """
+        Pide buscar un texto; cancela la búsqueda anterior si aún no terminó.
+
+        Args:
+            texto: Texto a buscar
+        """
+        with self._condicion:
+            self._generacion += 1
+            self._texto = texto
+            self._solicitado_en = time.monotonic()
+            self._resultado = None
+            self._pendiente = True
+            if self._hilo is None or not self._hilo.is_alive():
+                self._cerrado = False
+                self._hilo = threading.Thread(
+                    target=self._ejecutar, name="buscador-productos", daemon=True
+                )
+                self._hilo.start()
+            self._condicion.notify()
+
+    def cancelar(self):
+        """Descarta la búsqueda pendiente o en curso."""
+        with self._condicion:
+            self._generacion += 1
+            self._texto = None
+            self._resultado = None
+            self._pendiente = False
+
+    def pendiente(self) -> bool:
+        """Indica si hay una búsqueda solicitada cuyo resultado no se ha recogido."""
+        with self._condicion:
+            return self._pendiente
+
+    def resultado(self) -> Optional[ResultadoBusqueda]:
+        """
+        Recoge el resultado de la última búsqueda solicitada.
+
+        Returns:
+            ResultadoBusqueda si ya terminó (solo se entrega una vez), None en
+            caso contrario
+        """
+        with self._condicion:
+            resultado, self._resultado = self._resultado, None
+            if resultado is not None:
+                self._pendiente = False
+            return resultado
+
+    def cerrar(self):
+        """Detiene el hilo y descarta la búsqueda en curso."""
+        with self._condicion:
+            self._cerrado = True
+            self._generacion += 1
+            self._texto = None
+            self._pendiente = False
+            self._condicion.notify()
+
+    def _siguiente(self):
+        """Espera la próxima solicitud estable; devuelve (generación, texto) o None al cerrar."""
+        with self._condicion:
+            while True:
+                if self._cerrado:
+                    return None
+                if self._texto is None:
+                    self._condicion.wait()
+                    continue
+                restante = self._solicitado_en + self.retardo - time.monotonic()
+                if restante > 0:
+                    # Cada tecla nueva reinicia la espera
+                    self._condicion.wait(restante)
+                    continue
+                texto, self._texto = self._texto, None
+                return self._generacion, texto
+
+    def _ejecutar(self):
+        """Bucle del hilo: ejecuta la última solicitud y publica su resultado si sigue vigente."""
+        while True:
+            siguiente = self._siguiente()
+            if siguiente is None:
+                return
+            generacion, texto = siguiente
+
+            def cancelado(generacion=generacion) -> bool:
+                return self._generacion != generacion
+
+            try:
+                resultado = ResultadoBusqueda(texto, self.buscar(texto, cancelado))
+            except Exception as e:
+                resultado = ResultadoBusqueda(texto, error=e)
+
+            with self._condicion:
+                if generacion == self._generacion:
+                    self._resultado = resultado
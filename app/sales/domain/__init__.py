@@ -1,4 +1,12 @@
 """Modelos de dominio del módulo de Ventas."""
+from .dinero import (
+    TotalesVenta,
+    a_centavos,
+    a_unidades,
+    aplicar_tasa,
+    aplicar_porcentaje,
+    formatear_dinero
+)
 from .models import (
     Venta, 
     ItemVenta, 
@@ -7,10 +15,20 @@ from .models import (
     Gasto, 
     CierreCaja, 
     ConfiguracionImpuestos,
-    MetodoPago
+    MetodoPago,
+    RegistroVenta,
+    RegistroItemVenta,
+    RegistroGasto,
+    RegistroCliente
 )
 
 __all__ = [
+    "TotalesVenta",
+    "a_centavos",
+    "a_unidades",
+    "aplicar_tasa",
+    "aplicar_porcentaje",
+    "formatear_dinero",
     "Venta", 
     "ItemVenta", 
     "Cliente", 
@@ -18,6 +36,10 @@ __all__ = [
     "Gasto", 
     "CierreCaja", 
     "ConfiguracionImpuestos",
-    "MetodoPago"
+    "MetodoPago",
+    "RegistroVenta",
+    "RegistroItemVenta",
+    "RegistroGasto",
+    "RegistroCliente"
 ]
 
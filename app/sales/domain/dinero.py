@@ -0,0 +1,180 @@
+"""Aritmética de dinero en centavos enteros para las ventas.
+
+Reglas de redondeo:
+- Los precios unitarios se redondean al centavo al crear cada item.
+- El descuento y el impuesto de cada item se redondean al centavo por línea.
+- Los descuentos e impuestos de la venta se redondean al centavo una vez,
+  sobre los acumulados de la venta.
+- Todos los redondeos son al centavo más cercano, con las mitades alejándose
+  de cero (ROUND_HALF_UP).
+"""
+from decimal import ROUND_HALF_UP, Decimal
+from typing import TYPE_CHECKING, Iterable, Union
+
+if TYPE_CHECKING:
+    from .models import ItemVenta
+
+Numero = Union[int, float, str, Decimal]
+
+_UNIDAD = Decimal(1)
+_CIEN = Decimal(100)
+
+
+def _decimal(valor: Numero) -> Decimal:
+    """Convierte un número a Decimal sin arrastrar el error binario de los float."""
+    return valor if isinstance(valor, Decimal) else Decimal(str(valor))
+
+
+def a_centavos(valor: Numero) -> int:
+    """
+    Convierte un importe en unidades monetarias a centavos.
+    
+    Args:
+        valor: Importe (p. ej. 12.345)
+    
+    Returns:
+        int: Centavos redondeados (p. ej. 1235)
+    """
+    return int((_decimal(valor) * _CIEN).quantize(_UNIDAD, rounding=ROUND_HALF_UP))
+
+
+def a_unidades(centavos: int) -> float:
+    """
+    Convierte centavos a unidades monetarias para mostrar o guardar en columnas REAL.
+    
+    Args:
+        centavos: Importe en centavos
+    
+    Returns:
+        float: Importe con dos decimales
+    """
+    return centavos / 100
+
+
+def aplicar_tasa(centavos: int, tasa: Numero) -> int:
+    """
+    Multiplica un importe por una tasa y redondea al centavo.
+    
+    Args:
+        centavos: Importe en centavos
+        tasa: Tasa como fracción (0.19 para 19 %)
+    
+    Returns:
+        int: Resultado en centavos
+    """
+    return int((centavos * _decimal(tasa)).quantize(_UNIDAD, rounding=ROUND_HALF_UP))
+
+
+def aplicar_porcentaje(centavos: int, porcentaje: Numero) -> int:
+    """
+    Calcula un porcentaje de un importe y redondea al centavo.
+    
+    Args:
+        centavos: Importe en centavos
+        porcentaje: Porcentaje de 0 a 100
+    
+    Returns:
+        int: Resultado en centavos
+    """
+    return aplicar_tasa(centavos, _decimal(porcentaje) / _CIEN)
+
+
+def formatear_dinero(centavos: int) -> str:
+    """Da formato a un importe en centavos ($1,234.56)."""
+    signo = "-" if centavos < 0 else ""
+    return f"{signo}${Decimal(abs(centavos)).scaleb(-2):,.2f}"
+
+
+class TotalesVenta:
+    """
+    Acumulados de una venta en centavos.
+    
+    Subtotal, descuentos e impuestos de los items se actualizan al agregar o
+    quitar cada línea, sin volver a recorrer el carrito. Los ajustes de la
+    venta (descuento fijo, descuento porcentual e impuesto sobre el subtotal
+    final) se aplican sobre esos acumulados al consultar los totales.
+    """
+    
+    def __init__(self, items: Iterable["ItemVenta"] = ()):
+        """
+        Inicializa los acumulados.
+        
+        Args:
+            items: Items iniciales de la venta
+        """
+        self.subtotal = 0
+        self.descuento_items = 0
+        self.impuesto_items = 0
+        self.descuento_fijo = 0
+        self.descuento_porcentaje = Decimal(0)
+        self.impuesto_porcentaje = Decimal(0)
+        for item in items:
+            self.agregar(item)
+    
+    def agregar(self, item: "ItemVenta"):
+        """Suma una línea a los acumulados."""
+        subtotal, descuento, impuesto = item.importes_centavos()
+        self.subtotal += subtotal
+        self.descuento_items += descuento
+        self.impuesto_items += impuesto
+    
+    def quitar(self, item: "ItemVenta"):
+        """Resta una línea de los acumulados."""
+        subtotal, descuento, impuesto = item.importes_centavos()
+        self.subtotal -= subtotal
+        self.descuento_items -= descuento
+        self.impuesto_items -= impuesto
+    
+    def reiniciar(self, items: Iterable["ItemVenta"]):
+        """Vuelve a calcular los acumulados desde cero (conserva los ajustes)."""
+        self.subtotal = self.descuento_items = self.impuesto_items = 0
+        for item in items:
+            self.agregar(item)
+    
+    def configurar_ajustes(self, impuesto_porcentaje: Numero = 0, descuento_fijo: Numero = 0,
+                           descuento_porcentaje: Numero = 0):
+        """
+        Define los descuentos e impuestos a nivel de venta.
+        
+        Args:
+            impuesto_porcentaje: Impuesto sobre el subtotal final, como fracción (0-1)
+            descuento_fijo: Descuento fijo en unidades monetarias
+            descuento_porcentaje: Descuento sobre el subtotal con descuentos de
+                items, como fracción (0-1)
+        """
+        self.impuesto_porcentaje = _decimal(impuesto_porcentaje)
+        self.descuento_fijo = a_centavos(descuento_fijo)
+        self.descuento_porcentaje = _decimal(descuento_porcentaje)
+    
+    @property
+    def descuento_porcentual(self) -> int:
+        """Descuento porcentual de la venta en centavos."""
+        return aplicar_tasa(self.subtotal - self.descuento_items, self.descuento_porcentaje)
+    
+    @property
+    def subtotal_final(self) -> int:
+        """Subtotal después de todos los descuentos (nunca negativo)."""
+        return max(
+            0,
+            self.subtotal - self.descuento_items - self.descuento_fijo - self.descuento_porcentual
+        )
+    
+    @property
+    def impuesto_venta(self) -> int:
+        """Impuesto de la venta sobre el subtotal final, en centavos."""
+        return aplicar_tasa(self.subtotal_final, self.impuesto_porcentaje)
+    
+    @property
+    def descuento_total(self) -> int:
+        """Descuentos de items más descuentos de la venta, en centavos."""
+        return self.descuento_items + self.descuento_fijo + self.descuento_porcentual
+    
+    @property
+    def impuesto_total(self) -> int:
+        """Impuestos de items más impuesto de la venta, en centavos."""
+        return self.impuesto_items + self.impuesto_venta
+    
+    @property
+    def total(self) -> int:
+        """Total a pagar en centavos."""
+        return self.subtotal_final + self.impuesto_venta + self.impuesto_items
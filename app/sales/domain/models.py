@@ -1,9 +1,11 @@
 """Modelos de dominio para el módulo de Ventas."""
 from dataclasses import dataclass, field
 from datetime import datetime, date
-from typing import List, Optional, Tuple
+from typing import List, NamedTuple, Optional, Tuple
 from enum import Enum
 
+from .dinero import TotalesVenta, a_centavos, a_unidades, aplicar_porcentaje
+
 
 class MetodoPago(Enum):
     """Métodos de pago disponibles."""
@@ -24,27 +26,45 @@ class ItemVenta:
     descuento: float = 0.0  # Porcentaje de descuento
     impuesto: float = 0.0  # Porcentaje de impuesto
     
+    def __post_init__(self):
+        """Redondear el precio unitario al centavo."""
+        if self.precio_unitario:
+            self.precio_unitario = a_unidades(a_centavos(self.precio_unitario))
+    
+    def importes_centavos(self) -> Tuple[int, int, int]:
+        """
+        Calcula los importes del item en centavos.
+        
+        Returns:
+            Tuple[int, int, int]: (subtotal, descuento, impuesto); el descuento y
+                el impuesto se redondean al centavo por línea
+        """
+        subtotal = self.cantidad * a_centavos(self.precio_unitario)
+        descuento = aplicar_porcentaje(subtotal, self.descuento)
+        impuesto = aplicar_porcentaje(subtotal - descuento, self.impuesto)
+        return subtotal, descuento, impuesto
+    
     def calcular_subtotal(self) -> float:
         """Calcula el subtotal del item antes de descuentos e impuestos."""
-        return self.cantidad * self.precio_unitario
+        return a_unidades(self.cantidad * a_centavos(self.precio_unitario))
     
     def calcular_descuento(self) -> float:
         """Calcula el monto del descuento."""
-        subtotal = self.calcular_subtotal()
-        return subtotal * (self.descuento / 100.0)
+        return a_unidades(self.importes_centavos()[1])
     
     def calcular_subtotal_con_descuento(self) -> float:
         """Calcula el subtotal después del descuento."""
-        return self.calcular_subtotal() - self.calcular_descuento()
+        subtotal, descuento, _ = self.importes_centavos()
+        return a_unidades(subtotal - descuento)
     
     def calcular_impuesto(self) -> float:
         """Calcula el monto del impuesto."""
-        subtotal_con_descuento = self.calcular_subtotal_con_descuento()
-        return subtotal_con_descuento * (self.impuesto / 100.0)
+        return a_unidades(self.importes_centavos()[2])
     
     def calcular_total(self) -> float:
         """Calcula el total del item (con descuento e impuesto)."""
-        return self.calcular_subtotal_con_descuento() + self.calcular_impuesto()
+        subtotal, descuento, impuesto = self.importes_centavos()
+        return a_unidades(subtotal - descuento + impuesto)
     
     def validar(self) -> Tuple[bool, Optional[str]]:
         """Valida que el item tenga todos los campos requeridos."""
@@ -125,6 +145,8 @@ class Venta:
     total: float = 0.0
     metodo_pago: MetodoPago = MetodoPago.EFECTIVO
     observaciones: str = ""
+    # Acumulados en centavos; subtotal, descuento_total, impuesto_total y total se derivan de aquí
+    totales: TotalesVenta = field(default=None, init=False, repr=False, compare=False)
     
     def __post_init__(self):
         """Inicializar valores por defecto."""
@@ -132,8 +154,16 @@ class Venta:
             self.fecha = datetime.now()
         if self.items is None:
             self.items = []
+        self.totales = TotalesVenta(self.items)
         if self.total == 0.0 and self.items:
-            self.calcular_total()
+            self._sincronizar_totales()
+    
+    def _sincronizar_totales(self):
+        """Copia los acumulados en centavos a los campos de la venta."""
+        self.subtotal = a_unidades(self.totales.subtotal)
+        self.descuento_total = a_unidades(self.totales.descuento_total)
+        self.impuesto_total = a_unidades(self.totales.impuesto_total)
+        self.total = a_unidades(self.totales.total)
     
     def agregar_item(self, item: ItemVenta):
         """Agrega un item a la venta."""
@@ -142,21 +172,48 @@ class Venta:
             raise ValueError(mensaje_error)
         
         self.items.append(item)
-        self.calcular_total()
+        self.totales.agregar(item)
+        self._sincronizar_totales()
     
     def remover_item(self, index: int):
         """Remueve un item de la venta por índice."""
         if 0 <= index < len(self.items):
-            self.items.pop(index)
-            self.calcular_total()
+            self.totales.quitar(self.items.pop(index))
+            self._sincronizar_totales()
+    
+    def cambiar_cantidad(self, index: int, cantidad: int):
+        """
+        Cambia la cantidad de un item actualizando los totales.
+        
+        Args:
+            index: Índice del item
+            cantidad: Nueva cantidad (mayor a 0)
+        """
+        if cantidad <= 0:
+            raise ValueError("La cantidad debe ser mayor a 0.")
+        item = self.items[index]
+        self.totales.quitar(item)
+        item.cantidad = cantidad
+        self.totales.agregar(item)
+        self._sincronizar_totales()
+    
+    def aplicar_ajustes(self, impuesto_porcentaje: float = 0.0, descuento_fijo: float = 0.0,
+                        descuento_porcentaje: float = 0.0):
+        """
+        Define los descuentos e impuestos a nivel de venta y actualiza los totales.
+        
+        Args:
+            impuesto_porcentaje: Impuesto sobre el subtotal final (0-1)
+            descuento_fijo: Descuento fijo en unidades monetarias
+            descuento_porcentaje: Descuento porcentual de la venta (0-1)
+        """
+        self.totales.configurar_ajustes(impuesto_porcentaje, descuento_fijo, descuento_porcentaje)
+        self._sincronizar_totales()
     
     def calcular_total(self) -> float:
-        """Calcula el total de la venta con descuentos e impuestos."""
-        self.subtotal = sum(item.calcular_subtotal() for item in self.items)
-        self.descuento_total = sum(item.calcular_descuento() for item in self.items)
-        subtotal_con_descuento = self.subtotal - self.descuento_total
-        self.impuesto_total = sum(item.calcular_impuesto() for item in self.items)
-        self.total = subtotal_con_descuento + self.impuesto_total
+        """Recalcula desde los items el total de la venta con descuentos e impuestos."""
+        self.totales.reiniciar(self.items)
+        self._sincronizar_totales()
         return self.total
     
     def validar(self) -> Tuple[bool, Optional[str]]:
@@ -184,7 +241,10 @@ class Venta:
             "impuesto_total": self.impuesto_total,
             "total": self.total,
             "metodo_pago": self.metodo_pago.value if isinstance(self.metodo_pago, MetodoPago) else self.metodo_pago,
-            "observaciones": self.observaciones
+            "observaciones": self.observaciones,
+            "impuesto_porcentaje_venta": str(self.totales.impuesto_porcentaje),
+            "descuento_fijo_venta": a_unidades(self.totales.descuento_fijo),
+            "descuento_porcentaje_venta": str(self.totales.descuento_porcentaje)
         }
     
     @classmethod
@@ -199,7 +259,7 @@ class Venta:
         metodo_pago_str = data.get("metodo_pago", "Efectivo")
         metodo_pago = MetodoPago(metodo_pago_str) if isinstance(metodo_pago_str, str) else metodo_pago_str
         
-        return cls(
+        venta = cls(
             id=data.get("id", 0),
             numero_factura=data.get("numero_factura", ""),
             fecha=fecha,
@@ -212,6 +272,12 @@ class Venta:
             metodo_pago=metodo_pago,
             observaciones=data.get("observaciones", "")
         )
+        venta.totales.configurar_ajustes(
+            data.get("impuesto_porcentaje_venta", 0),
+            data.get("descuento_fijo_venta", 0),
+            data.get("descuento_porcentaje_venta", 0)
+        )
+        return venta
 
 
 @dataclass
@@ -236,7 +302,12 @@ class Devolucion:
     
     def calcular_total(self) -> float:
         """Calcula el total de la devolución."""
-        self.total_devolucion = sum(item.calcular_total() for item in self.items_devolucion)
+        self.total_devolucion = a_unidades(sum(
+            subtotal - descuento + impuesto
+            for subtotal, descuento, impuesto in (
+                item.importes_centavos() for item in self.items_devolucion
+            )
+        ))
         return self.total_devolucion
     
     def validar(self) -> Tuple[bool, Optional[str]]:
@@ -398,3 +469,48 @@ class ConfiguracionImpuestos:
             "es_global": self.es_global
         }
 
+
+class RegistroVenta(NamedTuple):
+    """Fila de venta sin items, para recorridos por lotes (reportes, exportaciones)."""
+    id: int
+    numero_factura: str
+    fecha: datetime
+    cliente_id: Optional[int]
+    subtotal: float
+    descuento_total: float
+    impuesto_total: float
+    total: float
+    metodo_pago: str
+    observaciones: str
+
+
+class RegistroItemVenta(NamedTuple):
+    """Fila de item de venta con los datos de su venta, para recorridos por lotes."""
+    venta_id: int
+    numero_factura: str
+    fecha: datetime
+    codigo_producto: str
+    nombre_producto: str
+    cantidad: int
+    precio_unitario: float
+    descuento: float
+    impuesto: float
+    subtotal: float
+
+
+class RegistroGasto(NamedTuple):
+    """Fila de gasto, para recorridos por lotes."""
+    id: int
+    fecha: datetime
+    categoria: str
+    descripcion: str
+    monto: float
+    metodo_pago: str
+    observaciones: str
+
+
+class RegistroCliente(NamedTuple):
+    """Fila liviana de cliente, para sugerencias y selección en caja."""
+    id: int
+    nombre: str
+    documento: str
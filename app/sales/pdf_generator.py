@@ -1,7 +1,10 @@
 """Generador de PDFs para facturas y recibos."""
+import copy
+import threading
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
+from xml.sax.saxutils import escape
 
 try:
     from reportlab.lib.pagesizes import letter, A4
@@ -14,291 +17,399 @@ try:
 except ImportError:
     REPORTLAB_AVAILABLE = False
 
-from ..domain.models import Venta
+from ..config_module.domain.models import TiendaInfo
+from ..config_module.services.tienda_service import TiendaService, revision_tienda
+from .domain.models import Venta
 
 
-def generar_factura_pdf(venta: Venta, venta_id: int, output_dir: Optional[str] = None) -> str:
+class _PartesFactura:
     """
-    Genera un PDF de factura/recibo para una venta.
+    Partes fijas de una factura (estilos, tablas y párrafos).
     
-    Args:
-        venta: Objeto Venta con todos los datos
-        venta_id: ID de la venta
-        output_dir: Directorio donde guardar el PDF (por defecto: ./facturas)
-        
-    Returns:
-        str: Ruta completa al archivo PDF generado
+    No se modifican después de construirse: al cambiar la tienda la
+    plantilla crea otras, de modo que una factura en curso sigue usando
+    un conjunto completo y coherente.
     """
-    if not REPORTLAB_AVAILABLE:
-        raise ImportError(
-            "reportlab no está instalado. Instálelo con: pip install reportlab"
-        )
-    
-    # Directorio de salida
-    if output_dir is None:
-        output_dir = Path("facturas")
-    else:
-        output_dir = Path(output_dir)
-    
-    output_dir.mkdir(exist_ok=True)
-    
-    # Nombre del archivo
-    numero_factura = venta.numero_factura or f"FACT-{venta_id:05d}"
-    fecha_str = venta.fecha.strftime("%Y%m%d_%H%M%S") if venta.fecha else datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"{numero_factura}_{fecha_str}.pdf"
-    pdf_path = output_dir / filename
-    
-    # Crear documento con márgenes adecuados
-    doc = SimpleDocTemplate(
-        str(pdf_path),
-        pagesize=A4,
-        rightMargin=2*cm,
-        leftMargin=2*cm,
-        topMargin=2*cm,
-        bottomMargin=2*cm
-    )
     
-    # Estilos personalizados
-    styles = getSampleStyleSheet()
-    
-    # Estilo para título principal
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=22,
-        textColor=colors.HexColor('#dc0000'),
-        alignment=TA_CENTER,
-        spaceAfter=20,
-        spaceBefore=10
-    )
-    
-    # Estilo para encabezados de sección
-    heading_style = ParagraphStyle(
-        'CustomHeading',
-        parent=styles['Heading2'],
-        fontSize=13,
-        textColor=colors.HexColor('#dc0000'),
-        spaceAfter=10,
-        spaceBefore=15
-    )
-    
-    # Estilo para texto normal
-    normal_style = ParagraphStyle(
-        'CustomNormal',
-        parent=styles['Normal'],
-        fontSize=10,
-        textColor=colors.white,
-        spaceAfter=6
-    )
-    
-    # Contenido
-    story = []
-    
-    # ========== ENCABEZADO ==========
-    story.append(Paragraph("FACTURA / RECIBO", title_style))
-    story.append(Spacer(1, 0.3*cm))
-    
-    # ========== INFORMACIÓN PRINCIPAL DE LA FACTURA ==========
-    # Preparar fecha y hora
-    fecha_hora = venta.fecha.strftime("%d/%m/%Y %H:%M:%S") if venta.fecha else datetime.now().strftime("%d/%m/%Y %H:%M:%S")
-    
-    # Información principal - organizada en dos columnas claras
-    info_data = []
-    
-    # Fila 1: Número de factura
-    info_data.append([
-        Paragraph('<b>Número de Factura:</b>', normal_style),
-        Paragraph(numero_factura, normal_style)
-    ])
-    
-    # Fila 2: ID de Venta
-    info_data.append([
-        Paragraph('<b>ID de Venta:</b>', normal_style),
-        Paragraph(str(venta_id), normal_style)
-    ])
-    
-    # Fila 3: Fecha y Hora
-    info_data.append([
-        Paragraph('<b>Fecha y Hora:</b>', normal_style),
-        Paragraph(fecha_hora, normal_style)
-    ])
-    
-    # Fila 4: ID de Cliente (si existe)
-    if venta.cliente_id:
-        info_data.append([
-            Paragraph('<b>ID de Cliente:</b>', normal_style),
-            Paragraph(str(venta.cliente_id), normal_style)
+    def __init__(self, tienda_info: Optional[TiendaInfo]):
+        """
+        Crea estilos, tablas fijas y encabezados reutilizables.
+        
+        Args:
+            tienda_info: Información de la tienda para el encabezado (o None)
+        """
+        styles = getSampleStyleSheet()
+        
+        # Estilo para título principal
+        self.title_style = ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=22,
+            textColor=colors.HexColor('#dc0000'),
+            alignment=TA_CENTER,
+            spaceAfter=20,
+            spaceBefore=10
+        )
+        
+        # Estilo para encabezados de sección
+        self.heading_style = ParagraphStyle(
+            'CustomHeading',
+            parent=styles['Heading2'],
+            fontSize=13,
+            textColor=colors.HexColor('#dc0000'),
+            spaceAfter=10,
+            spaceBefore=15
+        )
+        
+        # Estilo para texto normal
+        self.normal_style = ParagraphStyle(
+            'CustomNormal',
+            parent=styles['Normal'],
+            fontSize=10,
+            textColor=colors.white,
+            spaceAfter=6
+        )
+        
+        # Estilo para datos de la tienda
+        self.tienda_style = ParagraphStyle(
+            'Tienda',
+            parent=styles['Normal'],
+            fontSize=11,
+            textColor=colors.HexColor('#888888'),
+            alignment=TA_CENTER,
+            spaceAfter=4
+        )
+        
+        # Total final
+        self.total_final_style = ParagraphStyle(
+            'TotalFinal',
+            parent=styles['Normal'],
+            fontSize=16,
+            textColor=colors.white,
+            alignment=TA_RIGHT
+        )
+        
+        # Pie de página
+        self.pie_style = ParagraphStyle(
+            'Pie',
+            parent=styles['Normal'],
+            fontSize=9,
+            textColor=colors.HexColor('#888888'),
+            alignment=TA_CENTER
+        )
+        
+        # ========== ESTILOS DE TABLAS ==========
+        self.info_table_style = TableStyle([
+            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#1a1a1a')),
+            ('BACKGROUND', (1, 0), (1, -1), colors.HexColor('#2a2a2a')),
+            ('TEXTCOLOR', (0, 0), (-1, -1), colors.white),
+            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+            ('ALIGN', (1, 0), (1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
+            ('TOPPADDING', (0, 0), (-1, -1), 10),
+            ('LEFTPADDING', (0, 0), (-1, -1), 10),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 10),
+            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#dc0000')),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
         ])
-    else:
-        info_data.append([
-            Paragraph('<b>Cliente:</b>', normal_style),
-            Paragraph('Consumidor Final', normal_style)
+        
+        self.product_table_style = TableStyle([
+            # Encabezados
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#dc0000')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 11),
+            
+            # Datos
+            ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#121212')),
+            ('TEXTCOLOR', (0, 1), (-1, -1), colors.white),
+            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 1), (-1, -1), 10),
+            ('ALIGN', (1, 1), (1, -1), 'LEFT'),  # Nombre alineado a la izquierda
+            ('ALIGN', (2, 1), (-1, -1), 'RIGHT'),  # Números a la derecha
+            
+            # Bordes
+            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#dc0000')),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+            ('TOPPADDING', (0, 0), (-1, -1), 8),
+            ('LEFTPADDING', (0, 0), (-1, -1), 8),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 8),
+            
+            # Filas alternadas
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.HexColor('#1a1a1a'), colors.HexColor('#121212')]),
         ])
-    
-    # Crear tabla de información principal
-    info_table = Table(info_data, colWidths=[6*cm, 9*cm])
-    info_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#1a1a1a')),
-        ('BACKGROUND', (1, 0), (1, -1), colors.HexColor('#2a2a2a')),
-        ('TEXTCOLOR', (0, 0), (-1, -1), colors.white),
-        ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-        ('ALIGN', (1, 0), (1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
-        ('TOPPADDING', (0, 0), (-1, -1), 10),
-        ('LEFTPADDING', (0, 0), (-1, -1), 10),
-        ('RIGHTPADDING', (0, 0), (-1, -1), 10),
-        ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#dc0000')),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-    ]))
-    
-    story.append(info_table)
-    story.append(Spacer(1, 0.8*cm))
-    
-    # ========== DETALLE DE PRODUCTOS ==========
-    story.append(Paragraph("DETALLE DE PRODUCTOS", heading_style))
-    story.append(Spacer(1, 0.3*cm))
-    
-    # Encabezados de tabla de productos
-    headers = ['Código', 'Producto', 'Cant.', 'P. Unit.', 'Subtotal']
-    table_data = [headers]
-    
-    # Agregar productos
-    for item in venta.items:
-        table_data.append([
-            item.codigo_producto,
-            item.nombre_producto,
-            str(item.cantidad),
-            f"${item.precio_unitario:,.2f}",
-            f"${item.calcular_subtotal():,.2f}"
+        
+        self.totales_table_style = TableStyle([
+            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#1a1a1a')),
+            ('BACKGROUND', (1, 0), (1, -1), colors.HexColor('#2a2a2a')),
+            ('TEXTCOLOR', (0, 0), (-1, -1), colors.white),
+            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+            ('ALIGN', (1, 0), (1, -1), 'RIGHT'),  # Números a la derecha
+            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 0), (-1, -1), 11),
+            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#dc0000')),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),  # Espaciado vertical adecuado
+            ('TOPPADDING', (0, 0), (-1, -1), 12),
+            ('LEFTPADDING', (0, 0), (-1, -1), 10),  # Padding horizontal para evitar superposición
+            ('RIGHTPADDING', (0, 0), (-1, -1), 10),
+            ('ROWBACKGROUNDS', (0, 0), (-1, -1), [colors.HexColor('#1a1a1a'), colors.HexColor('#2a2a2a'), colors.HexColor('#1a1a1a')]),
         ])
+        
+        self.total_final_table_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#dc0000')),
+            ('TEXTCOLOR', (0, 0), (-1, -1), colors.white),
+            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+            ('ALIGN', (1, 0), (1, -1), 'RIGHT'),  # Total alineado a la derecha
+            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 16),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 15),  # Más padding para evitar superposición
+            ('TOPPADDING', (0, 0), (-1, -1), 15),
+            ('LEFTPADDING', (0, 0), (-1, -1), 15),  # Padding generoso
+            ('RIGHTPADDING', (0, 0), (-1, -1), 15),
+            ('GRID', (0, 0), (-1, -1), 2, colors.HexColor('#ff0000')),  # Borde más grueso
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ])
+        
+        # ========== ENCABEZADO CON LA INFORMACIÓN DE LA TIENDA ==========
+        self.encabezado = [Paragraph("FACTURA / RECIBO", self.title_style)]
+        if tienda_info:
+            self.encabezado.append(Paragraph(f"<b>{escape(tienda_info.nombre)}</b>", self.tienda_style))
+            if tienda_info.descripcion:
+                self.encabezado.append(Paragraph(escape(tienda_info.descripcion), self.tienda_style))
+        self.encabezado.append(Spacer(1, 0.3*cm))
+        
+        # ========== PÁRRAFOS FIJOS ==========
+        etiqueta = self.parrafo
+        self.etiquetas_info = {
+            "numero": etiqueta('<b>Número de Factura:</b>'),
+            "venta_id": etiqueta('<b>ID de Venta:</b>'),
+            "fecha": etiqueta('<b>Fecha y Hora:</b>'),
+            "cliente_id": etiqueta('<b>ID de Cliente:</b>'),
+            "cliente": etiqueta('<b>Cliente:</b>'),
+            "consumidor_final": etiqueta('Consumidor Final'),
+        }
+        self.etiquetas_totales = [etiqueta('Subtotal:'), etiqueta('Descuento:'), etiqueta('Impuestos:')]
+        self.etiqueta_total_final = Paragraph('<b>TOTAL A PAGAR:</b>', self.total_final_style)
+        
+        self.seccion_productos = [
+            Paragraph("DETALLE DE PRODUCTOS", self.heading_style),
+            Spacer(1, 0.3*cm),
+        ]
+        self.seccion_totales = [
+            Paragraph("TOTALES", self.heading_style),
+            Spacer(1, 0.3*cm),
+        ]
+        self.encabezados_productos = ['Código', 'Producto', 'Cant.', 'P. Unit.', 'Subtotal']
     
-    # Crear tabla de productos
-    product_table = Table(table_data, colWidths=[2.5*cm, 6*cm, 1.5*cm, 2.5*cm, 2.5*cm])
-    product_table.setStyle(TableStyle([
-        # Encabezados
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#dc0000')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 11),
-        
-        # Datos
-        ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#121212')),
-        ('TEXTCOLOR', (0, 1), (-1, -1), colors.white),
-        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 1), (-1, -1), 10),
-        ('ALIGN', (1, 1), (1, -1), 'LEFT'),  # Nombre alineado a la izquierda
-        ('ALIGN', (2, 1), (-1, -1), 'RIGHT'),  # Números a la derecha
-        
-        # Bordes
-        ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#dc0000')),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-        ('TOPPADDING', (0, 0), (-1, -1), 8),
-        ('LEFTPADDING', (0, 0), (-1, -1), 8),
-        ('RIGHTPADDING', (0, 0), (-1, -1), 8),
-        
-        # Filas alternadas
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.HexColor('#1a1a1a'), colors.HexColor('#121212')]),
-    ]))
-    
-    story.append(product_table)
-    story.append(Spacer(1, 1*cm))
-    
-    # ========== SECCIÓN DE TOTALES (REORGANIZADA Y CORREGIDA) ==========
-    story.append(Paragraph("TOTALES", heading_style))
-    story.append(Spacer(1, 0.3*cm))
-    
-    # Tabla de totales parciales - ALINEADA CORRECTAMENTE
-    totales_data = [
-        [
-            Paragraph('Subtotal:', normal_style),
-            Paragraph(f"${venta.subtotal:,.2f}", normal_style)
-        ],
-        [
-            Paragraph('Descuento:', normal_style),
-            Paragraph(f"${venta.descuento_total:,.2f}", normal_style)
-        ],
-        [
-            Paragraph('Impuestos:', normal_style),
-            Paragraph(f"${venta.impuesto_total:,.2f}", normal_style)
-        ],
-    ]
-    
-    # Estilo para totales parciales
-    totales_style = TableStyle([
-        ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#1a1a1a')),
-        ('BACKGROUND', (1, 0), (1, -1), colors.HexColor('#2a2a2a')),
-        ('TEXTCOLOR', (0, 0), (-1, -1), colors.white),
-        ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-        ('ALIGN', (1, 0), (1, -1), 'RIGHT'),  # Números a la derecha
-        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 0), (-1, -1), 11),
-        ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#dc0000')),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 12),  # Espaciado vertical adecuado
-        ('TOPPADDING', (0, 0), (-1, -1), 12),
-        ('LEFTPADDING', (0, 0), (-1, -1), 10),  # Padding horizontal para evitar superposición
-        ('RIGHTPADDING', (0, 0), (-1, -1), 10),
-        ('ROWBACKGROUNDS', (0, 0), (-1, -1), [colors.HexColor('#1a1a1a'), colors.HexColor('#2a2a2a'), colors.HexColor('#1a1a1a')]),
-    ])
-    
-    totales_table = Table(totales_data, colWidths=[5*cm, 5*cm])
-    totales_table.setStyle(totales_style)
-    
-    story.append(totales_table)
-    story.append(Spacer(1, 0.6*cm))  # Espaciado antes del total final
+    def parrafo(self, texto: str) -> "Paragraph":
+        """Crea un párrafo con el estilo de texto normal."""
+        return Paragraph(texto, self.normal_style)
+
+
+class PlantillaFactura:
+    """
+    Plantilla de factura con estilos y encabezados precompilados.
     
-    # Total final - SEPARADO Y BIEN ESPACIADO
-    total_final_style = ParagraphStyle(
-        'TotalFinal',
-        parent=styles['Normal'],
-        fontSize=16,
-        textColor=colors.white,
-        alignment=TA_RIGHT
-    )
+    Los estilos, los TableStyle fijos, los párrafos de etiquetas y el
+    encabezado con la información de la tienda se construyen una sola vez;
+    cada factura solo arma las filas variables. La plantilla se reconstruye
+    cuando cambia la información de la tienda (ver revision_tienda).
+    """
     
-    total_final_data = [
-        [
-            Paragraph('<b>TOTAL A PAGAR:</b>', total_final_style),
-            Paragraph(f"<b>${venta.total:,.2f}</b>", total_final_style)
+    def __init__(self, tienda_service: Optional[TiendaService] = None):
+        """
+        Inicializa la plantilla (los estilos se construyen en el primer uso).
+        
+        Args:
+            tienda_service: Servicio de tienda (si None, se crea uno nuevo)
+        """
+        self.tienda_service = tienda_service or TiendaService()
+        self._lock = threading.Lock()
+        self._revision: Optional[int] = None
+        self._partes: Optional[_PartesFactura] = None
+    
+    def invalidar(self):
+        """Fuerza a reconstruir la plantilla en la próxima factura."""
+        with self._lock:
+            self._revision = None
+    
+    def _preparar(self) -> _PartesFactura:
+        """
+        Construye la plantilla si no existe o si cambió la información de la tienda.
+        
+        Returns:
+            Partes fijas vigentes, leídas bajo el lock; se usan sin él porque
+            nunca se modifican (una reconstrucción crea otras)
+        """
+        with self._lock:
+            revision = revision_tienda()
+            if self._revision != revision:
+                self._partes = _PartesFactura(self.tienda_service.obtener_informacion_tienda())
+                self._revision = revision
+            return self._partes
+    
+    @staticmethod
+    def _copias(flowables: List) -> List:
+        """Copia superficial de flowables fijos (no se comparten entre documentos)."""
+        return [copy.copy(flowable) for flowable in flowables]
+    
+    def construir_story(self, venta: Venta, venta_id: int, numero_factura: str) -> List:
+        """
+        Arma el contenido de una factura reutilizando la parte fija.
+        
+        Args:
+            venta: Venta a facturar
+            venta_id: ID de la venta
+            numero_factura: Número que se imprime en la factura
+        
+        Returns:
+            Lista de flowables para SimpleDocTemplate.build
+        """
+        partes = self._preparar()
+        etiquetas = partes.etiquetas_info
+        normal = partes.parrafo
+        
+        story = self._copias(partes.encabezado)
+        
+        # ========== INFORMACIÓN PRINCIPAL DE LA FACTURA ==========
+        fecha_hora = venta.fecha.strftime("%d/%m/%Y %H:%M:%S") if venta.fecha else datetime.now().strftime("%d/%m/%Y %H:%M:%S")
+        
+        info_data = [
+            [copy.copy(etiquetas["numero"]), normal(numero_factura)],
+            [copy.copy(etiquetas["venta_id"]), normal(str(venta_id) if venta_id else "Pendiente")],
+            [copy.copy(etiquetas["fecha"]), normal(fecha_hora)],
         ]
-    ]
-    
-    total_final_table = Table(total_final_data, colWidths=[5*cm, 5*cm])
-    total_final_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#dc0000')),
-        ('TEXTCOLOR', (0, 0), (-1, -1), colors.white),
-        ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-        ('ALIGN', (1, 0), (1, -1), 'RIGHT'),  # Total alineado a la derecha
-        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 16),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 15),  # Más padding para evitar superposición
-        ('TOPPADDING', (0, 0), (-1, -1), 15),
-        ('LEFTPADDING', (0, 0), (-1, -1), 15),  # Padding generoso
-        ('RIGHTPADDING', (0, 0), (-1, -1), 15),
-        ('GRID', (0, 0), (-1, -1), 2, colors.HexColor('#ff0000')),  # Borde más grueso
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-    ]))
-    
-    story.append(total_final_table)
-    story.append(Spacer(1, 1*cm))
+        if venta.cliente_id:
+            info_data.append([copy.copy(etiquetas["cliente_id"]), normal(str(venta.cliente_id))])
+        else:
+            info_data.append([copy.copy(etiquetas["cliente"]), copy.copy(etiquetas["consumidor_final"])])
+        
+        info_table = Table(info_data, colWidths=[6*cm, 9*cm])
+        info_table.setStyle(partes.info_table_style)
+        story.append(info_table)
+        story.append(Spacer(1, 0.8*cm))
+        
+        # ========== DETALLE DE PRODUCTOS ==========
+        story.extend(self._copias(partes.seccion_productos))
+        
+        table_data = [partes.encabezados_productos]
+        for item in venta.items:
+            table_data.append([
+                item.codigo_producto,
+                item.nombre_producto,
+                str(item.cantidad),
+                f"${item.precio_unitario:,.2f}",
+                f"${item.calcular_subtotal():,.2f}"
+            ])
+        
+        product_table = Table(table_data, colWidths=[2.5*cm, 6*cm, 1.5*cm, 2.5*cm, 2.5*cm])
+        product_table.setStyle(partes.product_table_style)
+        story.append(product_table)
+        story.append(Spacer(1, 1*cm))
+        
+        # ========== SECCIÓN DE TOTALES ==========
+        story.extend(self._copias(partes.seccion_totales))
+        
+        valores = [venta.subtotal, venta.descuento_total, venta.impuesto_total]
+        totales_data = [
+            [copy.copy(etiqueta), normal(f"${valor:,.2f}")]
+            for etiqueta, valor in zip(partes.etiquetas_totales, valores)
+        ]
+        totales_table = Table(totales_data, colWidths=[5*cm, 5*cm])
+        totales_table.setStyle(partes.totales_table_style)
+        story.append(totales_table)
+        story.append(Spacer(1, 0.6*cm))  # Espaciado antes del total final
+        
+        total_final_table = Table(
+            [[copy.copy(partes.etiqueta_total_final),
+              Paragraph(f"<b>${venta.total:,.2f}</b>", partes.total_final_style)]],
+            colWidths=[5*cm, 5*cm]
+        )
+        total_final_table.setStyle(partes.total_final_table_style)
+        story.append(total_final_table)
+        story.append(Spacer(1, 1*cm))
+        
+        # ========== PIE DE PÁGINA ==========
+        pie_text = f"Factura generada el {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}"
+        story.append(Paragraph(pie_text, partes.pie_style))
+        
+        return story
     
-    # ========== PIE DE PÁGINA ==========
-    pie_style = ParagraphStyle(
-        'Pie',
-        parent=styles['Normal'],
-        fontSize=9,
-        textColor=colors.HexColor('#888888'),
-        alignment=TA_CENTER
-    )
+    def generar(self, venta: Venta, venta_id: int, output_dir: Optional[str] = None) -> str:
+        """
+        Genera el PDF de factura/recibo de una venta.
+        
+        Args:
+            venta: Objeto Venta con todos los datos
+            venta_id: ID de la venta
+            output_dir: Directorio donde guardar el PDF (por defecto: ./facturas)
+        
+        Returns:
+            str: Ruta completa al archivo PDF generado
+        """
+        if not REPORTLAB_AVAILABLE:
+            raise ImportError(
+                "reportlab no está instalado. Instálelo con: pip install reportlab"
+            )
+        
+        # Directorio de salida
+        output_dir = Path("facturas") if output_dir is None else Path(output_dir)
+        output_dir.mkdir(exist_ok=True)
+        
+        # Nombre del archivo
+        numero_factura = venta.numero_factura or f"FACT-{venta_id:05d}"
+        fecha_str = venta.fecha.strftime("%Y%m%d_%H%M%S") if venta.fecha else datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"{numero_factura}_{fecha_str}.pdf"
+        pdf_path = output_dir / filename
+        
+        # Crear documento con márgenes adecuados
+        doc = SimpleDocTemplate(
+            str(pdf_path),
+            pagesize=A4,
+            rightMargin=2*cm,
+            leftMargin=2*cm,
+            topMargin=2*cm,
+            bottomMargin=2*cm
+        )
+        
+        doc.build(self.construir_story(venta, venta_id, numero_factura))
+        
+        return str(pdf_path)
+
+
+_plantilla: Optional[PlantillaFactura] = None
+_plantilla_lock = threading.Lock()
+
+
+def get_plantilla_factura() -> PlantillaFactura:
+    """
+    Obtiene la plantilla de factura compartida del proceso.
     
-    pie_text = f"Factura generada el {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}"
-    story.append(Paragraph(pie_text, pie_style))
+    Returns:
+        PlantillaFactura: Plantilla única, reconstruida solo cuando cambia la tienda
+    """
+    global _plantilla
+    with _plantilla_lock:
+        if _plantilla is None:
+            _plantilla = PlantillaFactura()
+        return _plantilla
+
+
+def generar_factura_pdf(venta: Venta, venta_id: int, output_dir: Optional[str] = None) -> str:
+    """
+    Genera un PDF de factura/recibo para una venta.
     
-    # Construir PDF
-    doc.build(story)
+    Args:
+        venta: Objeto Venta con todos los datos
+        venta_id: ID de la venta
+        output_dir: Directorio donde guardar el PDF (por defecto: ./facturas)
     
-    return str(pdf_path)
+    Returns:
+        str: Ruta completa al archivo PDF generado
+    """
+    return get_plantilla_factura().generar(venta, venta_id, output_dir)
@@ -0,0 +1,182 @@
+"""Cola de generación de facturas PDF en segundo plano."""
+import copy
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from enum import Enum
+from typing import Callable, Dict, List, Optional
+
+from ..config.settings import Settings
+from .domain.models import Venta
+from .pdf_generator import generar_factura_pdf
+
+
+class EstadoTrabajoPDF(Enum):
+    """Estados de un trabajo de generación de PDF."""
+    PENDIENTE = "Pendiente"
+    COMPLETADO = "Completado"
+    FALLIDO = "Fallido"
+
+
+@dataclass
+class TrabajoPDF:
+    """Trabajo de generación de la factura PDF de una venta."""
+
+    id: int
+    venta_id: int
+    numero_factura: str
+    estado: EstadoTrabajoPDF = EstadoTrabajoPDF.PENDIENTE
+    ruta: Optional[str] = None
+    error: Optional[Exception] = None
+
+
+class ColaFacturasPDF:
+    """
+    Genera facturas PDF en hilos de trabajo para no bloquear la interfaz.
+
+    Los callbacks se ejecutan en el hilo de trabajo: una interfaz Tkinter
+    debe pasar el resultado a su propio hilo (por ejemplo con una queue.Queue
+    revisada con after()).
+
+    La cola solo guarda los trabajos cuyo resultado nadie ha recogido: un
+    trabajo con al_terminar se descarta al entregarse al callback, y uno sin
+    callback al retirarlo con retirar().
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, output_dir: Optional[str] = None):
+        """
+        Inicializa la cola.
+
+        Args:
+            max_workers: Hilos de generación (si None, Settings.PDF_WORKERS)
+            output_dir: Directorio de salida (si None, el de generar_factura_pdf)
+        """
+        self.output_dir = output_dir
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or Settings.PDF_WORKERS,
+            thread_name_prefix="factura-pdf"
+        )
+        self._lock = threading.Lock()
+        self._trabajos: Dict[int, TrabajoPDF] = {}
+        self._ids = itertools.count(1)
+
+    def encolar(self, venta: Venta, venta_id: int,
+                al_terminar: Optional[Callable[[TrabajoPDF], None]] = None) -> TrabajoPDF:
+        """
+        Agrega la factura de una venta a la cola.
+
+        Args:
+            venta: Venta registrada (se copia, puede reutilizarse de inmediato)
+            venta_id: ID de la venta
+            al_terminar: Función llamada con el trabajo al completarse o fallar;
+                tras llamarla el trabajo deja de estar en la cola
+
+        Returns:
+            TrabajoPDF: Trabajo en estado PENDIENTE
+        """
+        venta = copy.deepcopy(venta)
+        with self._lock:
+            trabajo = TrabajoPDF(
+                id=next(self._ids),
+                venta_id=venta_id,
+                numero_factura=venta.numero_factura
+            )
+            self._trabajos[trabajo.id] = trabajo
+
+        self._executor.submit(self._generar, trabajo, venta, al_terminar)
+        return trabajo
+
+    def _generar(self, trabajo: TrabajoPDF, venta: Venta,
+                 al_terminar: Optional[Callable[[TrabajoPDF], None]]):
+        """Genera el PDF de un trabajo y actualiza su estado."""
+        try:
+            ruta = generar_factura_pdf(venta, trabajo.venta_id, self.output_dir)
+            with self._lock:
+                trabajo.ruta = str(ruta)
+                trabajo.estado = EstadoTrabajoPDF.COMPLETADO
+        except Exception as e:
+            with self._lock:
+                trabajo.error = e
+                trabajo.estado = EstadoTrabajoPDF.FALLIDO
+
+        if al_terminar:
+            try:
+                al_terminar(trabajo)
+            except Exception:
+                pass  # Un callback con errores no debe detener la cola
+            # El callback recibió el resultado: la cola ya no lo necesita
+            with self._lock:
+                self._trabajos.pop(trabajo.id, None)
+
+    def obtener_trabajo(self, trabajo_id: int) -> Optional[TrabajoPDF]:
+        """
+        Obtiene un trabajo por su ID.
+
+        Args:
+            trabajo_id: ID del trabajo
+
+        Returns:
+            TrabajoPDF si existe, None en caso contrario
+        """
+        with self._lock:
+            return self._trabajos.get(trabajo_id)
+
+    def retirar(self, trabajo_id: int) -> Optional[TrabajoPDF]:
+        """
+        Entrega un trabajo terminado y lo quita de la cola.
+
+        Args:
+            trabajo_id: ID del trabajo
+
+        Returns:
+            TrabajoPDF si existe y ya terminó, None en caso contrario (los
+            trabajos pendientes siguen en la cola)
+        """
+        with self._lock:
+            trabajo = self._trabajos.get(trabajo_id)
+            if trabajo is None or trabajo.estado == EstadoTrabajoPDF.PENDIENTE:
+                return None
+            return self._trabajos.pop(trabajo_id)
+
+    def obtener_trabajos(self, estado: Optional[EstadoTrabajoPDF] = None) -> List[TrabajoPDF]:
+        """
+        Obtiene los trabajos de la cola.
+
+        Args:
+            estado: Filtrar por estado (si None, todos)
+
+        Returns:
+            Lista de trabajos en orden de llegada
+        """
+        with self._lock:
+            return [t for t in self._trabajos.values() if estado is None or t.estado == estado]
+
+    def cerrar(self, esperar: bool = True):
+        """
+        Detiene la cola.
+
+        Args:
+            esperar: Si True, espera a que terminen los trabajos pendientes
+        """
+        self._executor.shutdown(wait=esperar)
+
+
+_cola: Optional[ColaFacturasPDF] = None
+_cola_lock = threading.Lock()
+
+
+def get_cola_facturas() -> ColaFacturasPDF:
+    """
+    Obtiene la cola de facturas compartida del proceso.
+
+    Returns:
+        ColaFacturasPDF: Cola única; sus trabajos continúan aunque se cierre
+        la ventana que los encoló y el proceso espera a que terminen al salir
+    """
+    global _cola
+    with _cola_lock:
+        if _cola is None:
+            _cola = ColaFacturasPDF()
+        return _cola
+
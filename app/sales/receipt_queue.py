@@ -0,0 +1,138 @@
+"""Cola de impresión de recibos térmicos en segundo plano."""
+import copy
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from enum import Enum
+from typing import Callable, Optional
+
+from .domain.models import Venta
+from .receipt_renderer import (
+    RenderizadorRecibos, SalidaRecibo, crear_salida_recibos, imprimir_recibo
+)
+
+
+class EstadoTrabajoRecibo(Enum):
+    """Estados de un trabajo de impresión de recibo."""
+    PENDIENTE = "Pendiente"
+    COMPLETADO = "Completado"
+    FALLIDO = "Fallido"
+
+
+@dataclass
+class TrabajoRecibo:
+    """Trabajo de impresión del recibo de una venta."""
+
+    id: int
+    venta_id: Optional[int]
+    numero_factura: str
+    estado: EstadoTrabajoRecibo = EstadoTrabajoRecibo.PENDIENTE
+    destino: Optional[str] = None
+    error: Optional[Exception] = None
+
+
+class ColaRecibos:
+    """
+    Genera y envía recibos en un hilo de trabajo para no bloquear la interfaz.
+
+    Un solo hilo imprime los recibos en el orden en que se encolan. Abrir
+    o escribir en una impresora puede tardar hasta
+    Settings.RECEIPT_DEVICE_TIMEOUT_S (ver SalidaDispositivo); esa espera
+    ocurre en este hilo y no en el de la interfaz.
+
+    Los callbacks se ejecutan en el hilo de trabajo: una interfaz Tkinter
+    debe pasar el resultado a su propio hilo (por ejemplo con una queue.Queue
+    revisada con after()).
+    """
+
+    def __init__(self, renderizador: Optional[RenderizadorRecibos] = None,
+                 salida: Optional[SalidaRecibo] = None):
+        """
+        Inicializa la cola.
+
+        Args:
+            renderizador: Renderizador a usar (si None, se crea en el primer recibo)
+            salida: Destino de los recibos (si None, crear_salida_recibos() en
+                el primer recibo)
+        """
+        self._renderizador = renderizador
+        self._salida = salida
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="recibo")
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def encolar(self, venta: Venta, venta_id: Optional[int],
+                al_terminar: Optional[Callable[[TrabajoRecibo], None]] = None) -> TrabajoRecibo:
+        """
+        Agrega el recibo de una venta a la cola.
+
+        Args:
+            venta: Venta registrada (se copia, puede reutilizarse de inmediato)
+            venta_id: ID de la venta (None si aún está pendiente en el diario)
+            al_terminar: Función llamada con el trabajo al completarse o fallar
+
+        Returns:
+            TrabajoRecibo: Trabajo en estado PENDIENTE
+        """
+        venta = copy.deepcopy(venta)
+        with self._lock:
+            trabajo = TrabajoRecibo(
+                id=next(self._ids),
+                venta_id=venta_id,
+                numero_factura=venta.numero_factura
+            )
+        self._executor.submit(self._imprimir, trabajo, venta, al_terminar)
+        return trabajo
+
+    def _imprimir(self, trabajo: TrabajoRecibo, venta: Venta,
+                  al_terminar: Optional[Callable[[TrabajoRecibo], None]]):
+        """Genera y envía el recibo de un trabajo y actualiza su estado."""
+        try:
+            # Se crean en el hilo de trabajo: consultan la tienda y pueden
+            # fallar si el dispositivo configurado no existe
+            if self._renderizador is None:
+                self._renderizador = RenderizadorRecibos()
+            if self._salida is None:
+                self._salida = crear_salida_recibos()
+            trabajo.destino = imprimir_recibo(
+                venta, trabajo.venta_id, self._renderizador, self._salida
+            )
+            trabajo.estado = EstadoTrabajoRecibo.COMPLETADO
+        except Exception as e:
+            trabajo.error = e
+            trabajo.estado = EstadoTrabajoRecibo.FALLIDO
+
+        if al_terminar:
+            try:
+                al_terminar(trabajo)
+            except Exception:
+                pass  # Un callback con errores no debe detener la cola
+
+    def cerrar(self, esperar: bool = True):
+        """
+        Detiene la cola.
+
+        Args:
+            esperar: Si True, espera a que terminen los recibos pendientes
+        """
+        self._executor.shutdown(wait=esperar)
+
+
+_cola: Optional[ColaRecibos] = None
+_cola_lock = threading.Lock()
+
+
+def get_cola_recibos() -> ColaRecibos:
+    """
+    Obtiene la cola de recibos compartida del proceso.
+
+    Returns:
+        ColaRecibos: Cola única, de modo que todos los recibos llegan en orden
+        a la misma impresora
+    """
+    global _cola
+    with _cola_lock:
+        if _cola is None:
+            _cola = ColaRecibos()
+        return _cola
@@ -0,0 +1,369 @@
+"""Generador de recibos térmicos (texto plano o ESC/POS) para impresoras de 58/80 mm."""
+import os
+import threading
+import textwrap
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional, Protocol, Tuple
+
+from ..config.settings import Settings
+from ..config_module.services.tienda_service import TiendaService, revision_tienda
+from .domain.models import Venta, MetodoPago
+
+
+# Caracteres por línea con la fuente A de una impresora térmica
+COLUMNAS_POR_ANCHO = {58: 32, 80: 48}
+
+# Comandos ESC/POS
+ESC_INICIALIZAR = b"\x1b@"
+ESC_TABLA_PC850 = b"\x1bt\x02"
+ESC_IZQUIERDA = b"\x1ba\x00"
+ESC_CENTRO = b"\x1ba\x01"
+ESC_NEGRITA = b"\x1bE\x01"
+ESC_SIN_NEGRITA = b"\x1bE\x00"
+GS_DOBLE_ALTO = b"\x1d!\x01"
+GS_TAMAÑO_NORMAL = b"\x1d!\x00"
+GS_AVANZAR_Y_CORTAR = b"\x1dVB\x03"
+
+# Estilos de línea
+NORMAL = 0
+CENTRADO = 1
+DESTACADO = 2  # Centrado, negrita y doble alto
+
+LineaRecibo = Tuple[str, int]
+
+
+class SalidaRecibo(Protocol):
+    """Destino al que se envían los recibos generados."""
+    
+    def escribir(self, datos: bytes, nombre: str) -> str:
+        """
+        Envía un recibo al destino.
+        
+        Args:
+            datos: Contenido del recibo
+            nombre: Nombre sugerido (número de factura)
+        
+        Returns:
+            str: Descripción de dónde quedó el recibo
+        """
+        ...
+
+
+class SalidaArchivo:
+    """Guarda cada recibo como un archivo en un directorio."""
+    
+    def __init__(self, directorio: str, extension: str = ".txt"):
+        """
+        Inicializa la salida.
+        
+        Args:
+            directorio: Directorio donde se guardan los recibos
+            extension: Extensión de los archivos (.txt o .bin para ESC/POS)
+        """
+        self.directorio = Path(directorio)
+        self.extension = extension
+    
+    def escribir(self, datos: bytes, nombre: str) -> str:
+        """Escribe el recibo en <directorio>/<nombre><extension>."""
+        self.directorio.mkdir(parents=True, exist_ok=True)
+        ruta = self.directorio / f"{nombre}{self.extension}"
+        ruta.write_bytes(datos)
+        return str(ruta)
+
+
+class SalidaDispositivo:
+    """
+    Envía los recibos a un dispositivo o tubería con nombre.
+    
+    Sirve para impresoras locales expuestas como archivo (/dev/usb/lp0,
+    LPT1, una impresora compartida) o para una tubería con nombre leída por
+    otro proceso.
+    
+    Abrir o escribir en un dispositivo puede bloquearse indefinidamente (una
+    impresora apagada, una tubería sin lector), así que el envío se hace en
+    un hilo aparte y escribir() espera como máximo timeout segundos. Mientras
+    un envío siga bloqueado, los siguientes fallan de inmediato. La interfaz
+    no llama a escribir() directamente sino a través de ColaRecibos, de modo
+    que esa espera nunca ocurre en su hilo.
+    """
+    
+    def __init__(self, ruta: str, timeout: Optional[float] = None):
+        """
+        Inicializa la salida.
+        
+        Args:
+            ruta: Ruta del dispositivo o de la tubería
+            timeout: Segundos de espera por recibo (si None, Settings.RECEIPT_DEVICE_TIMEOUT_S)
+        """
+        self.ruta = ruta
+        self.timeout = Settings.RECEIPT_DEVICE_TIMEOUT_S if timeout is None else timeout
+        self._lock = threading.Lock()
+        self._envio: Optional[threading.Thread] = None
+    
+    def escribir(self, datos: bytes, nombre: str) -> str:
+        """
+        Escribe el recibo completo en el dispositivo.
+        
+        Raises:
+            TimeoutError: Si el dispositivo no recibió el recibo a tiempo
+            OSError: Si el dispositivo no se pudo abrir o escribir
+        """
+        resultado = {}
+        with self._lock:
+            if self._envio is not None and self._envio.is_alive():
+                raise TimeoutError(
+                    f"El dispositivo {self.ruta} aún no recibe el recibo anterior"
+                )
+            # Hilo demonio: un envío bloqueado no impide cerrar la aplicación
+            self._envio = threading.Thread(
+                target=self._enviar, args=(datos, resultado),
+                name="recibo-dispositivo", daemon=True
+            )
+            self._envio.start()
+            envio = self._envio
+        
+        envio.join(self.timeout)
+        if envio.is_alive():
+            raise TimeoutError(
+                f"El dispositivo {self.ruta} no respondió en {self.timeout:g} s"
+            )
+        if "error" in resultado:
+            raise resultado["error"]
+        return self.ruta
+    
+    def _enviar(self, datos: bytes, resultado: dict):
+        """Abre el dispositivo y escribe los datos (se ejecuta en el hilo de envío)."""
+        try:
+            # O_NONBLOCK hace que una tubería sin lector falle al abrir (ENXIO)
+            # en lugar de esperar; la escritura vuelve a ser bloqueante
+            flags = os.O_WRONLY | getattr(os, "O_NONBLOCK", 0) | getattr(os, "O_BINARY", 0)
+            fd = os.open(self.ruta, flags)
+            try:
+                if hasattr(os, "O_NONBLOCK"):
+                    os.set_blocking(fd, True)
+                pendiente = memoryview(datos)
+                while pendiente:
+                    pendiente = pendiente[os.write(fd, pendiente):]
+            finally:
+                os.close(fd)
+        except Exception as e:
+            resultado["error"] = e
+
+
+class RenderizadorRecibos:
+    """
+    Da formato a una venta como recibo de ancho fijo.
+    
+    El encabezado con la información de la tienda se cachea y solo se
+    vuelve a consultar cuando cambia (ver revision_tienda).
+    """
+    
+    def __init__(self, ancho_mm: Optional[int] = None,
+                 tienda_service: Optional[TiendaService] = None):
+        """
+        Inicializa el renderizador.
+        
+        Args:
+            ancho_mm: Ancho del papel, 58 u 80 (si None, Settings.RECEIPT_WIDTH_MM)
+            tienda_service: Servicio de tienda (si None, se crea uno nuevo)
+        """
+        ancho_mm = ancho_mm or Settings.RECEIPT_WIDTH_MM
+        if ancho_mm not in COLUMNAS_POR_ANCHO:
+            raise ValueError(f"Ancho de recibo no soportado: {ancho_mm} mm (use 58 u 80)")
+        self.columnas = COLUMNAS_POR_ANCHO[ancho_mm]
+        self.tienda_service = tienda_service or TiendaService()
+        self._separador = ("-" * self.columnas, NORMAL)
+        self._encabezado: List[LineaRecibo] = []
+        self._revision: Optional[int] = None
+    
+    def _obtener_encabezado(self) -> List[LineaRecibo]:
+        """Líneas con el nombre y la descripción de la tienda."""
+        revision = revision_tienda()
+        if self._revision != revision:
+            encabezado = []
+            tienda_info = self.tienda_service.obtener_informacion_tienda()
+            if tienda_info:
+                # En doble alto caben las mismas columnas (solo cambia la altura)
+                encabezado.extend((linea, DESTACADO) for linea in self._ajustar(tienda_info.nombre))
+                if tienda_info.descripcion:
+                    encabezado.extend(
+                        (linea, CENTRADO) for linea in self._ajustar(tienda_info.descripcion)
+                    )
+            self._encabezado = encabezado
+            self._revision = revision
+        return self._encabezado
+    
+    def _ajustar(self, texto: str) -> List[str]:
+        """Divide un texto en líneas del ancho del recibo."""
+        return textwrap.wrap(texto, self.columnas) or [""]
+    
+    def _columnas(self, izquierda: str, derecha: str) -> str:
+        """Une dos textos alineando el segundo a la derecha."""
+        espacio = max(1, self.columnas - len(izquierda) - len(derecha))
+        return f"{izquierda}{' ' * espacio}{derecha}"
+    
+    def construir_lineas(self, venta: Venta, venta_id: int) -> List[LineaRecibo]:
+        """
+        Arma las líneas del recibo de una venta.
+        
+        Args:
+            venta: Venta registrada
+            venta_id: ID de la venta
+        
+        Returns:
+            Lista de (texto, estilo)
+        """
+        numero_factura = venta.numero_factura or f"FACT-{venta_id:05d}"
+        fecha = (venta.fecha or datetime.now()).strftime("%d/%m/%Y %H:%M")
+        cliente = f"ID {venta.cliente_id}" if venta.cliente_id else "Consumidor Final"
+        metodo_pago = (
+            venta.metodo_pago.value if isinstance(venta.metodo_pago, MetodoPago)
+            else str(venta.metodo_pago)
+        )
+        
+        lineas = list(self._obtener_encabezado())
+        lineas.append(self._separador)
+        lineas.append((f"Factura: {numero_factura}", NORMAL))
+        lineas.append((f"Fecha: {fecha}", NORMAL))
+        lineas.append((f"Cliente: {cliente}", NORMAL))
+        lineas.append(self._separador)
+        
+        for item in venta.items:
+            lineas.extend((linea, NORMAL) for linea in self._ajustar(item.nombre_producto))
+            lineas.append((self._columnas(
+                f"  {item.cantidad} x ${item.precio_unitario:,.2f}",
+                f"${item.calcular_subtotal():,.2f}"
+            ), NORMAL))
+        
+        lineas.append(self._separador)
+        lineas.append((self._columnas("Subtotal:", f"${venta.subtotal:,.2f}"), NORMAL))
+        lineas.append((self._columnas("Descuento:", f"${venta.descuento_total:,.2f}"), NORMAL))
+        lineas.append((self._columnas("Impuestos:", f"${venta.impuesto_total:,.2f}"), NORMAL))
+        lineas.append((f"TOTAL: ${venta.total:,.2f}", DESTACADO))
+        lineas.append((f"Pago: {metodo_pago}", NORMAL))
+        lineas.append(self._separador)
+        lineas.append(("¡Gracias por su compra!", CENTRADO))
+        return lineas
+    
+    def renderizar_texto(self, venta: Venta, venta_id: int) -> str:
+        """
+        Genera el recibo como texto plano.
+        
+        Args:
+            venta: Venta registrada
+            venta_id: ID de la venta
+        
+        Returns:
+            str: Recibo con una línea por renglón
+        """
+        return "\n".join(
+            texto.center(self.columnas).rstrip() if estilo != NORMAL else texto
+            for texto, estilo in self.construir_lineas(venta, venta_id)
+        ) + "\n"
+    
+    def renderizar_escpos(self, venta: Venta, venta_id: int, cortar: bool = True) -> bytes:
+        """
+        Genera el recibo como comandos ESC/POS (página de códigos PC850).
+        
+        Args:
+            venta: Venta registrada
+            venta_id: ID de la venta
+            cortar: Si True, avanza el papel y corta al final
+        
+        Returns:
+            bytes: Datos listos para enviar a la impresora
+        """
+        partes = [ESC_INICIALIZAR, ESC_TABLA_PC850]
+        estilo_actual = NORMAL
+        for texto, estilo in self.construir_lineas(venta, venta_id):
+            if estilo != estilo_actual:
+                if estilo_actual == DESTACADO:
+                    partes.append(ESC_SIN_NEGRITA + GS_TAMAÑO_NORMAL)
+                partes.append(ESC_IZQUIERDA if estilo == NORMAL else ESC_CENTRO)
+                if estilo == DESTACADO:
+                    partes.append(ESC_NEGRITA + GS_DOBLE_ALTO)
+                estilo_actual = estilo
+            partes.append(texto.encode("cp850", errors="replace") + b"\n")
+        
+        if estilo_actual == DESTACADO:
+            partes.append(ESC_SIN_NEGRITA + GS_TAMAÑO_NORMAL)
+        partes.append(ESC_IZQUIERDA)
+        if cortar:
+            partes.append(GS_AVANZAR_Y_CORTAR)
+        return b"".join(partes)
+
+
+# Nombres de dispositivo reservados de Windows (existen sin ser archivos)
+DISPOSITIVOS_WINDOWS = {"PRN", "AUX", "NUL"} | {
+    f"{tipo}{numero}" for tipo in ("COM", "LPT") for numero in range(1, 10)
+}
+
+
+def _es_ruta_dispositivo(ruta: str) -> bool:
+    """Indica si una ruta nombra un dispositivo (/dev/usb/lp0, LPT1, COM3, ...)."""
+    normalizada = ruta.replace("\\", "/")
+    if normalizada.startswith(("/dev/", "//./", "//?/")):
+        return True
+    return os.path.basename(normalizada).rstrip(":").upper() in DISPOSITIVOS_WINDOWS
+
+
+def crear_salida_recibos() -> SalidaRecibo:
+    """
+    Crea la salida configurada en Settings.RECEIPT_OUTPUT.
+    
+    Una ruta de directorio guarda un archivo por recibo (se crea si no
+    existe); un dispositivo o una tubería con nombre existente se abre y se
+    escribe.
+    
+    Returns:
+        SalidaRecibo: Salida de recibos
+    
+    Raises:
+        ValueError: Si la ruta nombra un dispositivo que no existe (impresora
+            desconectada o ruta mal configurada)
+    """
+    ruta = Settings.RECEIPT_OUTPUT
+    if not os.path.isdir(ruta):
+        # En Windows los dispositivos (LPT1, \\.\COM3) no siempre "existen"
+        if os.path.exists(ruta) or (os.name == "nt" and _es_ruta_dispositivo(ruta)):
+            return SalidaDispositivo(ruta)
+        # Un dispositivo ausente no debe convertirse en un directorio nuevo
+        if _es_ruta_dispositivo(ruta):
+            raise ValueError(
+                f"El dispositivo de recibos {ruta} no existe: revise que la impresora "
+                f"esté conectada o corrija RECEIPT_OUTPUT"
+            )
+    extension = ".bin" if Settings.RECEIPT_FORMAT == "escpos" else ".txt"
+    return SalidaArchivo(ruta, extension)
+
+
+def imprimir_recibo(venta: Venta, venta_id: int,
+                    renderizador: Optional[RenderizadorRecibos] = None,
+                    salida: Optional[SalidaRecibo] = None,
+                    formato: Optional[str] = None) -> str:
+    """
+    Genera el recibo de una venta y lo envía a la salida.
+    
+    Args:
+        venta: Venta registrada
+        venta_id: ID de la venta
+        renderizador: Renderizador a usar (si None, uno con la configuración actual)
+        salida: Destino del recibo (si None, crear_salida_recibos())
+        formato: "escpos" o "texto" (si None, Settings.RECEIPT_FORMAT)
+    
+    Returns:
+        str: Descripción de dónde quedó el recibo
+    """
+    renderizador = renderizador or RenderizadorRecibos()
+    salida = salida or crear_salida_recibos()
+    formato = formato or Settings.RECEIPT_FORMAT
+    
+    if formato == "escpos":
+        datos = renderizador.renderizar_escpos(venta, venta_id)
+    elif formato == "texto":
+        datos = renderizador.renderizar_texto(venta, venta_id).encode("utf-8")
+    else:
+        raise ValueError(f"Formato de recibo desconocido: '{formato}'")
+    
+    return salida.escribir(datos, venta.numero_factura or f"FACT-{venta_id:05d}")
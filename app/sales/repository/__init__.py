@@ -1,5 +1,5 @@
 """Repositorio del módulo de Ventas."""
+from .diario_ventas import DiarioVentas, get_diario_ventas
 from .venta_repository import VentaRepository
 
-__all__ = ["VentaRepository"]
-
+__all__ = ["DiarioVentas", "get_diario_ventas", "VentaRepository"]
@@ -1,11 +1,15 @@
 """Repositorio para acceso a datos de clientes."""
-import sqlite3
 from typing import List, Optional
-from contextlib import contextmanager
 from datetime import datetime
 
+from ...database.connection_manager import get_connection_manager
+from ...database.migrations import ensure_schema
 from ...config.settings import Settings
-from ..domain.models import Cliente
+from ...utils.texto import limites_prefijo, normalizar_texto, patron_like
+from ..domain.models import Cliente, RegistroCliente
+
+# Columnas que lee _row_to_cliente, en orden
+COLUMNAS_CLIENTE = "id, nombre, documento, telefono, email, direccion, fecha_registro"
 
 
 class ClienteRepository:
@@ -19,33 +23,11 @@ class ClienteRepository:
             db_path: Ruta al archivo de base de datos SQLite
         """
         self.db_path = db_path or Settings.DATABASE_PATH
-        self._init_database()
-    
-    def _init_database(self):
-        """Inicializa la base de datos y crea las tablas si no existen."""
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS clientes (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    nombre TEXT NOT NULL,
-                    documento TEXT,
-                    telefono TEXT,
-                    email TEXT,
-                    direccion TEXT,
-                    fecha_registro TIMESTAMP NOT NULL
-                )
-            """)
-            conn.commit()
+        ensure_schema(self.db_path, "inventario")
     
-    @contextmanager
     def _get_connection(self):
-        """Context manager para obtener conexiones a la base de datos."""
-        conn = sqlite3.connect(self.db_path)
-        try:
-            yield conn
-        finally:
-            conn.close()
+        """Context manager para obtener conexiones del pool compartido."""
+        return get_connection_manager(self.db_path).connection()
     
     def create(self, cliente: Cliente) -> int:
         """
@@ -60,10 +42,12 @@ class ClienteRepository:
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
-                """INSERT INTO clientes (nombre, documento, telefono, email, direccion, fecha_registro)
-                   VALUES (?, ?, ?, ?, ?, ?)""",
+                """INSERT INTO clientes (nombre, documento, telefono, email, direccion, fecha_registro,
+                                        nombre_normalizado)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
                 (cliente.nombre, cliente.documento, cliente.telefono, 
-                 cliente.email, cliente.direccion, cliente.fecha_registro)
+                 cliente.email, cliente.direccion, cliente.fecha_registro,
+                 normalizar_texto(cliente.nombre))
             )
             conn.commit()
             return cursor.lastrowid
@@ -80,13 +64,81 @@ class ClienteRepository:
         """
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT * FROM clientes WHERE id = ?", (cliente_id,))
+            cursor.execute(f"SELECT {COLUMNAS_CLIENTE} FROM clientes WHERE id = ?", (cliente_id,))
             row = cursor.fetchone()
             
             if row:
                 return self._row_to_cliente(row)
             return None
     
+    def get_by_documento(self, documento: str) -> Optional[Cliente]:
+        """
+        Obtiene un cliente por su documento (DNI, RUC, etc.) con una sola búsqueda en el índice.
+        
+        Args:
+            documento: Documento exacto (se ignoran los espacios de los extremos)
+            
+        Returns:
+            Cliente si existe (el más antiguo si hay varios con el mismo
+            documento), None en caso contrario
+        """
+        documento = documento.strip()
+        if not documento:
+            return None
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"SELECT {COLUMNAS_CLIENTE} FROM clientes WHERE documento = ? ORDER BY id LIMIT 1",
+                (documento,)
+            )
+            row = cursor.fetchone()
+            return self._row_to_cliente(row) if row else None
+    
+    def buscar_por_prefijo(self, texto: str, limite: int = 20) -> List[RegistroCliente]:
+        """
+        Sugiere clientes cuyo documento o nombre empieza por un texto.
+        
+        Ambas búsquedas son por rango en los índices de documento y de
+        nombre_normalizado, así que su costo depende del límite y no del
+        número de clientes. Primero van las coincidencias por documento.
+        
+        Args:
+            texto: Inicio del documento o del nombre (sin distinguir tildes ni
+                mayúsculas en el nombre)
+            limite: Máximo de resultados
+            
+        Returns:
+            Lista de filas livianas (id, nombre, documento)
+        """
+        documento = texto.strip()
+        nombre = normalizar_texto(texto)
+        if not documento or limite <= 0:
+            return []
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """SELECT id, nombre, documento FROM clientes
+                   WHERE documento >= ? AND documento < ?
+                   ORDER BY documento LIMIT ?""",
+                (*limites_prefijo(documento), limite)
+            )
+            rows = cursor.fetchall()
+            cursor.execute(
+                """SELECT id, nombre, documento FROM clientes
+                   WHERE nombre_normalizado >= ? AND nombre_normalizado < ?
+                   ORDER BY nombre_normalizado LIMIT ?""",
+                (*limites_prefijo(nombre), limite)
+            )
+            rows.extend(cursor.fetchall())
+        
+        resultado: List[RegistroCliente] = []
+        vistos = set()
+        for cliente_id, nombre_cliente, documento_cliente in rows:
+            if cliente_id not in vistos and len(resultado) < limite:
+                vistos.add(cliente_id)
+                resultado.append(RegistroCliente(cliente_id, nombre_cliente, documento_cliente or ""))
+        return resultado
+    
     def get_all(self) -> List[Cliente]:
         """
         Obtiene todos los clientes.
@@ -96,13 +148,17 @@ class ClienteRepository:
         """
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT * FROM clientes ORDER BY nombre")
+            cursor.execute(f"SELECT {COLUMNAS_CLIENTE} FROM clientes ORDER BY nombre")
             rows = cursor.fetchall()
             return [self._row_to_cliente(row) for row in rows]
     
     def search_by_name(self, nombre: str) -> List[Cliente]:
         """
-        Busca clientes por nombre.
+        Busca clientes cuyo nombre contiene un texto, sin distinguir tildes ni mayúsculas.
+        
+        Primero van los nombres que empiezan por el texto (búsqueda por rango
+        en el índice de nombre_normalizado) y después los que lo contienen
+        en otra posición (recorriendo solo ese índice).
         
         Args:
             nombre: Nombre a buscar (parcial)
@@ -110,13 +166,30 @@ class ClienteRepository:
         Returns:
             Lista de clientes que coinciden
         """
+        texto = normalizar_texto(nombre)
+        if not texto:
+            return self.get_all()
+        inicio, fin = limites_prefijo(texto)
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
-                "SELECT * FROM clientes WHERE nombre LIKE ? ORDER BY nombre",
-                (f"%{nombre}%",)
+                f"""SELECT {COLUMNAS_CLIENTE} FROM clientes
+                    WHERE nombre_normalizado >= ? AND nombre_normalizado < ?
+                    ORDER BY nombre_normalizado""",
+                (inicio, fin)
             )
             rows = cursor.fetchall()
+            cursor.execute(
+                f"""SELECT {COLUMNAS_CLIENTE} FROM clientes
+                    WHERE id IN (
+                        SELECT id FROM clientes
+                        WHERE nombre_normalizado LIKE ? ESCAPE '\\'
+                          AND NOT (nombre_normalizado >= ? AND nombre_normalizado < ?)
+                    )
+                    ORDER BY nombre_normalizado""",
+                (patron_like(texto), inicio, fin)
+            )
+            rows.extend(cursor.fetchall())
             return [self._row_to_cliente(row) for row in rows]
     
     def update(self, cliente: Cliente) -> bool:
@@ -133,10 +206,11 @@ class ClienteRepository:
             cursor = conn.cursor()
             cursor.execute("""
                 UPDATE clientes 
-                SET nombre = ?, documento = ?, telefono = ?, email = ?, direccion = ?
+                SET nombre = ?, documento = ?, telefono = ?, email = ?, direccion = ?,
+                    nombre_normalizado = ?
                 WHERE id = ?
             """, (cliente.nombre, cliente.documento, cliente.telefono,
-                  cliente.email, cliente.direccion, cliente.id))
+                  cliente.email, cliente.direccion, normalizar_texto(cliente.nombre), cliente.id))
             conn.commit()
             return cursor.rowcount > 0
     
@@ -0,0 +1,341 @@
+"""Diario local de ventas (JSON Lines) escrito antes de tocar la base de datos."""
+import json
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional, Set
+
+from ...config.settings import Settings
+from ...database.connection_manager import _normalize_path
+from ..domain.models import Venta
+
+
+# Tipos de entrada del diario
+VENTA = "venta"
+APLICADA = "aplicada"
+DESCARTADA = "descartada"
+RECHAZADA = "rechazada"
+NUMERADA = "numerada"
+
+
+def ruta_diario_ventas(ventas_db: Optional[str] = None) -> str:
+    """
+    Obtiene la ruta del diario de una base de datos de ventas.
+    
+    Una ruta relativa en Settings.SALES_JOURNAL_PATH se toma junto al
+    archivo de la base de datos y no en el directorio de trabajo, de modo
+    que dos procesos iniciados desde directorios distintos comparten el
+    diario de la misma base.
+    
+    Args:
+        ventas_db: Base de datos de ventas (si None, Settings.SALES_DATABASE_PATH)
+    
+    Returns:
+        str: Ruta absoluta del diario
+    """
+    ruta = Settings.SALES_JOURNAL_PATH
+    if os.path.isabs(ruta):
+        return ruta
+    directorio = os.path.dirname(os.path.abspath(ventas_db or Settings.SALES_DATABASE_PATH))
+    return os.path.join(directorio, ruta)
+
+
+class DiarioVentas:
+    """
+    Diario de solo anexado con las ventas aceptadas en caja.
+    
+    Cada venta se escribe (con fsync) antes de intentar guardarla en la base
+    de datos y se marca como aplicada o descartada después. Las ventas sin
+    marca son las pendientes: se vuelven a aplicar en segundo plano o al
+    reiniciar la aplicación. Cuando no queda ninguna pendiente el archivo se
+    vacía. Las ventas con número provisional reciben su número definitivo
+    (entrada "numerada") antes de guardarse. Las ventas que no se pueden
+    aplicar al reproducirlas (por ejemplo, por un error de la base de datos
+    distinto de un bloqueo) se copian a <ruta>.rechazadas para revisarlas.
+    
+    Cada venta pendiente la aplica un solo hilo a la vez: registrar la deja
+    reclamada por quien la escribe (la caja), pendientes() omite las
+    reclamadas y el aplicador reclama cada una antes de reproducirla. La
+    marca de aplicada, descartada o rechazada, o liberar, suelta el reclamo.
+    """
+    
+    def __init__(self, ruta: Optional[str] = None):
+        """
+        Inicializa el diario y carga las ventas pendientes.
+        
+        Args:
+            ruta: Archivo del diario (si None, ruta_diario_ventas())
+        """
+        self.ruta = ruta or ruta_diario_ventas()
+        self.ruta_rechazadas = f"{self.ruta}.rechazadas"
+        self._lock = threading.Lock()
+        self._pendientes: "OrderedDict[str, dict]" = OrderedDict()
+        self._en_curso: Set[str] = set()
+        self._rechazadas = 0
+        self._cargar()
+        
+        directorio = os.path.dirname(os.path.abspath(self.ruta))
+        os.makedirs(directorio, exist_ok=True)
+        self._archivo = open(self.ruta, "a", encoding="utf-8")
+        if not self._pendientes:
+            self._archivo.truncate(0)
+    
+    def _cargar(self):
+        """Lee el diario y reconstruye las ventas pendientes."""
+        if os.path.exists(self.ruta_rechazadas):
+            with open(self.ruta_rechazadas, "r", encoding="utf-8") as archivo:
+                self._rechazadas = sum(1 for linea in archivo if linea.strip())
+        if not os.path.exists(self.ruta):
+            return
+        with open(self.ruta, "r", encoding="utf-8") as archivo:
+            for linea in archivo:
+                try:
+                    entrada = json.loads(linea)
+                except ValueError:
+                    # Línea incompleta de una escritura interrumpida: la venta
+                    # nunca se confirmó al cajero
+                    continue
+                numero = entrada.get("numero_factura")
+                if entrada.get("tipo") == VENTA:
+                    self._pendientes[numero] = entrada["venta"]
+                elif entrada.get("tipo") == NUMERADA:
+                    self._renombrar(numero, entrada["numero_definitivo"])
+                else:
+                    self._pendientes.pop(numero, None)
+    
+    def _renombrar(self, provisional: str, definitivo: str):
+        """Cambia el número de una venta pendiente conservando su orden (llamar con el lock tomado)."""
+        if provisional not in self._pendientes:
+            return
+        if provisional in self._en_curso:
+            self._en_curso.discard(provisional)
+            self._en_curso.add(definitivo)
+        self._pendientes = OrderedDict(
+            (definitivo, dict(datos, numero_factura=definitivo)) if numero == provisional
+            else (numero, datos)
+            for numero, datos in self._pendientes.items()
+        )
+    
+    def _escribir(self, entrada: Dict, sincronizar: bool):
+        """Añade una entrada al diario (llamar con el lock tomado)."""
+        self._archivo.write(json.dumps(entrada, ensure_ascii=False) + "\n")
+        self._archivo.flush()
+        if sincronizar:
+            os.fsync(self._archivo.fileno())
+    
+    def _retirar(self, numero_factura: str):
+        """Quita una venta de las pendientes y suelta su reclamo (llamar con el lock tomado)."""
+        self._pendientes.pop(numero_factura, None)
+        self._en_curso.discard(numero_factura)
+        self._compactar()
+    
+    def _compactar(self):
+        """Vacía el diario si no quedan ventas pendientes (llamar con el lock tomado)."""
+        if not self._pendientes:
+            self._archivo.truncate(0)
+    
+    def registrar(self, venta: Venta):
+        """
+        Escribe una venta en el diario y espera a que llegue al disco.
+        
+        La venta queda reclamada por el hilo que la registra: el aplicador
+        no la reproduce hasta que se marque o se libere (ver liberar).
+        
+        Si la escritura falla se recorta el archivo a su tamaño anterior;
+        si tampoco se puede recortar, la venta queda pendiente y reclamada
+        (ver contiene) porque podría reproducirse al reiniciar.
+        
+        Args:
+            venta: Venta con número de factura asignado
+        
+        Raises:
+            OSError: Si no se pudo escribir en el diario
+        """
+        if not venta.numero_factura:
+            raise ValueError("La venta debe tener número de factura para escribirse en el diario.")
+        datos = venta.to_dict()
+        with self._lock:
+            posicion = self._archivo.tell()
+            try:
+                self._escribir(
+                    {"tipo": VENTA, "numero_factura": venta.numero_factura, "venta": datos},
+                    sincronizar=True
+                )
+            except Exception:
+                try:
+                    self._archivo.truncate(posicion)
+                except OSError:
+                    self._pendientes[venta.numero_factura] = datos
+                    self._en_curso.add(venta.numero_factura)
+                raise
+            self._pendientes[venta.numero_factura] = datos
+            self._en_curso.add(venta.numero_factura)
+    
+    def contiene(self, numero_factura: str) -> bool:
+        """
+        Indica si una venta sigue pendiente en el diario (reclamada o no).
+        
+        Args:
+            numero_factura: Número de factura de la venta
+        
+        Returns:
+            bool: True si la venta podría guardarse todavía
+        """
+        with self._lock:
+            return numero_factura in self._pendientes
+    
+    def reclamar(self, numero_factura: str) -> bool:
+        """
+        Reclama una venta pendiente para aplicarla.
+        
+        Args:
+            numero_factura: Número de factura de la venta
+        
+        Returns:
+            bool: True si estaba pendiente y nadie la tenía reclamada
+        """
+        with self._lock:
+            if numero_factura not in self._pendientes or numero_factura in self._en_curso:
+                return False
+            self._en_curso.add(numero_factura)
+            return True
+    
+    def liberar(self, numero_factura: str):
+        """
+        Suelta el reclamo de una venta que sigue pendiente (p. ej. base bloqueada).
+        
+        Args:
+            numero_factura: Número de factura de la venta
+        """
+        with self._lock:
+            self._en_curso.discard(numero_factura)
+    
+    def asignar_numero(self, provisional: str, definitivo: str):
+        """
+        Registra el número definitivo de una venta aceptada con número provisional.
+        
+        Se escribe (con fsync) antes de guardar la venta, de modo que al
+        reproducir el diario la venta se reconoce por su número definitivo y
+        no se guarda dos veces.
+        
+        Args:
+            provisional: Número con el que se aceptó la venta
+            definitivo: Número de factura reservado para ella
+        """
+        with self._lock:
+            self._escribir(
+                {"tipo": NUMERADA, "numero_factura": provisional, "numero_definitivo": definitivo},
+                sincronizar=True
+            )
+            self._renombrar(provisional, definitivo)
+    
+    def marcar_aplicada(self, numero_factura: str):
+        """
+        Marca una venta como guardada en la base de datos.
+        
+        Args:
+            numero_factura: Número de factura de la venta
+        """
+        with self._lock:
+            # Sin fsync: si la marca se pierde, la venta se reproduce y se
+            # reconoce como ya registrada por su número de factura
+            self._escribir({"tipo": APLICADA, "numero_factura": numero_factura}, sincronizar=False)
+            self._retirar(numero_factura)
+    
+    def marcar_descartada(self, numero_factura: str):
+        """
+        Marca una venta que se rechazó en caja y no debe aplicarse.
+        
+        Args:
+            numero_factura: Número de factura de la venta
+        """
+        with self._lock:
+            self._escribir({"tipo": DESCARTADA, "numero_factura": numero_factura}, sincronizar=True)
+            self._retirar(numero_factura)
+    
+    def marcar_rechazada(self, numero_factura: str, motivo: str):
+        """
+        Retira del diario una venta que no se pudo aplicar y la guarda para revisión.
+        
+        Args:
+            numero_factura: Número de factura de la venta
+            motivo: Error que impidió aplicarla
+        """
+        with self._lock:
+            datos = self._pendientes.get(numero_factura)
+            with open(self.ruta_rechazadas, "a", encoding="utf-8") as archivo:
+                archivo.write(json.dumps({
+                    "numero_factura": numero_factura,
+                    "motivo": motivo,
+                    "fecha": datetime.now().isoformat(),
+                    "venta": datos
+                }, ensure_ascii=False) + "\n")
+                archivo.flush()
+                os.fsync(archivo.fileno())
+            self._escribir({"tipo": RECHAZADA, "numero_factura": numero_factura}, sincronizar=True)
+            self._rechazadas += 1
+            self._retirar(numero_factura)
+    
+    def pendientes(self) -> List[Venta]:
+        """
+        Obtiene las ventas que aún no se han guardado y que nadie tiene reclamadas.
+        
+        Returns:
+            Lista de ventas en el orden en que se aceptaron
+        """
+        with self._lock:
+            datos = [
+                venta for numero, venta in self._pendientes.items()
+                if numero not in self._en_curso
+            ]
+        return [Venta.from_dict(venta) for venta in datos]
+    
+    def numeros_pendientes(self) -> Set[str]:
+        """
+        Obtiene los números de factura de todas las ventas pendientes, reclamadas o no.
+        
+        Returns:
+            Set[str]: Números con los que esas ventas se guardarán
+        """
+        with self._lock:
+            return set(self._pendientes)
+    
+    def cantidad_pendientes(self) -> int:
+        """Número de ventas pendientes de aplicar."""
+        with self._lock:
+            return len(self._pendientes)
+    
+    def cantidad_rechazadas(self) -> int:
+        """Número de ventas copiadas a <ruta>.rechazadas para revisión."""
+        with self._lock:
+            return self._rechazadas
+    
+    def cerrar(self):
+        """Cierra el archivo del diario."""
+        with self._lock:
+            self._archivo.close()
+
+
+_diarios: Dict[str, DiarioVentas] = {}
+_diarios_lock = threading.Lock()
+
+
+def get_diario_ventas(ruta: Optional[str] = None) -> DiarioVentas:
+    """
+    Obtiene el diario compartido para una ruta.
+    
+    Args:
+        ruta: Archivo del diario (si None, ruta_diario_ventas())
+    
+    Returns:
+        DiarioVentas: Diario único por archivo dentro del proceso
+    """
+    ruta = ruta or ruta_diario_ventas()
+    key = _normalize_path(ruta)
+    with _diarios_lock:
+        diario = _diarios.get(key)
+        if diario is None:
+            diario = DiarioVentas(ruta)
+            _diarios[key] = diario
+        return diario
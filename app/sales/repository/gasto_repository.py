@@ -1,11 +1,12 @@
 """Repositorio para acceso a datos de gastos operativos."""
-import sqlite3
-from typing import List, Optional
-from contextlib import contextmanager
-from datetime import datetime, date
+from typing import Iterator, List, Optional
+from datetime import date
 
+from ...database.connection_manager import get_connection_manager, fetch_in_batches
+from ...database.migrations import ensure_schema
 from ...config.settings import Settings
-from ..domain.models import Gasto, MetodoPago
+from ...utils.fechas import formatear_fecha, parsear_fecha, rango_dias
+from ..domain.models import Gasto, MetodoPago, RegistroGasto
 
 
 class GastoRepository:
@@ -19,33 +20,11 @@ class GastoRepository:
             db_path: Ruta al archivo de base de datos SQLite
         """
         self.db_path = db_path or Settings.DATABASE_PATH
-        self._init_database()
+        ensure_schema(self.db_path, "inventario")
     
-    def _init_database(self):
-        """Inicializa la base de datos y crea las tablas si no existen."""
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS gastos (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    fecha TIMESTAMP NOT NULL,
-                    categoria TEXT NOT NULL,
-                    descripcion TEXT NOT NULL,
-                    monto REAL NOT NULL,
-                    metodo_pago TEXT NOT NULL,
-                    observaciones TEXT
-                )
-            """)
-            conn.commit()
-    
-    @contextmanager
     def _get_connection(self):
-        """Context manager para obtener conexiones a la base de datos."""
-        conn = sqlite3.connect(self.db_path)
-        try:
-            yield conn
-        finally:
-            conn.close()
+        """Context manager para obtener conexiones del pool compartido."""
+        return get_connection_manager(self.db_path).connection()
     
     def create(self, gasto: Gasto) -> int:
         """
@@ -63,7 +42,7 @@ class GastoRepository:
             cursor.execute(
                 """INSERT INTO gastos (fecha, categoria, descripcion, monto, metodo_pago, observaciones)
                    VALUES (?, ?, ?, ?, ?, ?)""",
-                (gasto.fecha, gasto.categoria, gasto.descripcion,
+                (formatear_fecha(gasto.fecha), gasto.categoria, gasto.descripcion,
                  gasto.monto, metodo_pago_val, gasto.observaciones)
             )
             conn.commit()
@@ -103,9 +82,9 @@ class GastoRepository:
             cursor = conn.cursor()
             cursor.execute(
                 """SELECT * FROM gastos 
-                   WHERE DATE(fecha) >= ? AND DATE(fecha) <= ?
+                   WHERE fecha >= ? AND fecha < ?
                    ORDER BY fecha DESC""",
-                (fecha_inicio.isoformat(), fecha_fin.isoformat())
+                rango_dias(fecha_inicio, fecha_fin)
             )
             rows = cursor.fetchall()
             return [self._row_to_gasto(row) for row in rows]
@@ -123,8 +102,8 @@ class GastoRepository:
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
-                "SELECT * FROM gastos WHERE DATE(fecha) = ? ORDER BY fecha DESC",
-                (fecha.isoformat(),)
+                "SELECT * FROM gastos WHERE fecha >= ? AND fecha < ? ORDER BY fecha DESC",
+                rango_dias(fecha, fecha)
             )
             rows = cursor.fetchall()
             return [self._row_to_gasto(row) for row in rows]
@@ -142,12 +121,44 @@ class GastoRepository:
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
-                "SELECT SUM(monto) FROM gastos WHERE DATE(fecha) = ?",
-                (fecha.isoformat(),)
+                "SELECT SUM(monto) FROM gastos WHERE fecha >= ? AND fecha < ?",
+                rango_dias(fecha, fecha)
             )
             result = cursor.fetchone()[0]
             return result if result else 0.0
     
+    def iter_gastos(self, fecha_inicio: Optional[date] = None, fecha_fin: Optional[date] = None,
+                    tamaño_lote: int = 500) -> Iterator[RegistroGasto]:
+        """
+        Recorre los gastos en orden cronológico, leyendo por lotes.
+        
+        Args:
+            fecha_inicio: Primer día incluido (None sin límite inferior)
+            fecha_fin: Último día incluido (None sin límite superior)
+            tamaño_lote: Filas leídas por lote
+            
+        Yields:
+            RegistroGasto: Cada gasto
+        """
+        query = "SELECT id, fecha, categoria, descripcion, monto, metodo_pago, observaciones FROM gastos WHERE 1=1"
+        params = []
+        if fecha_inicio is not None:
+            query += " AND fecha >= ?"
+            params.append(rango_dias(fecha_inicio, fecha_inicio)[0])
+        if fecha_fin is not None:
+            query += " AND fecha < ?"
+            params.append(rango_dias(fecha_fin, fecha_fin)[1])
+        query += " ORDER BY fecha, id"
+        
+        with get_connection_manager(self.db_path).dedicated_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            for row in fetch_in_batches(cursor, tamaño_lote):
+                yield RegistroGasto(
+                    row[0], parsear_fecha(row[1]), row[2], row[3], row[4],
+                    row[5], row[6] or ""
+                )
+    
     def get_all_categories(self) -> List[str]:
         """
         Obtiene todas las categorías de gastos únicas.
@@ -181,10 +192,7 @@ class GastoRepository:
         """Convierte una fila de la BD a un objeto Gasto."""
         gasto_id, fecha_db, categoria, descripcion, monto, metodo_pago_str, observaciones = row
         
-        if isinstance(fecha_db, str):
-            fecha = datetime.fromisoformat(fecha_db)
-        else:
-            fecha = datetime.fromtimestamp(fecha_db) if fecha_db else datetime.now()
+        fecha = parsear_fecha(fecha_db)
         
         try:
             metodo_pago = MetodoPago(metodo_pago_str)
@@ -0,0 +1,146 @@
+"""Carga por lotes de ventas con sus items."""
+import sqlite3
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence
+
+from ...utils.fechas import parsear_fecha
+from ..domain.models import Venta, ItemVenta, MetodoPago
+
+
+COLUMNAS_VENTA = """id, numero_factura, fecha, cliente_id, subtotal, descuento_total,
+                    impuesto_total, total, metodo_pago, observaciones"""
+
+COLUMNAS_ITEM = """venta_id, codigo_producto, nombre_producto, cantidad, precio_unitario,
+                   descuento, impuesto"""
+
+
+def fila_a_item(row: tuple) -> ItemVenta:
+    """
+    Convierte una fila de items_venta (COLUMNAS_ITEM) en un ItemVenta.
+
+    Args:
+        row: Fila con venta_id en la primera posición
+
+    Returns:
+        ItemVenta: Item de la venta
+    """
+    return ItemVenta(
+        codigo_producto=row[1] or "",
+        nombre_producto=row[2] or "",
+        cantidad=row[3] if row[3] else 0,
+        precio_unitario=row[4] if row[4] else 0.0,
+        descuento=row[5] if row[5] is not None else 0.0,
+        impuesto=row[6] if row[6] is not None else 0.0
+    )
+
+
+def fila_a_venta(row: tuple, items: Optional[List[ItemVenta]] = None) -> Venta:
+    """
+    Convierte una fila de ventas (COLUMNAS_VENTA) en una Venta.
+
+    Args:
+        row: Fila de la tabla ventas
+        items: Items ya cargados de la venta
+
+    Returns:
+        Venta: Venta con sus items
+    """
+    (venta_id, numero_factura, fecha_db, cliente_id, subtotal,
+     descuento_total, impuesto_total, total, metodo_pago_str, observaciones) = row
+
+    try:
+        metodo_pago = MetodoPago(metodo_pago_str) if metodo_pago_str else MetodoPago.EFECTIVO
+    except (ValueError, AttributeError):
+        metodo_pago = MetodoPago.EFECTIVO
+
+    return Venta(
+        id=venta_id,
+        numero_factura=numero_factura or "",
+        fecha=parsear_fecha(fecha_db),
+        items=items if items is not None else [],
+        cliente_id=cliente_id,
+        subtotal=subtotal or 0.0,
+        descuento_total=descuento_total or 0.0,
+        impuesto_total=impuesto_total or 0.0,
+        total=total or 0.0,
+        metodo_pago=metodo_pago,
+        observaciones=observaciones or ""
+    )
+
+
+def cargar_items(cursor: sqlite3.Cursor, venta_ids: Sequence[int],
+                 tamaño_lote: int = 500) -> Dict[int, List[ItemVenta]]:
+    """
+    Carga los items de un conjunto acotado de ventas.
+
+    Args:
+        cursor: Cursor de la conexión a la base de datos de ventas
+        venta_ids: IDs de las ventas
+        tamaño_lote: Máximo de IDs por consulta
+
+    Returns:
+        Diccionario venta_id -> items de la venta
+    """
+    items_por_venta: Dict[int, List[ItemVenta]] = defaultdict(list)
+    venta_ids = list(venta_ids)
+    for inicio in range(0, len(venta_ids), tamaño_lote):
+        lote = venta_ids[inicio:inicio + tamaño_lote]
+        marcadores = ", ".join("?" * len(lote))
+        cursor.execute(
+            f"""SELECT {COLUMNAS_ITEM} FROM items_venta
+                WHERE venta_id IN ({marcadores})
+                ORDER BY venta_id, id""",
+            lote
+        )
+        for row in cursor.fetchall():
+            items_por_venta[row[0]].append(fila_a_item(row))
+    return items_por_venta
+
+
+def cargar_ventas(cursor: sqlite3.Cursor, where: str = "", params: Sequence = (),
+                  orden: str = "ORDER BY fecha DESC, id DESC",
+                  limite: Optional[int] = None) -> List[Venta]:
+    """
+    Carga ventas y sus items con dos consultas en total.
+
+    Sin límite, los items se obtienen con una sola consulta que reutiliza el
+    mismo filtro de las ventas (venta_id IN (SELECT id ...)); con límite, se
+    buscan solo los de las ventas devueltas. En ambos casos se agrupan en memoria.
+
+    Args:
+        cursor: Cursor de la conexión a la base de datos de ventas
+        where: Cláusula WHERE sobre la tabla ventas (vacía para todas)
+        params: Parámetros de la cláusula WHERE
+        orden: Cláusula ORDER BY de las ventas
+        limite: Máximo de ventas a devolver (None para todas)
+
+    Returns:
+        Lista de ventas con sus items
+    """
+    params = list(params)
+    consulta = f"SELECT {COLUMNAS_VENTA} FROM ventas {where} {orden}"
+    if limite is not None:
+        consulta += f" LIMIT {int(limite)}"
+    cursor.execute(consulta, params)
+    filas_venta = cursor.fetchall()
+    if not filas_venta:
+        return []
+
+    if limite is not None:
+        items_por_venta = cargar_items(cursor, [row[0] for row in filas_venta])
+    else:
+        if where:
+            cursor.execute(
+                f"""SELECT {COLUMNAS_ITEM} FROM items_venta
+                    WHERE venta_id IN (SELECT id FROM ventas {where})
+                    ORDER BY venta_id, id""",
+                params
+            )
+        else:
+            cursor.execute(f"SELECT {COLUMNAS_ITEM} FROM items_venta ORDER BY venta_id, id")
+
+        items_por_venta = defaultdict(list)
+        for row in cursor.fetchall():
+            items_por_venta[row[0]].append(fila_a_item(row))
+
+    return [fila_a_venta(row, items_por_venta.get(row[0], [])) for row in filas_venta]
@@ -1,11 +1,31 @@
 """Repositorio para acceso a datos de ventas."""
 import sqlite3
-from typing import List, Optional
-from contextlib import contextmanager
 from datetime import datetime
+from typing import Iterable, List, Optional, Set, Tuple
 
+from ...database.connection_manager import get_connection_manager
+from ...database.migrations import ensure_schema
 from ...config.settings import Settings
-from ..domain.models import Venta, ItemVenta, MetodoPago
+from ...utils.fechas import formatear_fecha, parsear_fecha
+from ...utils.texto import limites_prefijo
+from ..domain.models import Venta, MetodoPago
+from .venta_mapper import cargar_ventas
+
+
+def formatear_numero_factura(numero: int) -> str:
+    """Da formato a un número de factura (FACT-00001)."""
+    return f"FACT-{numero:05d}"
+
+
+def agrupar_rangos(numeros: Iterable[int]) -> List[Tuple[int, int]]:
+    """Agrupa números en rangos consecutivos [(inicio, fin), ...]."""
+    rangos: List[Tuple[int, int]] = []
+    for numero in sorted(set(numeros)):
+        if rangos and rangos[-1][1] == numero - 1:
+            rangos[-1] = (rangos[-1][0], numero)
+        else:
+            rangos.append((numero, numero))
+    return rangos
 
 
 class VentaRepository:
@@ -19,268 +39,338 @@ class VentaRepository:
             db_path: Ruta al archivo de base de datos SQLite
         """
         # Usar Ventas.DB como base de datos por defecto para ventas
-        self.db_path = db_path or "Ventas.DB"
-        self._init_database()
+        self.db_path = db_path or Settings.SALES_DATABASE_PATH
+        ensure_schema(self.db_path, "ventas")
     
-    def _init_database(self):
-        """Inicializa la base de datos y crea las tablas si no existen."""
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-            
-            # Tabla de ventas
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS ventas (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    numero_factura TEXT UNIQUE NOT NULL,
-                    fecha TIMESTAMP NOT NULL,
-                    cliente_id INTEGER,
-                    subtotal REAL NOT NULL,
-                    descuento_total REAL NOT NULL DEFAULT 0,
-                    impuesto_total REAL NOT NULL DEFAULT 0,
-                    total REAL NOT NULL,
-                    metodo_pago TEXT NOT NULL,
-                    observaciones TEXT,
-                    FOREIGN KEY (cliente_id) REFERENCES clientes(id)
-                )
-            """)
-            
-            # Tabla de items de venta
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS items_venta (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    venta_id INTEGER NOT NULL,
-                    codigo_producto TEXT NOT NULL,
-                    nombre_producto TEXT NOT NULL,
-                    cantidad INTEGER NOT NULL,
-                    precio_unitario REAL NOT NULL,
-                    descuento REAL NOT NULL DEFAULT 0,
-                    impuesto REAL NOT NULL DEFAULT 0,
-                    subtotal REAL NOT NULL,
-                    FOREIGN KEY (venta_id) REFERENCES ventas(id) ON DELETE CASCADE
-                )
-            """)
-            
-            # Migración: Agregar columna id_venta si no existe (para bases de datos existentes)
-            try:
-                cursor.execute("SELECT id_venta FROM items_venta LIMIT 1")
-            except sqlite3.OperationalError:
-                # La columna no existe, agregarla
-                cursor.execute("ALTER TABLE items_venta ADD COLUMN id_venta INTEGER")
-                # Copiar valores de venta_id a id_venta para mantener consistencia
-                cursor.execute("UPDATE items_venta SET id_venta = venta_id WHERE id_venta IS NULL")
-                # Crear índice para mejorar rendimiento
-                try:
-                    cursor.execute("""
-                        CREATE INDEX IF NOT EXISTS idx_items_venta_id_venta 
-                        ON items_venta(id_venta)
-                    """)
-                except:
-                    pass  # El índice puede no ser necesario si ya existe
+    def _get_connection(self):
+        """Context manager para obtener conexiones del pool compartido."""
+        return get_connection_manager(self.db_path).connection()
+    
+    def next_invoice_number(self, cursor: sqlite3.Cursor) -> str:
+        """
+        Reserva el siguiente número de factura dentro de la transacción del llamador.
+        
+        Args:
+            cursor: Cursor de una transacción abierta sobre la base de datos de ventas
             
-            # Tabla para configuración de numeración de facturas
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS configuracion_factura (
-                    clave TEXT PRIMARY KEY,
-                    valor TEXT NOT NULL
-                )
-            """)
+        Returns:
+            str: Número de factura generado (se libera si la transacción se revierte)
+        """
+        cursor.execute(
+            "UPDATE configuracion_factura SET valor = CAST(valor AS INTEGER) + 1 "
+            "WHERE clave = 'ultimo_numero'"
+        )
+        if cursor.rowcount == 0:
+            cursor.execute(
+                "INSERT INTO configuracion_factura (clave, valor) VALUES ('ultimo_numero', '1')"
+            )
+        cursor.execute("SELECT valor FROM configuracion_factura WHERE clave = 'ultimo_numero'")
+        nuevo_numero = int(cursor.fetchone()[0])
+        
+        # Formato: FACT-00001
+        return formatear_numero_factura(nuevo_numero)
+    
+    def reservar_bloque_facturas(self, terminal: str, tamaño: int,
+                                 busy_timeout_ms: Optional[int] = None) -> Tuple[int, int, int]:
+        """
+        Reserva un bloque de números de factura consecutivos para una terminal.
+        
+        Avanza ultimo_numero en tamaño posiciones, de modo que los bloques de
+        distintas terminales (y next_invoice_number) nunca se solapan.
+        
+        Args:
+            terminal: Identificador de la terminal o proceso
+            tamaño: Cantidad de números del bloque
+            busy_timeout_ms: Espera máxima por un bloqueo (si None, la del perfil)
             
-            # Inicializar contador de facturas si no existe
-            cursor.execute("SELECT valor FROM configuracion_factura WHERE clave = 'ultimo_numero'")
-            if cursor.fetchone() is None:
+        Returns:
+            Tuple[int, int, int]: (id_bloque, primer número, último número)
+        """
+        with get_connection_manager(self.db_path).transaction(busy_timeout_ms) as cursor:
+            cursor.execute(
+                "UPDATE configuracion_factura SET valor = CAST(valor AS INTEGER) + ? "
+                "WHERE clave = 'ultimo_numero'",
+                (tamaño,)
+            )
+            if cursor.rowcount == 0:
                 cursor.execute(
-                    "INSERT INTO configuracion_factura (clave, valor) VALUES ('ultimo_numero', '0')"
+                    "INSERT INTO configuracion_factura (clave, valor) VALUES ('ultimo_numero', ?)",
+                    (str(tamaño),)
                 )
+            cursor.execute("SELECT valor FROM configuracion_factura WHERE clave = 'ultimo_numero'")
+            fin = int(cursor.fetchone()[0])
+            inicio = fin - tamaño + 1
             
-            conn.commit()
-    
-    @contextmanager
-    def _get_connection(self):
-        """Context manager para obtener conexiones a la base de datos."""
-        conn = sqlite3.connect(self.db_path)
-        try:
-            yield conn
-        finally:
-            conn.close()
+            cursor.execute(
+                """INSERT INTO bloques_factura (terminal, inicio, fin, fecha_reserva)
+                   VALUES (?, ?, ?, ?)""",
+                (terminal, inicio, fin, formatear_fecha(datetime.now()))
+            )
+            return cursor.lastrowid, inicio, fin
     
-    def generar_numero_factura(self) -> str:
+    def get_bloques_factura_abiertos(self, terminal: str) -> List[Tuple[int, int, int]]:
         """
-        Genera el siguiente número de factura incremental.
+        Obtiene los bloques de una terminal que no se cerraron.
         
+        Args:
+            terminal: Identificador de la terminal o proceso
+            
         Returns:
-            str: Número de factura generado
+            Lista de (id_bloque, primer número, último número)
         """
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            
-            # Obtener último número
-            cursor.execute("SELECT valor FROM configuracion_factura WHERE clave = 'ultimo_numero'")
-            row = cursor.fetchone()
-            ultimo_numero = int(row[0]) if row else 0
-            
-            # Incrementar
-            nuevo_numero = ultimo_numero + 1
-            
-            # Actualizar
             cursor.execute(
-                "UPDATE configuracion_factura SET valor = ? WHERE clave = 'ultimo_numero'",
-                (str(nuevo_numero),)
+                """SELECT id, inicio, fin FROM bloques_factura
+                   WHERE terminal = ? AND fecha_cierre IS NULL ORDER BY id""",
+                (terminal,)
             )
-            
-            conn.commit()
-            
-            # Formato: FACT-00001
-            return f"FACT-{nuevo_numero:05d}"
+            return cursor.fetchall()
     
-    def create(self, venta: Venta) -> int:
+    def get_bloques_factura_abiertos_de_equipo(self, equipo: str) -> List[Tuple[int, str, int, int]]:
         """
-        Crea una nueva venta en la base de datos.
+        Obtiene los bloques sin cerrar de todas las instancias de un equipo.
+        
+        Incluye los de la terminal "equipo" y los de las terminales
+        "equipo:<pid>" (una por proceso).
         
         Args:
-            venta: Venta a crear
+            equipo: Identificador del equipo (sin el PID)
             
         Returns:
-            int: ID de la venta creada
+            Lista de (id_bloque, terminal, primer número, último número)
         """
+        inicio, fin = limites_prefijo(f"{equipo}:")
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            
-            # Generar número de factura si no tiene
-            if not venta.numero_factura:
-                venta.numero_factura = self.generar_numero_factura()
-            
-            # Calcular totales
-            venta.calcular_total()
-            
-            # Obtener método de pago
-            metodo_pago_val = (
-                venta.metodo_pago.value 
-                if isinstance(venta.metodo_pago, MetodoPago) 
-                else str(venta.metodo_pago)
+            cursor.execute(
+                """SELECT id, terminal, inicio, fin FROM bloques_factura
+                   WHERE (terminal = ? OR (terminal >= ? AND terminal < ?))
+                     AND fecha_cierre IS NULL ORDER BY id""",
+                (equipo, inicio, fin)
             )
+            return cursor.fetchall()
+    
+    def get_bloque_factura_de(self, numero: int) -> Optional[int]:
+        """
+        Obtiene el bloque al que pertenece un número de factura.
+        
+        Args:
+            numero: Número de factura (sin prefijo)
             
-            # Insertar venta
+        Returns:
+            ID del bloque, o None si el número no se reservó en un bloque
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
             cursor.execute(
-                """INSERT INTO ventas 
-                   (numero_factura, fecha, cliente_id, subtotal, descuento_total, 
-                    impuesto_total, total, metodo_pago, observaciones)
-                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                (venta.numero_factura, venta.fecha, venta.cliente_id,
-                 venta.subtotal, venta.descuento_total, venta.impuesto_total,
-                 venta.total, metodo_pago_val, venta.observaciones)
+                "SELECT id FROM bloques_factura WHERE ? BETWEEN inicio AND fin", (numero,)
             )
-            venta_id = cursor.lastrowid
+            row = cursor.fetchone()
+            return row[0] if row else None
+    
+    def get_numeros_factura_usados(self, inicio: int, fin: int) -> Set[int]:
+        """
+        Obtiene qué números de un rango ya tienen una venta registrada.
+        
+        Args:
+            inicio: Primer número del rango
+            fin: Último número del rango (inclusive)
             
-            # Insertar items con id_venta y venta_id
-            for item in venta.items:
+        Returns:
+            Set[int]: Números usados
+        """
+        usados = set()
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            for desde in range(inicio, fin + 1, 500):
+                lote = [formatear_numero_factura(n) for n in range(desde, min(desde + 500, fin + 1))]
+                marcadores = ", ".join("?" * len(lote))
                 cursor.execute(
-                    """INSERT INTO items_venta 
-                       (venta_id, id_venta, codigo_producto, nombre_producto, cantidad, precio_unitario, 
-                        descuento, impuesto, subtotal)
-                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                    (venta_id, venta_id, item.codigo_producto, item.nombre_producto,
-                     item.cantidad, item.precio_unitario, item.descuento, item.impuesto,
-                     item.calcular_total())
+                    f"SELECT numero_factura FROM ventas WHERE numero_factura IN ({marcadores})",
+                    lote
                 )
-            
-            conn.commit()
-            return venta_id
+                usados.update(int(row[0][len("FACT-"):]) for row in cursor.fetchall())
+        return usados
     
-    def get_by_id(self, venta_id: int) -> Optional[Venta]:
+    def _insertar_huecos(self, cursor: sqlite3.Cursor, bloque_id: int,
+                         numeros: Iterable[int], motivo: str):
+        """Registra números sin usar de un bloque agrupados en rangos."""
+        fecha = formatear_fecha(datetime.now())
+        cursor.executemany(
+            """INSERT INTO huecos_factura (bloque_id, numero_inicio, numero_fin, motivo, fecha)
+               VALUES (?, ?, ?, ?, ?)""",
+            [(bloque_id, inicio, fin, motivo, fecha) for inicio, fin in agrupar_rangos(numeros)]
+        )
+    
+    def registrar_huecos_factura(self, bloque_id: int, numeros: Iterable[int], motivo: str):
         """
-        Obtiene una venta por su ID.
+        Registra números de factura que no se usarán.
         
         Args:
-            venta_id: ID de la venta
-            
+            bloque_id: Bloque al que pertenecen los números
+            numeros: Números sin usar
+            motivo: Motivo para la auditoría
+        """
+        with get_connection_manager(self.db_path).transaction() as cursor:
+            self._insertar_huecos(cursor, bloque_id, numeros, motivo)
+    
+    def cerrar_bloque_facturas(self, bloque_id: int, numeros_sin_usar: Iterable[int], motivo: str,
+                               busy_timeout_ms: Optional[int] = None):
+        """
+        Cierra un bloque registrando como huecos los números que no se usaron.
+        
+        Args:
+            bloque_id: Bloque a cerrar
+            numeros_sin_usar: Números del bloque que no se asignaron a ninguna venta
+            motivo: Motivo de los huecos para la auditoría
+            busy_timeout_ms: Espera máxima por un bloqueo (si None, la del perfil)
+        """
+        with get_connection_manager(self.db_path).transaction(busy_timeout_ms) as cursor:
+            self._insertar_huecos(cursor, bloque_id, numeros_sin_usar, motivo)
+            cursor.execute(
+                "UPDATE bloques_factura SET fecha_cierre = ? WHERE id = ? AND fecha_cierre IS NULL",
+                (formatear_fecha(datetime.now()), bloque_id)
+            )
+    
+    def get_huecos_factura(self) -> List[Tuple[str, str, str, str, datetime]]:
+        """
+        Obtiene los huecos de numeración registrados para auditoría.
+        
         Returns:
-            Venta si existe, None en caso contrario
+            Lista de (primer número, último número, terminal, motivo, fecha)
         """
         with self._get_connection() as conn:
             cursor = conn.cursor()
+            cursor.execute(
+                """SELECT h.numero_inicio, h.numero_fin, b.terminal, h.motivo, h.fecha
+                   FROM huecos_factura h JOIN bloques_factura b ON b.id = h.bloque_id
+                   ORDER BY h.numero_inicio"""
+            )
+            return [
+                (formatear_numero_factura(inicio), formatear_numero_factura(fin),
+                 terminal, motivo, parsear_fecha(fecha))
+                for inicio, fin, terminal, motivo, fecha in cursor.fetchall()
+            ]
+    
+    def generar_numero_factura(self) -> str:
+        """
+        Genera el siguiente número de factura incremental.
+        
+        Returns:
+            str: Número de factura generado
+        """
+        with get_connection_manager(self.db_path).transaction() as cursor:
+            return self.next_invoice_number(cursor)
+    
+    def get_id_por_numero_factura(self, cursor: sqlite3.Cursor, numero_factura: str) -> Optional[int]:
+        """
+        Busca la venta registrada con un número de factura.
+        
+        Args:
+            cursor: Cursor sobre la base de datos de ventas
+            numero_factura: Número de factura (p. ej. FACT-00001)
             
-            # Obtener venta con todos los campos
-            cursor.execute("""
-                SELECT id, numero_factura, fecha, cliente_id, subtotal, descuento_total, 
-                       impuesto_total, total, metodo_pago, observaciones
-                FROM ventas WHERE id = ?
-            """, (venta_id,))
-            venta_row = cursor.fetchone()
-            
-            if not venta_row:
-                return None
-            
-            (venta_id_db, numero_factura, fecha_str, cliente_id, subtotal, 
-             descuento_total, impuesto_total, total, metodo_pago_str, observaciones) = venta_row
-            
-            # Obtener items con descuento e impuesto usando id_venta (con fallback a venta_id)
-            try:
-                cursor.execute("""
-                    SELECT codigo_producto, nombre_producto, cantidad, precio_unitario, descuento, impuesto
-                    FROM items_venta
-                    WHERE id_venta = ?
-                    ORDER BY id
-                """, (venta_id,))
-            except sqlite3.OperationalError:
-                # Si id_venta no existe, usar venta_id
-                cursor.execute("""
-                    SELECT codigo_producto, nombre_producto, cantidad, precio_unitario, descuento, impuesto
-                    FROM items_venta
-                    WHERE venta_id = ?
-                    ORDER BY id
-                """, (venta_id,))
+        Returns:
+            ID de la venta, o None si el número no se ha registrado
+        """
+        cursor.execute("SELECT id FROM ventas WHERE numero_factura = ?", (numero_factura,))
+        row = cursor.fetchone()
+        return row[0] if row else None
+    
+    def insert(self, cursor: sqlite3.Cursor, venta: Venta) -> int:
+        """
+        Inserta una venta y sus items dentro de la transacción del llamador.
+        
+        Args:
+            cursor: Cursor de una transacción abierta sobre la base de datos de ventas
+            venta: Venta a insertar (debe tener número de factura)
             
-            items_data = cursor.fetchall()
-            items = [
-                ItemVenta(
-                    codigo_producto=row[0],
-                    nombre_producto=row[1],
-                    cantidad=row[2],
-                    precio_unitario=row[3],
-                    descuento=row[4] if len(row) > 4 else 0.0,
-                    impuesto=row[5] if len(row) > 5 else 0.0
-                )
-                for row in items_data
+        Returns:
+            int: ID de la venta creada
+        """
+        # Calcular totales
+        venta.calcular_total()
+        
+        # Obtener método de pago
+        metodo_pago_val = (
+            venta.metodo_pago.value 
+            if isinstance(venta.metodo_pago, MetodoPago) 
+            else str(venta.metodo_pago)
+        )
+        
+        # Insertar venta
+        cursor.execute(
+            """INSERT INTO ventas 
+               (numero_factura, fecha, cliente_id, subtotal, descuento_total, 
+                impuesto_total, total, metodo_pago, observaciones)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            (venta.numero_factura, formatear_fecha(venta.fecha), venta.cliente_id,
+             venta.subtotal, venta.descuento_total, venta.impuesto_total,
+             venta.total, metodo_pago_val, venta.observaciones)
+        )
+        venta_id = cursor.lastrowid
+        
+        # Insertar items con id_venta y venta_id
+        cursor.executemany(
+            """INSERT INTO items_venta 
+               (venta_id, id_venta, codigo_producto, nombre_producto, cantidad, precio_unitario, 
+                descuento, impuesto, subtotal)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            [
+                (venta_id, venta_id, item.codigo_producto, item.nombre_producto,
+                 item.cantidad, item.precio_unitario, item.descuento, item.impuesto,
+                 item.calcular_total())
+                for item in venta.items
             ]
+        )
+        
+        return venta_id
+    
+    def create(self, venta: Venta) -> int:
+        """
+        Crea una nueva venta en la base de datos.
+        
+        El número de factura (si hace falta), la venta y sus items se
+        confirman en una sola transacción.
+        
+        Args:
+            venta: Venta a crear
             
-            # Parsear fecha
-            if isinstance(fecha_str, str):
-                fecha = datetime.fromisoformat(fecha_str)
-            else:
-                fecha = datetime.fromtimestamp(fecha_str) if fecha_str else datetime.now()
-            
-            # Parsear método de pago
-            try:
-                metodo_pago = MetodoPago(metodo_pago_str) if metodo_pago_str else MetodoPago.EFECTIVO
-            except (ValueError, AttributeError):
-                metodo_pago = MetodoPago.EFECTIVO
+        Returns:
+            int: ID de la venta creada
+        """
+        numero_original = venta.numero_factura
+        try:
+            with get_connection_manager(self.db_path).transaction() as cursor:
+                # Generar número de factura si no tiene
+                if not venta.numero_factura:
+                    venta.numero_factura = self.next_invoice_number(cursor)
+                return self.insert(cursor, venta)
+        except BaseException:
+            venta.numero_factura = numero_original
+            raise
+    
+    def get_by_id(self, venta_id: int) -> Optional[Venta]:
+        """
+        Obtiene una venta por su ID.
+        
+        Args:
+            venta_id: ID de la venta
             
-            return Venta(
-                id=venta_id_db,
-                numero_factura=numero_factura or "",
-                fecha=fecha,
-                items=items,
-                cliente_id=cliente_id,
-                subtotal=subtotal or 0.0,
-                descuento_total=descuento_total or 0.0,
-                impuesto_total=impuesto_total or 0.0,
-                total=total or 0.0,
-                metodo_pago=metodo_pago,
-                observaciones=observaciones or ""
-            )
+        Returns:
+            Venta si existe, None en caso contrario
+        """
+        with self._get_connection() as conn:
+            ventas = cargar_ventas(conn.cursor(), "WHERE id = ?", (venta_id,))
+            return ventas[0] if ventas else None
     
     def get_all(self) -> List[Venta]:
         """
-        Obtiene todas las ventas.
+        Obtiene todas las ventas con sus items.
         
         Returns:
             Lista de ventas
         """
         with self._get_connection() as conn:
-            cursor = conn.cursor()
-            
-            cursor.execute("SELECT id FROM ventas ORDER BY fecha DESC")
-            venta_ids = [row[0] for row in cursor.fetchall()]
-            
-            return [self.get_by_id(venta_id) for venta_id in venta_ids]
-
+            return cargar_ventas(conn.cursor())
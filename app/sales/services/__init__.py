@@ -1,5 +1,19 @@
 """Servicios del módulo de Ventas."""
+from .aplicador_ventas import AplicadorVentas, es_bloqueo, get_aplicador_ventas
+from .secuencia_facturas import (
+    SecuenciaFacturas,
+    get_secuencia_facturas,
+    liberar_secuencias_facturas
+)
 from .venta_service import VentaService
 
-__all__ = ["VentaService"]
+__all__ = [
+    "AplicadorVentas",
+    "es_bloqueo",
+    "get_aplicador_ventas",
+    "SecuenciaFacturas",
+    "get_secuencia_facturas",
+    "liberar_secuencias_facturas",
+    "VentaService"
+]
 
@@ -0,0 +1,155 @@
+"""Aplicación en segundo plano de las ventas pendientes del diario."""
+import sqlite3
+import threading
+from typing import Callable, Dict, Optional, Tuple
+
+from ...config.settings import Settings
+from ...database.connection_manager import _normalize_path
+from ..domain.models import Venta
+from ..repository.diario_ventas import DiarioVentas
+
+
+def es_bloqueo(error: sqlite3.Error) -> bool:
+    """
+    Indica si un error de SQLite se debe a que otra conexión tiene la base bloqueada.
+    
+    Args:
+        error: Error de SQLite
+    
+    Returns:
+        bool: True si el error es "database is locked" o "database is busy"
+    """
+    mensaje = str(error).lower()
+    return isinstance(error, sqlite3.OperationalError) and ("locked" in mensaje or "busy" in mensaje)
+
+
+class AplicadorVentas:
+    """
+    Hilo que guarda en la base de datos las ventas pendientes del diario.
+    
+    Recorre las pendientes en orden; si la base de datos sigue bloqueada
+    espera Settings.SALES_JOURNAL_RETRY_SECONDS y lo vuelve a intentar. Las
+    ventas que fallan por otro motivo se marcan como rechazadas.
+    """
+    
+    def __init__(self, diario: DiarioVentas, aplicar: Callable[[Venta], int],
+                 intervalo: Optional[float] = None, destino: Tuple[str, ...] = ()):
+        """
+        Inicializa el aplicador.
+        
+        Args:
+            diario: Diario con las ventas pendientes
+            aplicar: Función que guarda una venta de forma idempotente y devuelve su ID
+            intervalo: Segundos entre reintentos (si None, Settings.SALES_JOURNAL_RETRY_SECONDS)
+            destino: Rutas normalizadas de las bases de datos donde aplicar guarda las ventas
+        """
+        self.diario = diario
+        self.aplicar = aplicar
+        self.destino = destino
+        self.intervalo = intervalo or Settings.SALES_JOURNAL_RETRY_SECONDS
+        self._evento = threading.Event()
+        self._detenido = threading.Event()
+        self._lock = threading.Lock()
+        self._hilo: Optional[threading.Thread] = None
+    
+    def despertar(self):
+        """Pide aplicar las pendientes cuanto antes (inicia el hilo si hace falta)."""
+        with self._lock:
+            if self._hilo is None or not self._hilo.is_alive():
+                self._detenido.clear()
+                self._hilo = threading.Thread(
+                    target=self._ejecutar, name="aplicador-ventas", daemon=True
+                )
+                self._hilo.start()
+        self._evento.set()
+    
+    def detener(self, timeout: Optional[float] = None):
+        """
+        Detiene el hilo; las ventas que queden pendientes siguen en el diario.
+        
+        Args:
+            timeout: Segundos máximos de espera
+        """
+        self._detenido.set()
+        self._evento.set()
+        if self._hilo is not None:
+            self._hilo.join(timeout)
+    
+    def aplicar_pendientes(self) -> bool:
+        """
+        Intenta guardar todas las ventas pendientes.
+        
+        Cada venta se reclama en el diario antes de aplicarla; las que otro
+        hilo tiene reclamadas (la caja que la está guardando) se omiten.
+        
+        Returns:
+            bool: True si no quedó ninguna pendiente
+        """
+        for venta in self.diario.pendientes():
+            if self._detenido.is_set():
+                return False
+            if not self.diario.reclamar(venta.numero_factura):
+                continue
+            try:
+                self.aplicar(venta)
+            except sqlite3.Error as e:
+                if es_bloqueo(e):
+                    self.diario.liberar(venta.numero_factura)
+                    return False
+                self.diario.marcar_rechazada(venta.numero_factura, f"Error de base de datos: {e}")
+            except Exception as e:
+                self.diario.marcar_rechazada(venta.numero_factura, str(e))
+            else:
+                self.diario.marcar_aplicada(venta.numero_factura)
+        return self.diario.cantidad_pendientes() == 0
+    
+    def _ejecutar(self):
+        """Bucle del hilo: aplica las pendientes y reintenta mientras la base esté bloqueada."""
+        while not self._detenido.is_set():
+            self._evento.clear()
+            if self.aplicar_pendientes():
+                # Sin pendientes: dormir hasta la próxima venta encolada
+                self._evento.wait()
+            else:
+                self._evento.wait(self.intervalo)
+
+
+_aplicadores: Dict[str, AplicadorVentas] = {}
+_aplicadores_lock = threading.Lock()
+
+
+def get_aplicador_ventas(diario: DiarioVentas, aplicar: Callable[[Venta], int],
+                         ventas_db: str, inventario_db: str) -> AplicadorVentas:
+    """
+    Obtiene el aplicador compartido de un diario.
+    
+    Un solo hilo reproduce cada diario; la función aplicar de la primera
+    llamada es la que se usa. Por eso un diario solo puede usarse con un
+    par de bases de datos: las ventas pendientes no deben guardarse en
+    las bases de otro servicio.
+    
+    Args:
+        diario: Diario con las ventas pendientes
+        aplicar: Función que guarda una venta de forma idempotente y devuelve su ID
+        ventas_db: Base de datos de ventas donde aplicar guarda las ventas
+        inventario_db: Base de datos de inventario donde aplicar descuenta el stock
+    
+    Returns:
+        AplicadorVentas: Aplicador único por diario dentro del proceso
+        
+    Raises:
+        ValueError: Si el diario ya se usa con otras bases de datos
+    """
+    key = _normalize_path(diario.ruta)
+    destino = (_normalize_path(ventas_db), _normalize_path(inventario_db))
+    with _aplicadores_lock:
+        aplicador = _aplicadores.get(key)
+        if aplicador is None:
+            aplicador = AplicadorVentas(diario, aplicar, destino=destino)
+            _aplicadores[key] = aplicador
+        elif aplicador.destino != destino:
+            raise ValueError(
+                f"El diario de ventas '{diario.ruta}' ya se usa con otras bases de datos "
+                f"({aplicador.destino[0]}, {aplicador.destino[1]}); use un diario distinto."
+            )
+        return aplicador
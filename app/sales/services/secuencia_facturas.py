@@ -0,0 +1,280 @@
+"""Secuencia de números de factura reservada por bloques."""
+import atexit
+import heapq
+import os
+import socket
+import sqlite3
+import threading
+import uuid
+from typing import Dict, List, Optional, Tuple
+
+from ...config.settings import Settings
+from ...database.connection_manager import _normalize_path
+from ..repository.diario_ventas import DiarioVentas, get_diario_ventas, ruta_diario_ventas
+from ..repository.venta_repository import VentaRepository, formatear_numero_factura
+
+
+MOTIVO_CIERRE = "Bloque liberado al cerrar la aplicación"
+MOTIVO_INTERRUMPIDO = "Bloque sin cerrar (la aplicación terminó inesperadamente)"
+MOTIVO_VENTA_FALLIDA = "Venta no registrada"
+
+# Prefijo de los números asignados a ventas aceptadas sin poder reservar un bloque
+PREFIJO_PROVISIONAL = "PROV-"
+
+
+def numero_provisional() -> str:
+    """
+    Genera un número provisional para una venta aceptada con la base de datos bloqueada.
+    
+    El número definitivo se asigna al guardar la venta desde el diario.
+    
+    Returns:
+        str: Número provisional único (PROV-1A2B3C4D5E)
+    """
+    return f"{PREFIJO_PROVISIONAL}{uuid.uuid4().hex[:10].upper()}"
+
+
+def es_numero_provisional(numero_factura: Optional[str]) -> bool:
+    """Indica si un número de factura es provisional."""
+    return bool(numero_factura) and numero_factura.startswith(PREFIJO_PROVISIONAL)
+
+
+def _proceso_activo(pid: int) -> bool:
+    """
+    Indica si un proceso de este equipo sigue en ejecución.
+    
+    Ante la duda (sin permisos, PID reutilizado por otro programa) responde
+    True: el bloque queda abierto y se recupera en un inicio posterior, en
+    lugar de cerrar el de una instancia que sigue entregando sus números.
+    """
+    if pid == os.getpid():
+        return True
+    if os.name == "nt":
+        import ctypes
+        kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+        handle = kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            return ctypes.get_last_error() == 5  # ERROR_ACCESS_DENIED: existe
+        try:
+            codigo = ctypes.c_ulong()
+            if not kernel32.GetExitCodeProcess(handle, ctypes.byref(codigo)):
+                return True
+            return codigo.value == 259  # STILL_ACTIVE
+        finally:
+            kernel32.CloseHandle(handle)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True
+    return True
+
+
+class SecuenciaFacturas:
+    """
+    Entrega números de factura desde memoria reservando bloques en la base de datos.
+    
+    Cada terminal reserva bloques de Settings.INVOICE_BLOCK_SIZE números con
+    una transacción corta; los números de un bloque se entregan sin tocar la
+    base de datos. Los números que quedan sin usar (al cerrar la aplicación,
+    tras un cierre inesperado o porque la venta falló) se registran en
+    huecos_factura para que la numeración siga siendo auditable.
+    
+    La terminal por defecto es "<equipo>:<pid>", única por proceso, de modo
+    que dos instancias en el mismo equipo nunca comparten un bloque. Un
+    bloque abierto de otra instancia del equipo solo se da por interrumpido
+    si su proceso ya no está en ejecución. Los números de ese bloque que
+    siguen pendientes en el diario de ventas no se registran como huecos:
+    el aplicador todavía guardará esas ventas.
+    """
+    
+    def __init__(self, repository: VentaRepository, terminal: Optional[str] = None,
+                 tamaño_bloque: Optional[int] = None, diario: Optional[DiarioVentas] = None):
+        """
+        Inicializa la secuencia.
+        
+        Args:
+            repository: Repositorio de ventas
+            terminal: Identificador fijo de la terminal, que debe ser único por
+                instancia en ejecución (si None, Settings.INVOICE_TERMINAL_ID o el
+                nombre del equipo, seguido de ":" y el PID del proceso)
+            tamaño_bloque: Números reservados por bloque (si None, Settings.INVOICE_BLOCK_SIZE)
+            diario: Diario de ventas de la misma base de datos (si None, el
+                compartido junto a ella)
+        """
+        self.repository = repository
+        self.diario = diario or get_diario_ventas(ruta_diario_ventas(repository.db_path))
+        if terminal:
+            self.equipo = None
+            self.terminal = terminal
+        else:
+            self.equipo = Settings.INVOICE_TERMINAL_ID or socket.gethostname()
+            self.terminal = f"{self.equipo}:{os.getpid()}"
+        self.tamaño_bloque = tamaño_bloque or Settings.INVOICE_BLOCK_SIZE
+        
+        self._lock = threading.Lock()
+        self._bloque_id: Optional[int] = None
+        self._siguiente = 0
+        self._fin = -1
+        self._devueltos: List[int] = []  # Heap de números devueltos del bloque actual
+        self._recuperado = False
+    
+    def _bloques_interrumpidos(self) -> List[Tuple[int, int, int]]:
+        """Bloques abiertos cuyo proceso dueño ya terminó: (id, inicio, fin)."""
+        if self.equipo is None:
+            return self.repository.get_bloques_factura_abiertos(self.terminal)
+        
+        interrumpidos = []
+        for bloque_id, terminal, inicio, fin in (
+            self.repository.get_bloques_factura_abiertos_de_equipo(self.equipo)
+        ):
+            _, separador, pid = terminal.rpartition(":")
+            # Sin PID: bloque de una versión anterior que usaba solo el nombre del equipo
+            if separador and pid.isdigit() and _proceso_activo(int(pid)):
+                continue
+            interrumpidos.append((bloque_id, inicio, fin))
+        return interrumpidos
+    
+    def _recuperar_bloques_abiertos(self, busy_timeout_ms: Optional[int] = None):
+        """Cierra los bloques que dejaron abiertos instancias de este equipo que ya terminaron."""
+        bloques = self._bloques_interrumpidos()
+        if not bloques:
+            self._recuperado = True
+            return
+        # Ventas aceptadas que el aplicador aún guardará con su número
+        en_diario = {
+            int(numero[len("FACT-"):]) for numero in self.diario.numeros_pendientes()
+            if numero.startswith("FACT-") and numero[len("FACT-"):].isdigit()
+        }
+        for bloque_id, inicio, fin in bloques:
+            usados = self.repository.get_numeros_factura_usados(inicio, fin) | en_diario
+            sin_usar = [n for n in range(inicio, fin + 1) if n not in usados]
+            self.repository.cerrar_bloque_facturas(
+                bloque_id, sin_usar, MOTIVO_INTERRUMPIDO, busy_timeout_ms
+            )
+        self._recuperado = True
+    
+    def siguiente(self, busy_timeout_ms: Optional[int] = None) -> str:
+        """
+        Entrega el siguiente número de factura.
+        
+        Args:
+            busy_timeout_ms: Espera máxima por un bloqueo si hay que reservar un
+                bloque nuevo, incluida la espera a otro hilo que lo esté
+                reservando (si None, la del perfil)
+        
+        Returns:
+            str: Número de factura (FACT-00001)
+            
+        Raises:
+            sqlite3.OperationalError: Si la base de datos sigue bloqueada al
+                agotarse la espera ("database is locked")
+        """
+        espera = -1 if busy_timeout_ms is None else busy_timeout_ms / 1000
+        if not self._lock.acquire(timeout=espera):
+            raise sqlite3.OperationalError("database is locked")
+        try:
+            if self._devueltos:
+                return formatear_numero_factura(heapq.heappop(self._devueltos))
+            
+            if self._siguiente > self._fin:
+                if not self._recuperado:
+                    self._recuperar_bloques_abiertos(busy_timeout_ms)
+                if self._bloque_id is not None:
+                    # Bloque agotado: todos sus números se entregaron
+                    self.repository.cerrar_bloque_facturas(
+                        self._bloque_id, [], MOTIVO_CIERRE, busy_timeout_ms
+                    )
+                    self._bloque_id = None
+                self._bloque_id, self._siguiente, self._fin = (
+                    self.repository.reservar_bloque_facturas(
+                        self.terminal, self.tamaño_bloque, busy_timeout_ms
+                    )
+                )
+            
+            numero = self._siguiente
+            self._siguiente += 1
+            return formatear_numero_factura(numero)
+        finally:
+            self._lock.release()
+    
+    def devolver(self, numero_factura: str):
+        """
+        Devuelve un número que no llegó a usarse porque la venta falló.
+        
+        Si pertenece al bloque actual se vuelve a entregar; si no, se registra
+        como hueco.
+        
+        Args:
+            numero_factura: Número entregado por siguiente()
+        """
+        numero = int(numero_factura[len("FACT-"):])
+        with self._lock:
+            if self._bloque_id is not None and numero < self._siguiente and numero <= self._fin:
+                heapq.heappush(self._devueltos, numero)
+                return
+        # El bloque ya se cerró: el número queda como hueco
+        bloque_id = self.repository.get_bloque_factura_de(numero)
+        if bloque_id is not None:
+            self.repository.registrar_huecos_factura(bloque_id, [numero], MOTIVO_VENTA_FALLIDA)
+    
+    def liberar(self, motivo: str = MOTIVO_CIERRE):
+        """
+        Cierra el bloque actual registrando como huecos los números no entregados.
+        
+        Args:
+            motivo: Motivo de los huecos para la auditoría
+        """
+        with self._lock:
+            if self._bloque_id is None:
+                return
+            sin_usar = self._devueltos + list(range(self._siguiente, self._fin + 1))
+            self.repository.cerrar_bloque_facturas(self._bloque_id, sin_usar, motivo)
+            self._bloque_id = None
+            self._siguiente, self._fin = 0, -1
+            self._devueltos = []
+
+
+_secuencias: Dict[str, SecuenciaFacturas] = {}
+_secuencias_lock = threading.Lock()
+
+
+def get_secuencia_facturas(repository: VentaRepository,
+                           diario: Optional[DiarioVentas] = None) -> SecuenciaFacturas:
+    """
+    Obtiene la secuencia compartida para la base de datos de ventas del repositorio.
+    
+    Todas las instancias de VentaService del proceso usan la misma secuencia,
+    de modo que solo hay un bloque abierto por terminal.
+    
+    Args:
+        repository: Repositorio de ventas
+        diario: Diario de ventas de esa base (solo se usa al crear la secuencia)
+    
+    Returns:
+        SecuenciaFacturas: Secuencia única por archivo dentro del proceso
+    """
+    key = _normalize_path(repository.db_path)
+    with _secuencias_lock:
+        secuencia = _secuencias.get(key)
+        if secuencia is None:
+            secuencia = SecuenciaFacturas(repository, diario=diario)
+            _secuencias[key] = secuencia
+        return secuencia
+
+
+def liberar_secuencias_facturas():
+    """Cierra los bloques abiertos de todas las secuencias del proceso."""
+    with _secuencias_lock:
+        secuencias = list(_secuencias.values())
+        _secuencias.clear()
+    for secuencia in secuencias:
+        try:
+            secuencia.liberar()
+        except sqlite3.Error:
+            # El bloque queda abierto y se recupera en el próximo inicio
+            pass
+
+
+atexit.register(liberar_secuencias_facturas)
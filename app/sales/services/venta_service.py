@@ -1,13 +1,24 @@
 """Servicio de lógica de negocio para ventas."""
 import sqlite3
-from typing import List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 
 from ...config.settings import Settings
+from ...database.connection_manager import get_connection_manager
 from ...domain.models import Producto
+from ...repository.catalogo_productos import get_catalogo_productos
 from ...repository.product_repository import ProductRepository
 from ...services.inventory_service import InventoryService
 from ..domain.models import Venta, ItemVenta
+from ..repository.diario_ventas import DiarioVentas, get_diario_ventas, ruta_diario_ventas
 from ..repository.venta_repository import VentaRepository
+from .aplicador_ventas import es_bloqueo, get_aplicador_ventas
+from .secuencia_facturas import (
+    SecuenciaFacturas, es_numero_provisional, get_secuencia_facturas, numero_provisional
+)
+
+
+# Alias con el que se adjunta la base de datos de inventario a la de ventas
+INVENTARIO_SCHEMA = "inventario"
 
 
 class VentaService:
@@ -15,23 +26,58 @@ class VentaService:
     
     def __init__(self, 
                  venta_repository: Optional[VentaRepository] = None,
-                 inventory_service: Optional[InventoryService] = None):
+                 inventory_service: Optional[InventoryService] = None,
+                 secuencia_facturas: Optional[SecuenciaFacturas] = None,
+                 diario: Optional[DiarioVentas] = None):
         """
         Inicializa el servicio.
         
         Args:
             venta_repository: Repositorio de ventas (si None, se crea uno nuevo)
             inventory_service: Servicio de inventario (si None, se crea uno nuevo)
+            secuencia_facturas: Numeración de facturas (si None, la compartida del proceso)
+            diario: Diario local de ventas (si None, el compartido del proceso
+                junto a la base de datos de ventas); cada diario se usa con un
+                solo par de bases de datos
+        
+        Raises:
+            ValueError: Si el diario ya se usa con otras bases de datos
         """
         self.venta_repository = venta_repository or VentaRepository()
         self.inventory_service = inventory_service or InventoryService()
         self.product_repository = self.inventory_service.repository
+        self.catalogo = get_catalogo_productos(self.product_repository)
+        self.diario = diario or get_diario_ventas(
+            ruta_diario_ventas(self.venta_repository.db_path)
+        )
+        self.secuencia_facturas = (
+            secuencia_facturas or get_secuencia_facturas(self.venta_repository, self.diario)
+        )
+        self.aplicador = get_aplicador_ventas(
+            self.diario, self._reproducir_venta,
+            self.venta_repository.db_path, self.product_repository.db_path
+        )
+        
+        # Ventas que quedaron pendientes en una ejecución anterior
+        if self.diario.cantidad_pendientes():
+            self.aplicador.despertar()
     
     def registrar_venta(self, venta: Venta) -> Tuple[bool, str, Optional[int]]:
         """
         Registra una venta y actualiza automáticamente el inventario.
         
-        Este método usa transacciones para garantizar integridad de datos.
+        La venta se escribe primero en el diario local y luego se intenta
+        guardar (stock, venta e items en una sola transacción) esperando como
+        máximo Settings.SALES_JOURNAL_LOCK_TIMEOUT_MS por un bloqueo. Si la
+        base de datos está bloqueada, la venta queda aceptada en el diario y
+        se guarda en segundo plano; en ese caso el ID devuelto es None. Si la
+        venta es inválida no se guarda nada y el número de factura asignado se
+        devuelve a la secuencia.
+        
+        Reservar un bloque de números de factura también espera como máximo
+        Settings.SALES_JOURNAL_LOCK_TIMEOUT_MS; si la base sigue bloqueada, la
+        venta se acepta con un número provisional (ver numero_provisional) y
+        recibe el definitivo al guardarse desde el diario.
         
         Args:
             venta: Venta a registrar
@@ -44,69 +90,189 @@ class VentaService:
         if not es_valido:
             return False, mensaje_error, None
         
-        # Verificar stock disponible para cada item
-        for item in venta.items:
-            producto = self.product_repository.get_by_code(item.codigo_producto)
-            if not producto:
-                return False, f"El producto '{item.codigo_producto}' no existe en el inventario.", None
-            
-            if producto.cantidad < item.cantidad:
-                return False, (
-                    f"Stock insuficiente para '{producto.nombre}'. "
-                    f"Disponible: {producto.cantidad}, Solicitado: {item.cantidad}."
-                ), None
-        
-        # Generar número de factura si no tiene
-        if not venta.numero_factura:
-            venta.numero_factura = self.venta_repository.generar_numero_factura()
-        
-        # Los totales ya deben estar calculados con descuentos e impuestos
-        # Si no están actualizados, calcular básicos (pero los de la UI tienen prioridad)
-        if venta.descuento_total == 0.0 and venta.impuesto_total == 0.0:
-            venta.calcular_total()
+        # Totales en centavos desde los items y los ajustes de la venta (aplicar_ajustes)
+        venta.calcular_total()
         
-        # Realizar venta usando el repositorio (que guarda en Ventas.DB)
-        # y actualizar stock en inventario.db
+        numero_original = venta.numero_factura
+        observaciones_originales = venta.observaciones
         try:
-            # Guardar venta en Ventas.DB usando el repositorio
-            venta_id = self.venta_repository.create(venta)
-            venta.id = venta_id
-            
-            # Actualizar stock en inventario.db (base de datos separada)
-            conn_inventario = sqlite3.connect(Settings.DATABASE_PATH)
-            try:
-                cursor = conn_inventario.cursor()
-                
-                # Actualizar stock para cada item
-                for item in venta.items:
-                    cursor.execute("""
-                        UPDATE productos 
-                        SET cantidad = cantidad - ?
-                        WHERE codigo = ?
-                    """, (item.cantidad, item.codigo_producto))
-                    
-                    # Verificar que no quede stock negativo
-                    cursor.execute("SELECT cantidad FROM productos WHERE codigo = ?", 
-                                 (item.codigo_producto,))
-                    nueva_cantidad = cursor.fetchone()[0]
-                    if nueva_cantidad < 0:
-                        raise ValueError(f"Stock negativo detectado para {item.codigo_producto}")
-                
-                conn_inventario.commit()
-                return True, "Venta registrada exitosamente.", venta_id
-                
-            except Exception as e:
-                conn_inventario.rollback()
-                # Si falla la actualización de stock, intentar eliminar la venta
-                # (aunque esto requeriría un método delete en el repositorio)
-                return False, f"Error al actualizar stock: {str(e)}", None
-            finally:
-                conn_inventario.close()
-                
+            # Número de factura desde el bloque reservado en memoria (fuera de la
+            # transacción: reservar un bloque nuevo usa su propia transacción)
+            if not venta.numero_factura:
+                try:
+                    venta.numero_factura = self.secuencia_facturas.siguiente(
+                        Settings.SALES_JOURNAL_LOCK_TIMEOUT_MS
+                    )
+                except sqlite3.Error as e:
+                    if not es_bloqueo(e):
+                        raise
+                    venta.numero_factura = numero_provisional()
+                    # Queda en la venta guardada para relacionarla con el comprobante impreso
+                    nota = f"Número provisional: {venta.numero_factura}"
+                    venta.observaciones = (
+                        f"{venta.observaciones}\n{nota}" if venta.observaciones else nota
+                    )
+            self.diario.registrar(venta)
         except sqlite3.Error as e:
+            self._descartar_numero_factura(venta, numero_original)
+            venta.observaciones = observaciones_originales
             return False, f"Error de base de datos: {str(e)}", None
         except Exception as e:
+            self._descartar_numero_factura(venta, numero_original)
+            venta.observaciones = observaciones_originales
             return False, f"Error al registrar la venta: {str(e)}", None
+        
+        # La venta queda reclamada en el diario: el aplicador no la reproduce
+        # mientras esta llamada la guarda; liberar se la entrega
+        if es_numero_provisional(venta.numero_factura):
+            # Sin bloque de números la base está bloqueada: guardar en segundo plano
+            self.diario.liberar(venta.numero_factura)
+            self.aplicador.despertar()
+            return True, (
+                "Venta registrada con número provisional. La base de datos está "
+                "ocupada; se guardará con su número de factura definitivo en unos segundos."
+            ), None
+        
+        try:
+            venta.id = self._aplicar_venta(venta, Settings.SALES_JOURNAL_LOCK_TIMEOUT_MS)
+        except ValueError as e:
+            # Producto inexistente o stock insuficiente: no se guardó nada
+            mensaje_error = str(e)
+        except sqlite3.Error as e:
+            if es_bloqueo(e):
+                # La venta ya está en el diario: se guardará en cuanto se libere la base
+                self.diario.liberar(venta.numero_factura)
+                self.aplicador.despertar()
+                return True, (
+                    "Venta registrada. La base de datos está ocupada; "
+                    "se guardará automáticamente en unos segundos."
+                ), None
+            mensaje_error = f"Error de base de datos: {str(e)}"
+        except Exception as e:
+            mensaje_error = f"Error al registrar la venta: {str(e)}"
+        else:
+            self.diario.marcar_aplicada(venta.numero_factura)
+            return True, "Venta registrada exitosamente.", venta.id
+        
+        try:
+            self.diario.marcar_descartada(venta.numero_factura)
+        except OSError:
+            # Sin la marca la venta sigue en el diario (reclamada, así que este
+            # proceso no la reproduce) y su número no se devuelve
+            pass
+        self._descartar_numero_factura(venta, numero_original)
+        return False, mensaje_error, None
+    
+    def _reproducir_venta(self, venta: Venta) -> int:
+        """
+        Guarda una venta pendiente del diario (la usa el aplicador en segundo plano).
+        
+        La venta ya se confirmó al cajero, así que no se rechaza por falta
+        de stock: el stock puede quedar negativo y los faltantes se anotan en
+        las observaciones de la venta. Si tiene número provisional, primero
+        recibe el definitivo y se registra en el diario.
+        
+        Args:
+            venta: Venta pendiente
+            
+        Returns:
+            int: ID de la venta
+            
+        Raises:
+            sqlite3.Error: Si la base de datos falla o sigue bloqueada
+        """
+        if es_numero_provisional(venta.numero_factura):
+            definitivo = self.secuencia_facturas.siguiente()
+            self.diario.asignar_numero(venta.numero_factura, definitivo)
+            venta.numero_factura = definitivo
+        return self._aplicar_venta(venta, permitir_faltante=True)
+    
+    def _aplicar_venta(self, venta: Venta, busy_timeout_ms: Optional[int] = None,
+                       permitir_faltante: bool = False) -> int:
+        """
+        Guarda una venta y descuenta el stock en una sola transacción.
+        
+        Es idempotente por número de factura: si la venta ya se guardó (por
+        ejemplo, al reproducir el diario) no se vuelve a descontar el stock.
+        
+        Args:
+            venta: Venta con número de factura asignado
+            busy_timeout_ms: Espera máxima por un bloqueo (si None, la del perfil)
+            permitir_faltante: Si True, guardar aunque falte stock (ver
+                ProductRepository.decrement_stock) y anotar los faltantes
+            
+        Returns:
+            int: ID de la venta
+            
+        Raises:
+            ValueError: Si un producto no existe o no tiene stock suficiente
+                (solo sin permitir_faltante)
+            sqlite3.Error: Si la base de datos falla o sigue bloqueada
+        """
+        # Una sola transacción sobre Ventas.DB con inventario.db adjunta:
+        # stock, venta e items se confirman en un solo COMMIT
+        manager = get_connection_manager(self.venta_repository.db_path)
+        manager.attach(INVENTARIO_SCHEMA, self.product_repository.db_path)
+        
+        with manager.transaction(busy_timeout_ms) as cursor:
+            venta_id = self.venta_repository.get_id_por_numero_factura(cursor, venta.numero_factura)
+            if venta_id is not None:
+                return venta_id
+            antes = self.product_repository.obtener_revision(cursor, INVENTARIO_SCHEMA)
+            faltantes = self.product_repository.decrement_stock(
+                cursor,
+                [(item.codigo_producto, item.cantidad) for item in venta.items],
+                schema=INVENTARIO_SCHEMA,
+                permitir_faltante=permitir_faltante
+            )
+            if faltantes:
+                nota = "Guardada con faltantes de stock:\n" + "\n".join(faltantes)
+                venta.observaciones = (
+                    f"{venta.observaciones}\n{nota}" if venta.observaciones else nota
+                )
+            despues = self.product_repository.obtener_revision(cursor, INVENTARIO_SCHEMA)
+            venta_id = self.venta_repository.insert(cursor, venta)
+        
+        self.product_repository.notificar_cambios(
+            (item.codigo_producto for item in venta.items), (antes, despues)
+        )
+        return venta_id
+    
+    def ventas_pendientes(self) -> int:
+        """
+        Obtiene cuántas ventas aceptadas aún no se han guardado en la base de datos.
+        
+        Returns:
+            int: Ventas pendientes en el diario
+        """
+        return self.diario.cantidad_pendientes()
+    
+    def ventas_rechazadas(self) -> int:
+        """
+        Obtiene cuántas ventas del diario no se pudieron guardar y esperan revisión.
+        
+        Returns:
+            int: Ventas copiadas a DiarioVentas.ruta_rechazadas
+        """
+        return self.diario.cantidad_rechazadas()
+    
+    def _descartar_numero_factura(self, venta: Venta, numero_original: Optional[str]):
+        """
+        Devuelve a la secuencia el número asignado a una venta que no se guardó.
+        
+        Si la venta sigue en el diario (no se pudo marcar como descartada) el
+        número no se devuelve: podría guardarse al reproducir el diario y la
+        siguiente venta con ese número se daría por ya registrada.
+        """
+        if (venta.numero_factura and venta.numero_factura != numero_original
+                and not es_numero_provisional(venta.numero_factura)
+                and not self.diario.contiene(venta.numero_factura)):
+            try:
+                self.secuencia_facturas.devolver(venta.numero_factura)
+            except sqlite3.Error:
+                # No se pudo registrar el hueco; el número no se reutiliza
+                pass
+        venta.numero_factura = numero_original
     
     def obtener_todas_las_ventas(self) -> List[Venta]:
         """
@@ -131,13 +297,12 @@ class VentaService:
     
     def obtener_productos_disponibles(self) -> List[Producto]:
         """
-        Obtiene todos los productos disponibles (con stock > 0).
+        Obtiene todos los productos disponibles (con stock > 0) desde el catálogo en memoria.
         
         Returns:
             Lista de productos disponibles
         """
-        todos_productos = self.inventory_service.obtener_todos_los_productos()
-        return [p for p in todos_productos if p.cantidad > 0]
+        return self.catalogo.disponibles()
     
     def buscar_producto_por_codigo(self, codigo: str) -> Optional[Producto]:
         """
@@ -149,17 +314,53 @@ class VentaService:
         Returns:
             Producto si existe, None en caso contrario
         """
-        return self.product_repository.get_by_code(codigo)
+        return self.catalogo.obtener(codigo)
     
-    def buscar_productos_por_nombre(self, nombre: str) -> List[Producto]:
+    def buscar_productos_por_codigos(self, codigos: List[str]) -> Dict[str, Producto]:
         """
-        Busca productos por nombre.
+        Busca varios productos por código (p. ej. una ráfaga de lecturas del escáner).
         
         Args:
-            nombre: Texto a buscar en el nombre del producto
+            codigos: Códigos de los productos
             
         Returns:
-            Lista de productos que coinciden con el nombre
+            Diccionario código -> producto con los códigos que existen
         """
-        return self.product_repository.buscar_por_nombre(nombre)
-
+        return self.catalogo.obtener_varios(codigos)
+    
+    def buscar_productos_por_nombre(self, nombre: str,
+                                    cancelado: Optional[Callable[[], bool]] = None) -> List[Producto]:
+        """
+        Busca productos por código, nombre o categoría (índice de texto completo).
+        
+        Args:
+            nombre: Texto a buscar; cada palabra se busca como prefijo
+            cancelado: Función que devuelve True si el resultado ya no hace
+                falta (interrumpe la consulta en curso)
+            
+        Returns:
+            Lista de productos más relevantes (hasta Settings.PRODUCT_SEARCH_LIMIT)
+        """
+        return self.product_repository.buscar_por_nombre(
+            nombre, limite=Settings.PRODUCT_SEARCH_LIMIT, cancelado=cancelado
+        )
+    
+    def autocompletar_productos(self, texto: str,
+                                cancelado: Optional[Callable[[], bool]] = None) -> List[Producto]:
+        """
+        Sugiere productos mientras se escribe, desde el catálogo en memoria.
+        
+        Tolera fragmentos y errores de tipeo y no consulta SQLite salvo que
+        el catálogo tenga que recargarse.
+        
+        Args:
+            texto: Texto escrito por el usuario
+            cancelado: Función que devuelve True si el resultado ya no hace
+                falta (se consulta antes de buscar)
+            
+        Returns:
+            Lista de productos más relevantes (hasta Settings.PRODUCT_SEARCH_LIMIT)
+        """
+        if cancelado is not None and cancelado():
+            return []
+        return self.catalogo.buscar(texto, Settings.PRODUCT_SEARCH_LIMIT)
@@ -1,18 +1,33 @@
 """Vista de la interfaz gráfica del módulo de Ventas."""
+import queue
 import tkinter as tk
+from collections import deque
 from tkinter import ttk, messagebox
 from typing import Dict, Optional, List
 
 from ..config.settings import Settings, COLORS
 from ..ui.styles import StyleManager
 from ..utils.validators import parse_numeric_field
+from .domain.dinero import a_centavos, formatear_dinero
+from .busqueda_productos import BuscadorProductos
 from .domain.models import Venta, ItemVenta
+from .pdf_queue import EstadoTrabajoPDF, TrabajoPDF, get_cola_facturas
+from .receipt_queue import EstadoTrabajoRecibo, TrabajoRecibo, get_cola_recibos
 from .services.venta_service import VentaService
 
 
 class SalesGUI:
     """Interfaz gráfica del módulo de gestión de ventas."""
     
+    # Cada cuánto se revisan las facturas PDF terminadas en segundo plano
+    INTERVALO_REVISION_FACTURAS_MS = 200
+    
+    # Cada cuánto se revisa si terminó la búsqueda automática por nombre
+    INTERVALO_REVISION_BUSQUEDA_MS = 30
+    
+    # Comprobantes que se pueden emitir por venta (texto mostrado -> modo)
+    COMPROBANTES = {"PDF": "pdf", "Recibo": "recibo", "Recibo y PDF": "ambos"}
+    
     def __init__(self, parent_window, service: Optional[VentaService] = None):
         """
         Inicializa la interfaz gráfica.
@@ -52,6 +67,40 @@ class SalesGUI:
         # Referencia al módulo de inventario (para notificaciones)
         self.inventory_gui_ref = None
         
+        # Facturas PDF generadas en segundo plano; los hilos de la cola dejan
+        # los trabajos terminados aquí y la interfaz los revisa con after()
+        self.cola_facturas = get_cola_facturas()
+        self.facturas_terminadas: "queue.Queue[TrabajoPDF]" = queue.Queue()
+        
+        # Resultado de la última venta y de su factura; se muestran en el
+        # panel (sin diálogos modales) para no interrumpir la venta siguiente
+        self.estado_venta_label = None
+        self.estado_factura_label = None
+        self.estado_recibo_label = None
+        self.btn_abrir_factura = None
+        self.ruta_ultima_factura: Optional[str] = None
+        
+        # Recibos térmicos: se imprimen en el hilo de la cola (una impresora
+        # apagada no debe congelar la caja) y el resultado se revisa con after()
+        self.cola_recibos = get_cola_recibos()
+        self.recibos_terminados: "queue.Queue[TrabajoRecibo]" = queue.Queue()
+        modo_por_defecto = next(
+            (texto for texto, modo in self.COMPROBANTES.items() if modo == Settings.SALE_DOCUMENT_MODE),
+            "PDF"
+        )
+        self.comprobante_var = tk.StringVar(value=modo_por_defecto)
+        
+        # Modo escáner: Enter solo encola el código leído; la cola se procesa
+        # en lote con after_idle, sin diálogos ni consultas por lectura
+        self.modo_escaner_var = tk.BooleanVar(value=Settings.SCANNER_MODE)
+        self.codigos_escaneados: "deque[str]" = deque()
+        self.escaneo_programado = False
+        
+        # Búsqueda mientras se escribe: se ejecuta en un hilo, solo la última
+        # tecla lanza la consulta y la interfaz recoge el resultado con after()
+        self.buscador = BuscadorProductos(self.service.autocompletar_productos)
+        self.revision_busqueda_programada = False
+        
         # Configurar ventana (solo si no es Frame)
         if not is_frame:
             self.window.title("[ Sistema de Gestión de Ventas ]")
@@ -87,6 +136,9 @@ class SalesGUI:
         
         # Cargar productos disponibles
         self.load_available_products()
+        
+        # Revisar periódicamente las facturas terminadas
+        self.window.after(self.INTERVALO_REVISION_FACTURAS_MS, self.revisar_facturas)
     
     def create_widgets_with_scroll(self):
         """Crear widgets con scrollbar para contenido grande."""
@@ -352,7 +404,7 @@ class SalesGUI:
             width=15
         )
         self.codigo_entry.pack(side=tk.LEFT, padx=(0, 10))
-        self.codigo_entry.bind("<Return>", lambda e: self.buscar_producto())
+        self.codigo_entry.bind("<Return>", lambda e: self.on_codigo_ingresado())
         
         btn_buscar = ttk.Button(
             search_row,
@@ -362,6 +414,29 @@ class SalesGUI:
         )
         btn_buscar.pack(side=tk.LEFT, padx=(0, 20))
         
+        tk.Checkbutton(
+            search_row,
+            text="Modo escáner",
+            variable=self.modo_escaner_var,
+            command=lambda: self.codigo_entry.focus(),
+            font=(Settings.FONT_PRIMARY, Settings.FONT_SIZE_SMALL),
+            fg=c["text_primary"],
+            bg=c["bg_dark"],
+            activebackground=c["bg_dark"],
+            activeforeground=c["text_primary"],
+            selectcolor=c["bg_darkest"]
+        ).pack(side=tk.LEFT, padx=(0, 10))
+        
+        # Resultado de las últimas lecturas del escáner
+        self.escaner_label = tk.Label(
+            search_row,
+            text="",
+            font=(Settings.FONT_PRIMARY, Settings.FONT_SIZE_SMALL),
+            fg=c["text_secondary"],
+            bg=c["bg_dark"]
+        )
+        self.escaner_label.pack(side=tk.LEFT)
+        
         # Búsqueda por nombre (nueva fila)
         search_name_row = tk.Frame(parent, bg=c["bg_dark"])
         search_name_row.pack(fill=tk.X, pady=(10, 10))
@@ -753,6 +828,27 @@ class SalesGUI:
         )
         self.total_label.pack(fill=tk.X)
         
+        # Comprobante a emitir
+        comprobante_row = tk.Frame(floating_inner, bg=c["bg_dark"])
+        comprobante_row.pack(fill=tk.X, pady=(0, 10))
+        
+        tk.Label(
+            comprobante_row,
+            text="Comprobante:",
+            font=(Settings.FONT_PRIMARY, Settings.FONT_SIZE_SMALL),
+            fg=c["text_secondary"],
+            bg=c["bg_dark"]
+        ).pack(side=tk.LEFT, padx=(0, 5))
+        
+        ttk.Combobox(
+            comprobante_row,
+            textvariable=self.comprobante_var,
+            values=list(self.COMPROBANTES),
+            state="readonly",
+            font=(Settings.FONT_PRIMARY, Settings.FONT_SIZE_SMALL),
+            width=14
+        ).pack(side=tk.LEFT, fill=tk.X, expand=True)
+        
         # Botón principal de Registrar Venta (flotante, grande)
         btn_registrar = ttk.Button(
             floating_inner,
@@ -770,6 +866,64 @@ class SalesGUI:
             style="Secondary.TButton"
         )
         btn_limpiar.pack(fill=tk.X, ipady=8)
+        
+        # Ventas aceptadas que aún no están en la base de datos (diario local)
+        self.diario_label = tk.Label(
+            floating_inner,
+            text="",
+            font=(Settings.FONT_PRIMARY, Settings.FONT_SIZE_SMALL, "bold"),
+            fg=c["red_bright"],
+            bg=c["bg_dark"],
+            justify=tk.LEFT,
+            wraplength=260
+        )
+        self.diario_label.pack(fill=tk.X, pady=(10, 0))
+        
+        # Resultado de la última venta y de su factura PDF
+        self.estado_venta_label = tk.Label(
+            floating_inner,
+            text="",
+            font=(Settings.FONT_PRIMARY, Settings.FONT_SIZE_SMALL),
+            fg=c["success"],
+            bg=c["bg_dark"],
+            justify=tk.LEFT,
+            anchor="w",
+            wraplength=260
+        )
+        self.estado_venta_label.pack(fill=tk.X, pady=(10, 0))
+        
+        self.estado_factura_label = tk.Label(
+            floating_inner,
+            text="",
+            font=(Settings.FONT_PRIMARY, Settings.FONT_SIZE_SMALL),
+            fg=c["text_secondary"],
+            bg=c["bg_dark"],
+            justify=tk.LEFT,
+            anchor="w",
+            wraplength=260
+        )
+        self.estado_factura_label.pack(fill=tk.X, pady=(5, 0))
+        
+        self.estado_recibo_label = tk.Label(
+            floating_inner,
+            text="",
+            font=(Settings.FONT_PRIMARY, Settings.FONT_SIZE_SMALL),
+            fg=c["text_secondary"],
+            bg=c["bg_dark"],
+            justify=tk.LEFT,
+            anchor="w",
+            wraplength=260
+        )
+        self.estado_recibo_label.pack(fill=tk.X, pady=(5, 0))
+        
+        self.btn_abrir_factura = ttk.Button(
+            floating_inner,
+            text="[ Abrir Factura ]",
+            command=self.abrir_ultima_factura,
+            style="Secondary.TButton",
+            state=tk.DISABLED
+        )
+        self.btn_abrir_factura.pack(fill=tk.X, pady=(5, 0))
     
     def load_available_products(self):
         """Cargar productos disponibles en el combo."""
@@ -781,6 +935,8 @@ class SalesGUI:
     def buscar_por_nombre(self):
         """Busca productos por nombre y muestra resultados."""
         nombre = self.nombre_buscar_entry.get().strip()
+        # La búsqueda explícita reemplaza a la automática en curso
+        self.buscador.cancelar()
         if not nombre:
             messagebox.showwarning(
                 "Advertencia",
@@ -814,13 +970,39 @@ class SalesGUI:
     def buscar_por_nombre_auto(self):
         """Búsqueda automática mientras se escribe (sin mostrar mensajes)."""
         nombre = self.nombre_buscar_entry.get().strip()
-        if len(nombre) >= 2:  # Solo buscar si hay al menos 2 caracteres
-            productos = self.service.buscar_productos_por_nombre(nombre)
-            self.productos_encontrados = productos
-            if productos:
-                productos_texto = [f"{p.codigo} - {p.nombre} (Stock: {p.cantidad})" for p in productos]
-                self.product_combo["values"] = productos_texto
-                self.productos_disponibles = {p.codigo: p for p in productos}
+        if len(nombre) < 2:  # Solo buscar si hay al menos 2 caracteres
+            self.buscador.cancelar()
+            return
+        self.buscador.solicitar(nombre)
+        if not self.revision_busqueda_programada:
+            self.revision_busqueda_programada = True
+            self.window.after(self.INTERVALO_REVISION_BUSQUEDA_MS, self.revisar_busqueda)
+    
+    def revisar_busqueda(self):
+        """Aplica el resultado de la última búsqueda automática cuando está listo."""
+        self.revision_busqueda_programada = False
+        try:
+            if not self.window.winfo_exists():
+                return
+        except tk.TclError:
+            return
+        
+        resultado = self.buscador.resultado()
+        if resultado is None:
+            if self.buscador.pendiente():
+                self.revision_busqueda_programada = True
+                self.window.after(self.INTERVALO_REVISION_BUSQUEDA_MS, self.revisar_busqueda)
+            return
+        
+        # El texto pudo cambiar sin KeyRelease (p. ej. al pegar con el mouse)
+        if resultado.error is not None or resultado.texto != self.nombre_buscar_entry.get().strip():
+            return
+        productos = resultado.productos
+        self.productos_encontrados = productos
+        if productos:
+            productos_texto = [f"{p.codigo} - {p.nombre} (Stock: {p.cantidad})" for p in productos]
+            self.product_combo["values"] = productos_texto
+            self.productos_disponibles = {p.codigo: p for p in productos}
     
     def aplicar_configuracion(self):
         """Aplica la configuración de impuestos y descuentos."""
@@ -910,6 +1092,89 @@ class SalesGUI:
             self.codigo_entry.insert(0, codigo)
             self.buscar_producto()
     
+    def on_codigo_ingresado(self):
+        """Enter en el campo de código: encola la lectura en modo escáner o busca el producto."""
+        if self.modo_escaner_var.get():
+            self.encolar_codigo_escaneado()
+        else:
+            self.buscar_producto()
+    
+    def encolar_codigo_escaneado(self):
+        """Guarda el código leído y deja el campo libre para la siguiente lectura."""
+        codigo = self.codigo_entry.get().strip()
+        self.codigo_entry.delete(0, tk.END)
+        if not codigo:
+            return
+        
+        self.codigos_escaneados.append(codigo)
+        if not self.escaneo_programado:
+            self.escaneo_programado = True
+            self.window.after_idle(self.procesar_codigos_escaneados)
+    
+    def procesar_codigos_escaneados(self):
+        """Agrega al carrito todas las lecturas pendientes del escáner (una unidad por lectura)."""
+        self.escaneo_programado = False
+        codigos = list(self.codigos_escaneados)
+        self.codigos_escaneados.clear()
+        if not codigos:
+            return
+        
+        c = COLORS
+        productos = self.service.buscar_productos_por_codigos(codigos)
+        items = self.venta_actual.items
+        indices = {item.codigo_producto: index for index, item in enumerate(items)}
+        modificados = set()
+        agregados = 0
+        errores = []
+        
+        for codigo in codigos:
+            producto = productos.get(codigo)
+            if producto is None:
+                errores.append(f"'{codigo}' no existe")
+                continue
+            
+            index = indices.get(codigo)
+            en_carrito = items[index].cantidad if index is not None else 0
+            if en_carrito + 1 > producto.cantidad:
+                errores.append(f"sin stock: {producto.nombre}")
+                continue
+            
+            if index is not None:
+                self.venta_actual.cambiar_cantidad(index, en_carrito + 1)
+                modificados.add(index)
+            else:
+                try:
+                    item = ItemVenta(
+                        codigo_producto=producto.codigo,
+                        nombre_producto=producto.nombre,
+                        cantidad=1,
+                        precio_unitario=producto.valor_venta or producto.calcular_valor_venta()
+                    )
+                    self.venta_actual.agregar_item(item)
+                except ValueError as e:
+                    errores.append(f"{producto.nombre}: {e}")
+                    continue
+                indices[codigo] = len(items) - 1
+                self.cart_tree.insert("", tk.END, values=self.valores_fila_carrito(item))
+            agregados += 1
+        
+        if modificados:
+            filas = self.cart_tree.get_children()
+            for index in modificados:
+                self.cart_tree.item(filas[index], values=self.valores_fila_carrito(items[index]))
+        self.actualizar_totales()
+        
+        if errores:
+            self.window.bell()
+            self.escaner_label.config(
+                text=f"✗ {'; '.join(errores[:3])}"
+                     + (f" y {len(errores) - 3} más" if len(errores) > 3 else "")
+                     + (f" (agregados: {agregados})" if agregados else ""),
+                fg=c["red_bright"]
+            )
+        else:
+            self.escaner_label.config(text=f"✓ Agregados: {agregados}", fg=c["success"])
+    
     def buscar_producto(self):
         """Busca un producto por código y muestra su información."""
         codigo = self.codigo_entry.get().strip()
@@ -1018,7 +1283,7 @@ class SalesGUI:
             return
         
         # Verificar si ya está en el carrito
-        for item in self.venta_actual.items:
+        for index, item in enumerate(self.venta_actual.items):
             if item.codigo_producto == self.producto_seleccionado.codigo:
                 nueva_cantidad_total = item.cantidad + cantidad
                 if nueva_cantidad_total > self.producto_seleccionado.cantidad:
@@ -1029,8 +1294,10 @@ class SalesGUI:
                         parent=self.window
                     )
                     return
-                item.cantidad = nueva_cantidad_total
-                self.actualizar_carrito()
+                self.venta_actual.cambiar_cantidad(index, nueva_cantidad_total)
+                fila = self.cart_tree.get_children()[index]
+                self.cart_tree.item(fila, values=self.valores_fila_carrito(item))
+                self.actualizar_totales()
                 return
         
         # Asegurar que valor_venta esté calculado
@@ -1046,7 +1313,8 @@ class SalesGUI:
         )
         
         self.venta_actual.agregar_item(item)
-        self.actualizar_carrito()
+        self.cart_tree.insert("", tk.END, values=self.valores_fila_carrito(item))
+        self.actualizar_totales()
         
         # Limpiar campos
         self.cantidad_entry.delete(0, tk.END)
@@ -1063,59 +1331,43 @@ class SalesGUI:
         
         # Agregar items
         for item in self.venta_actual.items:
-            self.cart_tree.insert("", tk.END, values=(
-                item.codigo_producto,
-                item.nombre_producto,
-                item.cantidad,
-                f"${item.precio_unitario:.2f}",
-                f"${item.calcular_subtotal():.2f}"
-            ))
+            self.cart_tree.insert("", tk.END, values=self.valores_fila_carrito(item))
         
         # Actualizar totales con impuestos y descuentos
         self.actualizar_totales()
     
+    @staticmethod
+    def valores_fila_carrito(item: ItemVenta) -> tuple:
+        """Valores de la fila del carrito para un item."""
+        subtotal, _, _ = item.importes_centavos()
+        return (
+            item.codigo_producto,
+            item.nombre_producto,
+            item.cantidad,
+            formatear_dinero(a_centavos(item.precio_unitario)),
+            formatear_dinero(subtotal)
+        )
+    
     def actualizar_totales(self):
-        """Recalcula y actualiza todos los totales incluyendo impuestos y descuentos a nivel de venta."""
-        # Calcular subtotal desde items
-        subtotal_items = sum(item.calcular_subtotal() for item in self.venta_actual.items)
-        descuento_items = sum(item.calcular_descuento() for item in self.venta_actual.items)
-        
-        # Aplicar descuentos a nivel de venta
-        subtotal_con_descuento_items = subtotal_items - descuento_items
-        
-        # Descuento fijo
-        descuento_fijo_aplicado = self.descuento_fijo_venta
-        
-        # Descuento porcentual sobre el subtotal con descuento de items
-        descuento_porcentual_aplicado = subtotal_con_descuento_items * self.descuento_porcentaje_venta
-        
-        # Subtotal después de todos los descuentos
-        subtotal_final = subtotal_con_descuento_items - descuento_fijo_aplicado - descuento_porcentual_aplicado
-        if subtotal_final < 0:
-            subtotal_final = 0.0
-        
-        # Calcular impuesto sobre el subtotal final
-        impuesto_aplicado = subtotal_final * self.impuesto_porcentaje_venta
-        impuesto_items = sum(item.calcular_impuesto() for item in self.venta_actual.items)
-        
-        # Total final
-        total_final = subtotal_final + impuesto_aplicado + impuesto_items
-        
-        # Actualizar modelo de venta
-        self.venta_actual.subtotal = subtotal_items
-        self.venta_actual.descuento_total = descuento_items + descuento_fijo_aplicado + descuento_porcentual_aplicado
-        self.venta_actual.impuesto_total = impuesto_items + impuesto_aplicado
-        self.venta_actual.total = total_final
+        """Actualiza los totales con los impuestos y descuentos a nivel de venta."""
+        # Los acumulados de los items se mantienen al agregar o quitar líneas;
+        # aquí solo se aplican los ajustes de la venta (sin recorrer el carrito)
+        self.venta_actual.aplicar_ajustes(
+            self.impuesto_porcentaje_venta,
+            self.descuento_fijo_venta,
+            self.descuento_porcentaje_venta
+        )
+        totales = self.venta_actual.totales
         
         # Actualizar todos los labels de totales (solo si están inicializados)
         if self.subtotal_label:
-            self.subtotal_label.config(text=f"Subtotal: ${subtotal_items:,.2f}")
+            self.subtotal_label.config(text=f"Subtotal: {formatear_dinero(totales.subtotal)}")
         if self.descuento_label:
-            self.descuento_label.config(text=f"Descuento: ${self.venta_actual.descuento_total:,.2f}")
+            self.descuento_label.config(text=f"Descuento: {formatear_dinero(totales.descuento_total)}")
         if self.impuesto_label:
-            self.impuesto_label.config(text=f"Impuestos: ${self.venta_actual.impuesto_total:,.2f}")
+            self.impuesto_label.config(text=f"Impuestos: {formatear_dinero(totales.impuesto_total)}")
         if self.total_label:
-            self.total_label.config(text=f"${total_final:,.2f}")
+            self.total_label.config(text=formatear_dinero(totales.total))
     
     def remover_item(self):
         """Remueve el item seleccionado del carrito."""
@@ -1130,10 +1382,11 @@ class SalesGUI:
         
         index = self.cart_tree.index(selected[0])
         self.venta_actual.remover_item(index)
-        self.actualizar_carrito()
+        self.cart_tree.delete(selected[0])
+        self.actualizar_totales()
     
     def registrar_venta(self):
-        """Registra la venta, actualiza inventario y genera PDF."""
+        """Registra la venta, actualiza inventario y emite el recibo y/o la factura PDF."""
         if not self.venta_actual.items:
             messagebox.showwarning(
                 "Advertencia",
@@ -1163,65 +1416,32 @@ class SalesGUI:
             # Solo asegurar que tenga el ID correcto
             self.venta_actual.id = venta_id
             
-            # Generar PDF de factura usando la venta actual con totales correctos
-            pdf_path = None
-            try:
-                from .pdf_generator import generar_factura_pdf
-                pdf_path = generar_factura_pdf(self.venta_actual, venta_id)
-            except ImportError as e:
-                messagebox.showwarning(
-                    "Advertencia",
-                    f"{mensaje}\nID de Venta: {venta_id}\n\n"
-                    f"reportlab no está instalado. Para generar PDFs, instale:\n"
-                    f"pip install reportlab\n\n"
-                    f"La venta fue registrada correctamente.",
-                    parent=self.window
-                )
-            except Exception as e:
-                messagebox.showwarning(
-                    "Advertencia",
-                    f"{mensaje}\nID de Venta: {venta_id}\n\n"
-                    f"Error al generar PDF: {str(e)}\n"
-                    f"La venta fue registrada correctamente.",
-                    parent=self.window
-                )
+            modo = self.COMPROBANTES.get(self.comprobante_var.get(), "pdf")
+            avisos = []
             
-            # Si se generó el PDF, preguntar si desea abrirlo
-            if pdf_path:
-                if messagebox.askyesno(
-                    "Factura Generada",
-                    f"{mensaje}\n\n"
-                    f"ID de Venta: {venta_id}\n"
-                    f"Número de Factura: {self.venta_actual.numero_factura}\n"
-                    f"Total: ${self.venta_actual.total:,.2f}\n\n"
-                    f"Factura guardada en:\n{pdf_path}\n\n"
-                    f"¿Desea abrir la factura ahora?",
-                    parent=self.window
-                ):
-                    import os
-                    import subprocess
-                    import platform
-                    try:
-                        if platform.system() == 'Linux':
-                            subprocess.run(['xdg-open', pdf_path], check=False)
-                        elif platform.system() == 'Windows':
-                            os.startfile(pdf_path)
-                        elif platform.system() == 'Darwin':
-                            subprocess.run(['open', pdf_path], check=False)
-                    except Exception:
-                        pass  # Si no se puede abrir, no es crítico
-            else:
-                # Mostrar mensaje de éxito sin PDF
-                messagebox.showinfo(
-                    "Venta Registrada",
-                    f"{mensaje}\n\n"
-                    f"ID de Venta: {venta_id}\n"
-                    f"Número de Factura: {self.venta_actual.numero_factura}\n"
-                    f"Total: ${self.venta_actual.total:,.2f}",
-                    parent=self.window
+            # El recibo se envía en segundo plano; el resultado llega al panel
+            if modo in ("recibo", "ambos"):
+                self.emitir_recibo(self.venta_actual, venta_id)
+                avisos.append("El recibo se está enviando.")
+            
+            # Generar el PDF en segundo plano; se avisa cuando esté listo
+            if modo in ("pdf", "ambos"):
+                self.cola_facturas.encolar(
+                    self.venta_actual, venta_id, self.facturas_terminadas.put
                 )
+                avisos.append("La factura PDF se está generando.")
+            
+            # El resultado queda en el panel: un diálogo por venta frenaría
+            # la atención de la siguiente
+            lineas = [
+                mensaje,
+                f"Factura {self.venta_actual.numero_factura} - "
+                f"ID de Venta: {venta_id or 'Pendiente'}",
+                f"Total: ${self.venta_actual.total:,.2f}"
+            ] + avisos
+            self.mostrar_estado_venta("\n".join(lineas))
             
-            self.nueva_venta()
+            self.nueva_venta(confirmar=False)
             # Recargar productos disponibles (stock actualizado)
             self.load_available_products()
             # Notificar al módulo de inventario si está abierto
@@ -1234,13 +1454,152 @@ class SalesGUI:
                 parent=self.window
             )
     
+    def emitir_recibo(self, venta: Venta, venta_id: Optional[int]) -> TrabajoRecibo:
+        """
+        Encola el recibo térmico de una venta para la salida configurada.
+        
+        No espera a la impresora: revisar_facturas muestra el resultado con
+        recibo_terminado cuando la cola termina.
+        
+        Args:
+            venta: Venta registrada
+            venta_id: ID de la venta
+            
+        Returns:
+            TrabajoRecibo: Trabajo encolado
+        """
+        return self.cola_recibos.encolar(venta, venta_id, self.recibos_terminados.put)
+    
+    def actualizar_estado_diario(self):
+        """Muestra cuántas ventas esperan guardarse y cuántas se rechazaron al reproducirlas."""
+        pendientes = self.service.ventas_pendientes()
+        rechazadas = self.service.ventas_rechazadas()
+        lineas = []
+        if pendientes:
+            lineas.append(f"Ventas por guardar: {pendientes} (base de datos ocupada)")
+        if rechazadas:
+            lineas.append(
+                f"Ventas rechazadas: {rechazadas} - revisar {self.service.diario.ruta_rechazadas}"
+            )
+        texto = "\n".join(lineas)
+        if self.diario_label.cget("text") != texto:
+            self.diario_label.config(text=texto)
+    
+    def revisar_facturas(self):
+        """Muestra las facturas PDF y los recibos terminados y el estado del diario, y vuelve a programarse."""
+        try:
+            if not self.window.winfo_exists():
+                return
+        except tk.TclError:
+            return
+        
+        while True:
+            try:
+                trabajo = self.facturas_terminadas.get_nowait()
+            except queue.Empty:
+                break
+            self.factura_terminada(trabajo)
+        while True:
+            try:
+                recibo = self.recibos_terminados.get_nowait()
+            except queue.Empty:
+                break
+            self.recibo_terminado(recibo)
+        self.actualizar_estado_diario()
+        
+        self.window.after(self.INTERVALO_REVISION_FACTURAS_MS, self.revisar_facturas)
+    
+    def factura_terminada(self, trabajo: TrabajoPDF):
+        """
+        Muestra en el panel que la factura PDF de una venta terminó de generarse.
+        
+        Args:
+            trabajo: Trabajo completado o fallido
+        """
+        c = COLORS
+        encabezado = f"Factura {trabajo.numero_factura} (ID de Venta: {trabajo.venta_id})"
+        if trabajo.estado == EstadoTrabajoPDF.FALLIDO:
+            if isinstance(trabajo.error, ImportError):
+                detalle = "reportlab no está instalado (pip install reportlab)"
+            else:
+                detalle = f"Error al generar PDF: {str(trabajo.error)}"
+            self.estado_factura_label.config(
+                text=f"{encabezado}\n{detalle}\nLa venta fue registrada correctamente.",
+                fg=c["red_bright"]
+            )
+            return
+        
+        self.ruta_ultima_factura = trabajo.ruta
+        self.estado_factura_label.config(
+            text=f"{encabezado}\nGuardada en: {trabajo.ruta}",
+            fg=c["text_secondary"]
+        )
+        self.btn_abrir_factura.config(state=tk.NORMAL)
+    
+    def recibo_terminado(self, trabajo: TrabajoRecibo):
+        """
+        Muestra en el panel si el recibo de una venta llegó a su destino.
+        
+        Args:
+            trabajo: Trabajo completado o fallido
+        """
+        c = COLORS
+        encabezado = f"Recibo {trabajo.numero_factura}"
+        if trabajo.estado == EstadoTrabajoRecibo.FALLIDO:
+            self.estado_recibo_label.config(
+                text=f"{encabezado}\nError al imprimir el recibo: {str(trabajo.error)}\n"
+                     f"La venta fue registrada correctamente.",
+                fg=c["red_bright"]
+            )
+            return
+        self.estado_recibo_label.config(
+            text=f"{encabezado}\nEnviado a: {trabajo.destino}",
+            fg=c["text_secondary"]
+        )
+    
+    def mostrar_estado_venta(self, texto: str, error: bool = False):
+        """
+        Muestra el resultado de la última venta en el panel.
+        
+        Args:
+            texto: Resumen de la venta
+            error: Si True, se resalta como advertencia
+        """
+        c = COLORS
+        self.estado_venta_label.config(
+            text=texto, fg=c["red_bright"] if error else c["success"]
+        )
+    
+    def abrir_ultima_factura(self):
+        """Abre la última factura PDF generada con el visor del sistema."""
+        if not self.ruta_ultima_factura:
+            return
+        import os
+        import subprocess
+        import platform
+        try:
+            if platform.system() == 'Linux':
+                subprocess.run(['xdg-open', self.ruta_ultima_factura], check=False)
+            elif platform.system() == 'Windows':
+                os.startfile(self.ruta_ultima_factura)
+            elif platform.system() == 'Darwin':
+                subprocess.run(['open', self.ruta_ultima_factura], check=False)
+        except Exception:
+            pass  # Si no se puede abrir, no es crítico
+    
     def finalizar_venta(self):
         """Alias para mantener compatibilidad."""
         self.registrar_venta()
     
-    def nueva_venta(self):
-        """Inicia una nueva venta (limpia el carrito)."""
-        if self.venta_actual.items:
+    def nueva_venta(self, confirmar: bool = True):
+        """
+        Inicia una nueva venta (limpia el carrito).
+        
+        Args:
+            confirmar: Si True, pregunta antes de descartar un carrito con items
+                (False tras registrar la venta, cuando ya no hay nada que perder)
+        """
+        if confirmar and self.venta_actual.items:
             if not messagebox.askyesno(
                 "Confirmar",
                 "¿Desea cancelar la venta actual?",
@@ -1289,4 +1648,5 @@ class SalesGUI:
                 parent=self.window
             ):
                 return
+        self.buscador.cerrar()
         self.window.destroy()
@@ -1,5 +1,5 @@
 """Módulo de servicios - Lógica de negocio."""
+from .dashboard_service import DashboardService
 from .inventory_service import InventoryService
 
-__all__ = ["InventoryService"]
-
+__all__ = ["DashboardService", "InventoryService"]
@@ -0,0 +1,61 @@
+"""Servicio de estadísticas del panel de resumen."""
+import calendar
+from datetime import date
+from typing import Optional
+
+from ..cash_closure.repository.venta_query_repository import VentaQueryRepository
+from ..config.settings import Settings
+from ..domain.models import EstadisticasPanel
+from ..repository.product_repository import ProductRepository
+
+
+class DashboardService:
+    """
+    Calcula las cifras del panel principal con consultas agregadas.
+    
+    No carga productos ni ventas: el inventario se resume con una consulta
+    sobre productos y las ventas con tres sobre ventas_por_dia (total
+    histórico, hoy y mes actual), cuyo costo depende del número de días con
+    ventas y no del número de ventas.
+    """
+    
+    def __init__(self, product_repository: Optional[ProductRepository] = None,
+                 venta_repository: Optional[VentaQueryRepository] = None):
+        """
+        Inicializa el servicio.
+        
+        Args:
+            product_repository: Repositorio de productos (si None, se crea uno nuevo)
+            venta_repository: Repositorio de consultas de ventas (si None, se crea uno nuevo)
+        """
+        self.product_repository = product_repository or ProductRepository()
+        self.venta_repository = venta_repository or VentaQueryRepository()
+    
+    def obtener_estadisticas(self, hoy: Optional[date] = None) -> EstadisticasPanel:
+        """
+        Obtiene las cifras de inventario y ventas del panel.
+        
+        Args:
+            hoy: Día de referencia para "hoy" y "mes actual" (si None, la fecha actual)
+        
+        Returns:
+            EstadisticasPanel con los totales
+        """
+        hoy = hoy or date.today()
+        inventario = self.product_repository.obtener_resumen(Settings.LOW_STOCK_THRESHOLD)
+        total = self.venta_repository.obtener_resumen_por_dias()
+        del_dia = self.venta_repository.obtener_resumen_por_dias(hoy, hoy)
+        fin_mes = hoy.replace(day=calendar.monthrange(hoy.year, hoy.month)[1])
+        del_mes = self.venta_repository.obtener_resumen_por_dias(hoy.replace(day=1), fin_mes)
+        
+        return EstadisticasPanel(
+            total_productos=inventario.total_productos,
+            valor_total_inventario=inventario.valor_total,
+            productos_bajo_stock=inventario.bajo_stock,
+            total_ventas=total.cantidad,
+            total_ingresos=total.total,
+            ventas_hoy=del_dia.cantidad,
+            ingresos_hoy=del_dia.total,
+            ventas_mes=del_mes.cantidad,
+            ingresos_mes=del_mes.total
+        )
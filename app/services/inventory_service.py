@@ -1,7 +1,8 @@
 """Servicio de lógica de negocio para inventarios."""
-from typing import List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 
-from ..domain.models import Producto
+from ..domain.models import Producto, ResumenOperacionMasiva
+from ..repository.catalogo_productos import get_catalogo_productos
 from ..repository.product_repository import ProductRepository
 
 
@@ -16,6 +17,7 @@ class InventoryService:
             repository: Repositorio de productos (si None, se crea uno nuevo)
         """
         self.repository = repository or ProductRepository()
+        self.catalogo = get_catalogo_productos(self.repository)
     
     def agregar_producto(self, codigo: str, nombre: str, categoria: str, 
                         cantidad: int, precio_unitario: float, ganancia: float = 0.0) -> Tuple[bool, str]:
@@ -124,6 +126,76 @@ class InventoryService:
         else:
             return False, "Error al eliminar el producto."
     
+    def importar_productos(
+        self,
+        productos: Iterable[Union[Producto, Dict[str, Any]]]
+    ) -> ResumenOperacionMasiva:
+        """
+        Agrega o actualiza muchos productos en una sola transacción.
+        
+        Cada fila se valida igual que en agregar_producto; las filas inválidas
+        se reportan en el resumen y el resto se guarda de una vez. Los productos
+        existentes se actualizan con los datos nuevos.
+        
+        Args:
+            productos: Productos o diccionarios con codigo, nombre, categoria,
+                cantidad, precio_unitario y opcionalmente ganancia
+            
+        Returns:
+            ResumenOperacionMasiva con insertados, actualizados y rechazados
+        """
+        resumen = ResumenOperacionMasiva()
+        validos = []
+        
+        for fila in productos:
+            try:
+                datos = fila.to_dict() if isinstance(fila, Producto) else fila
+                producto = Producto(
+                    codigo=str(datos["codigo"]).strip(),
+                    nombre=str(datos["nombre"]).strip(),
+                    categoria=str(datos["categoria"]).strip(),
+                    cantidad=int(datos["cantidad"]),
+                    precio_unitario=float(datos["precio_unitario"]),
+                    ganancia=float(datos.get("ganancia", 0.0) or 0.0),
+                    valor_venta=0.0  # Se calculará automáticamente
+                )
+            except (KeyError, TypeError, ValueError) as e:
+                codigo = str(fila.get("codigo", "")) if isinstance(fila, dict) else ""
+                resumen.rechazados.append((codigo, f"Datos inválidos: {e}"))
+                continue
+            
+            producto.valor_venta = producto.calcular_valor_venta()
+            
+            es_valido, mensaje_error = producto.validar()
+            if not es_valido:
+                resumen.rechazados.append((producto.codigo, mensaje_error))
+                continue
+            
+            validos.append(producto)
+        
+        if validos:
+            resumen.insertados, resumen.actualizados = self.repository.bulk_upsert(validos)
+        
+        return resumen
+    
+    def eliminar_productos(self, codigos: Iterable[str]) -> ResumenOperacionMasiva:
+        """
+        Elimina muchos productos en una sola transacción.
+        
+        Args:
+            codigos: Códigos de los productos a eliminar
+            
+        Returns:
+            ResumenOperacionMasiva con eliminados y códigos no encontrados
+        """
+        codigos = [codigo.strip() for codigo in codigos if codigo and codigo.strip()]
+        eliminados = self.repository.bulk_delete(codigos)
+        
+        return ResumenOperacionMasiva(
+            eliminados=len(eliminados),
+            no_encontrados=[codigo for codigo in dict.fromkeys(codigos) if codigo not in eliminados]
+        )
+    
     def obtener_todos_los_productos(self) -> List[Producto]:
         """
         Obtiene todos los productos del inventario.
@@ -133,6 +205,22 @@ class InventoryService:
         """
         return self.repository.get_all()
     
+    def buscar_productos(self, texto: str) -> List[Producto]:
+        """
+        Busca productos por código, nombre o categoría mientras se escribe (catálogo en memoria).
+        
+        Tolera fragmentos de palabras y errores de tipeo.
+        
+        Args:
+            texto: Texto a buscar (vacío = todos los productos)
+            
+        Returns:
+            Lista de productos, los más relevantes primero
+        """
+        if not texto.strip():
+            return self.repository.get_all()
+        return self.catalogo.buscar(texto)
+    
     def obtener_producto_por_codigo(self, codigo: str) -> Optional[Producto]:
         """
         Obtiene un producto por su código.
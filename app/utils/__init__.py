@@ -1,5 +1,8 @@
 """Módulo de utilidades."""
 from .validators import validate_fields, parse_numeric_field
+from .fechas import formatear_fecha, interpretar_fecha, parsear_fecha
+from .texto import limites_prefijo, normalizar_texto, patron_like
 
-__all__ = ["validate_fields", "parse_numeric_field"]
+__all__ = ["validate_fields", "parse_numeric_field", "formatear_fecha", "interpretar_fecha",
+           "parsear_fecha", "normalizar_texto", "patron_like", "limites_prefijo"]
 
@@ -0,0 +1,174 @@
+"""Utilidades para almacenar y consultar fechas en SQLite."""
+from datetime import date, datetime, time, timedelta
+from typing import Any, List, Optional, Tuple
+
+
+# Formato de ancho fijo: el orden lexicográfico coincide con el cronológico,
+# por lo que los filtros pueden usar rangos sobre el índice de la columna.
+FORMATO_FECHA = "%Y-%m-%d %H:%M:%S.%f"
+
+
+def formatear_fecha(valor: datetime) -> str:
+    """
+    Convierte una fecha al formato almacenado en la base de datos.
+
+    Args:
+        valor: Fecha a convertir (las fechas con zona horaria se pasan a hora local)
+
+    Returns:
+        str: Fecha en formato 'YYYY-MM-DD HH:MM:SS.ffffff'
+    """
+    if isinstance(valor, datetime):
+        if valor.tzinfo is not None:
+            valor = valor.astimezone().replace(tzinfo=None)
+    else:
+        valor = datetime.combine(valor, time.min)
+    return valor.strftime(FORMATO_FECHA)
+
+
+def interpretar_fecha(valor: Any) -> Optional[datetime]:
+    """
+    Convierte un valor leído de la base de datos a datetime, si es posible.
+
+    Acepta el formato normalizado y los formatos heredados (ISO con o sin
+    microsegundos, con 'Z' o zona horaria, y timestamps numéricos).
+
+    Args:
+        valor: Valor de la columna fecha
+
+    Returns:
+        datetime en hora local sin zona horaria, o None si el valor es nulo o
+        no se puede interpretar (incluidos timestamps fuera de rango)
+    """
+    try:
+        if isinstance(valor, datetime):
+            fecha = valor
+        elif isinstance(valor, (int, float)):
+            fecha = datetime.fromtimestamp(valor)
+        elif isinstance(valor, str) and valor.strip():
+            texto = valor.strip().replace('Z', '+00:00')
+            try:
+                fecha = datetime.fromisoformat(texto)
+            except ValueError:
+                fecha = datetime.fromtimestamp(float(texto))
+        else:
+            return None
+
+        if fecha.tzinfo is not None:
+            fecha = fecha.astimezone().replace(tzinfo=None)
+        return fecha
+    except (ValueError, OverflowError, OSError):
+        return None
+
+
+def parsear_fecha(valor: Any) -> datetime:
+    """
+    Convierte un valor leído de la base de datos a datetime para mostrarlo.
+
+    Args:
+        valor: Valor de la columna fecha
+
+    Returns:
+        datetime: Fecha en hora local sin zona horaria (ahora si no se puede
+        interpretar, ver interpretar_fecha)
+    """
+    fecha = interpretar_fecha(valor)
+    return fecha if fecha is not None else datetime.now()
+
+
+def normalizar_fecha(valor: Any) -> Optional[str]:
+    """
+    Convierte un valor almacenado en cualquier formato al formato normalizado.
+
+    Args:
+        valor: Valor de la columna fecha
+
+    Returns:
+        Fecha en formato 'YYYY-MM-DD HH:MM:SS.ffffff', o None si el valor es
+        nulo o no se puede interpretar
+    """
+    fecha = interpretar_fecha(valor)
+    return formatear_fecha(fecha) if fecha is not None else None
+
+
+def rango_dias(fecha_inicio: date, fecha_fin: date) -> Tuple[str, str]:
+    """
+    Límites [inicio, fin) que cubren días completos.
+
+    Args:
+        fecha_inicio: Primer día incluido
+        fecha_fin: Último día incluido
+
+    Returns:
+        Tuple[str, str]: Límite inferior inclusivo y superior exclusivo
+    """
+    return (
+        formatear_fecha(datetime.combine(fecha_inicio, time.min)),
+        formatear_fecha(datetime.combine(fecha_fin + timedelta(days=1), time.min))
+    )
+
+
+def rango_horas(dia: date, hora_inicio: time = None, hora_fin: time = None) -> Tuple[str, str]:
+    """
+    Límites [inicio, fin) para un rango de horas dentro de un día.
+
+    La hora final incluye todo su segundo (10:30:00 incluye 10:30:00.999999).
+
+    Args:
+        dia: Día consultado
+        hora_inicio: Hora inicial (inicio del día si es None)
+        hora_fin: Hora final inclusiva (fin del día si es None)
+
+    Returns:
+        Tuple[str, str]: Límite inferior inclusivo y superior exclusivo
+    """
+    inicio = datetime.combine(dia, (hora_inicio or time.min).replace(microsecond=0))
+    if hora_fin is None:
+        fin = datetime.combine(dia + timedelta(days=1), time.min)
+    else:
+        fin = datetime.combine(dia, hora_fin.replace(microsecond=0)) + timedelta(seconds=1)
+    return formatear_fecha(inicio), formatear_fecha(fin)
+
+
+def rango_mes(año: int, mes: int) -> Tuple[str, str]:
+    """
+    Límites [inicio, fin) de un mes.
+
+    Args:
+        año: Año
+        mes: Mes (1-12)
+
+    Returns:
+        Tuple[str, str]: Límite inferior inclusivo y superior exclusivo
+    """
+    inicio = date(año, mes, 1)
+    fin = date(año + 1, 1, 1) if mes == 12 else date(año, mes + 1, 1)
+    return rango_dias(inicio, fin - timedelta(days=1))
+
+
+def rango_año(año: int) -> Tuple[str, str]:
+    """
+    Límites [inicio, fin) de un año.
+
+    Args:
+        año: Año
+
+    Returns:
+        Tuple[str, str]: Límite inferior inclusivo y superior exclusivo
+    """
+    return rango_dias(date(año, 1, 1), date(año, 12, 31))
+
+
+def rangos_mes_en_años(mes: int, año_inicio: int, año_fin: int) -> List[Tuple[str, str]]:
+    """
+    Límites de un mes en cada año de un intervalo (filtro de mes sin año).
+
+    Args:
+        mes: Mes (1-12)
+        año_inicio: Primer año
+        año_fin: Último año
+
+    Returns:
+        Lista de límites [inicio, fin) por año
+    """
+    return [rango_mes(año, mes) for año in range(año_inicio, año_fin + 1)]
@@ -0,0 +1,57 @@
+"""Utilidades de texto para búsquedas."""
+import unicodedata
+from typing import Tuple
+
+
+def normalizar_texto(texto: str) -> str:
+    """
+    Normaliza un texto para compararlo sin distinguir tildes, mayúsculas ni espacios.
+
+    Quita las marcas diacríticas ("Café" -> "cafe", "Ñandú" -> "nandu"),
+    aplica casefold y reduce cualquier secuencia de espacios a uno solo.
+
+    Args:
+        texto: Texto a normalizar
+
+    Returns:
+        str: Texto normalizado (vacío si texto es None o vacío)
+    """
+    if not texto:
+        return ""
+    if texto.isascii():
+        return " ".join(texto.lower().split())
+    descompuesto = unicodedata.normalize("NFKD", texto)
+    sin_tildes = "".join(c for c in descompuesto if not unicodedata.combining(c))
+    return " ".join(sin_tildes.casefold().split())
+
+
+def patron_like(texto: str, prefijo: bool = False) -> str:
+    """
+    Construye un patrón LIKE (con ESCAPE '\\') que busca un texto literal.
+
+    Args:
+        texto: Texto a buscar (los caracteres %, _ y \\ se escapan)
+        prefijo: Si True, el patrón exige que el valor empiece por el texto;
+            si False, que lo contenga
+
+    Returns:
+        str: Patrón para LIKE
+    """
+    escapado = texto.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"{escapado}%" if prefijo else f"%{escapado}%"
+
+
+def limites_prefijo(texto: str) -> Tuple[str, str]:
+    """
+    Calcula el rango [inicio, fin) de los valores que empiezan por un texto.
+
+    Sirve para buscar por prefijo con "columna >= ? AND columna < ?", que
+    SQLite resuelve con un índice sobre la columna.
+
+    Args:
+        texto: Prefijo (no vacío)
+
+    Returns:
+        Tuple[str, str]: (inicio, fin)
+    """
+    return texto, texto[:-1] + chr(ord(texto[-1]) + 1)
@@ -0,0 +1,379 @@
+"""Benchmark de generación de facturas PDF con y sin la plantilla cacheada.
+
+Uso:
+    python benchmark_facturas.py [cantidad_facturas]
+
+Las facturas y la base de datos de la tienda se crean en un directorio
+temporal, por lo que no modifica inventario.db ni la carpeta facturas.
+Requiere reportlab.
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER, TA_RIGHT
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import cm
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+
+from app.config_module.repository.tienda_repository import TiendaRepository
+from app.config_module.services.tienda_service import TiendaService
+from app.sales.domain.models import Venta, ItemVenta
+from app.sales.pdf_generator import PlantillaFactura
+
+
+ITEMS_POR_FACTURA = 8
+
+
+def crear_venta(numero: int) -> Venta:
+    """Crea una venta de ejemplo con ITEMS_POR_FACTURA items."""
+    venta = Venta(numero_factura=f"FACT-{numero:05d}")
+    for j in range(ITEMS_POR_FACTURA):
+        venta.agregar_item(ItemVenta(f"B{j:04d}", f"Producto {j}", j + 1, 12.5))
+    venta.calcular_total()
+    return venta
+
+
+def generar_factura_sin_cache(venta: Venta, venta_id: int, output_dir: str,
+                              tienda_service: TiendaService) -> str:
+    """
+    Genera una factura como antes de PlantillaFactura, para comparar.
+
+    Es el generar_factura_pdf original, que crea la hoja de estilos, cada
+    ParagraphStyle, cada TableStyle y cada párrafo en cada llamada, más la
+    consulta del encabezado de la tienda a tienda_service para producir el
+    mismo documento que la plantilla.
+
+    Returns:
+        str: Ruta del PDF generado
+    """
+    output_dir = Path(output_dir)
+
+    # Nombre del archivo
+    numero_factura = venta.numero_factura or f"FACT-{venta_id:05d}"
+    fecha_str = venta.fecha.strftime("%Y%m%d_%H%M%S") if venta.fecha else datetime.now().strftime("%Y%m%d_%H%M%S")
+    filename = f"{numero_factura}_{fecha_str}.pdf"
+    pdf_path = output_dir / filename
+
+    # Crear documento con márgenes adecuados
+    doc = SimpleDocTemplate(
+        str(pdf_path),
+        pagesize=A4,
+        rightMargin=2*cm,
+        leftMargin=2*cm,
+        topMargin=2*cm,
+        bottomMargin=2*cm
+    )
+
+    # Estilos personalizados
+    styles = getSampleStyleSheet()
+
+    # Estilo para título principal
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=22,
+        textColor=colors.HexColor('#dc0000'),
+        alignment=TA_CENTER,
+        spaceAfter=20,
+        spaceBefore=10
+    )
+
+    # Estilo para encabezados de sección
+    heading_style = ParagraphStyle(
+        'CustomHeading',
+        parent=styles['Heading2'],
+        fontSize=13,
+        textColor=colors.HexColor('#dc0000'),
+        spaceAfter=10,
+        spaceBefore=15
+    )
+
+    # Estilo para texto normal
+    normal_style = ParagraphStyle(
+        'CustomNormal',
+        parent=styles['Normal'],
+        fontSize=10,
+        textColor=colors.white,
+        spaceAfter=6
+    )
+
+    # Contenido
+    story = []
+
+    # ========== ENCABEZADO ==========
+    tienda_style = ParagraphStyle(
+        'Tienda',
+        parent=styles['Normal'],
+        fontSize=11,
+        textColor=colors.HexColor('#888888'),
+        alignment=TA_CENTER,
+        spaceAfter=4
+    )
+    story.append(Paragraph("FACTURA / RECIBO", title_style))
+    tienda_info = tienda_service.obtener_informacion_tienda()
+    if tienda_info:
+        story.append(Paragraph(f"<b>{escape(tienda_info.nombre)}</b>", tienda_style))
+        if tienda_info.descripcion:
+            story.append(Paragraph(escape(tienda_info.descripcion), tienda_style))
+    story.append(Spacer(1, 0.3*cm))
+
+    # ========== INFORMACIÓN PRINCIPAL DE LA FACTURA ==========
+    # Preparar fecha y hora
+    fecha_hora = venta.fecha.strftime("%d/%m/%Y %H:%M:%S") if venta.fecha else datetime.now().strftime("%d/%m/%Y %H:%M:%S")
+
+    # Información principal - organizada en dos columnas claras
+    info_data = []
+
+    # Fila 1: Número de factura
+    info_data.append([
+        Paragraph('<b>Número de Factura:</b>', normal_style),
+        Paragraph(numero_factura, normal_style)
+    ])
+
+    # Fila 2: ID de Venta
+    info_data.append([
+        Paragraph('<b>ID de Venta:</b>', normal_style),
+        Paragraph(str(venta_id), normal_style)
+    ])
+
+    # Fila 3: Fecha y Hora
+    info_data.append([
+        Paragraph('<b>Fecha y Hora:</b>', normal_style),
+        Paragraph(fecha_hora, normal_style)
+    ])
+
+    # Fila 4: ID de Cliente (si existe)
+    if venta.cliente_id:
+        info_data.append([
+            Paragraph('<b>ID de Cliente:</b>', normal_style),
+            Paragraph(str(venta.cliente_id), normal_style)
+        ])
+    else:
+        info_data.append([
+            Paragraph('<b>Cliente:</b>', normal_style),
+            Paragraph('Consumidor Final', normal_style)
+        ])
+
+    # Crear tabla de información principal
+    info_table = Table(info_data, colWidths=[6*cm, 9*cm])
+    info_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#1a1a1a')),
+        ('BACKGROUND', (1, 0), (1, -1), colors.HexColor('#2a2a2a')),
+        ('TEXTCOLOR', (0, 0), (-1, -1), colors.white),
+        ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+        ('ALIGN', (1, 0), (1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
+        ('TOPPADDING', (0, 0), (-1, -1), 10),
+        ('LEFTPADDING', (0, 0), (-1, -1), 10),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 10),
+        ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#dc0000')),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ]))
+
+    story.append(info_table)
+    story.append(Spacer(1, 0.8*cm))
+
+    # ========== DETALLE DE PRODUCTOS ==========
+    story.append(Paragraph("DETALLE DE PRODUCTOS", heading_style))
+    story.append(Spacer(1, 0.3*cm))
+
+    # Encabezados de tabla de productos
+    headers = ['Código', 'Producto', 'Cant.', 'P. Unit.', 'Subtotal']
+    table_data = [headers]
+
+    # Agregar productos
+    for item in venta.items:
+        table_data.append([
+            item.codigo_producto,
+            item.nombre_producto,
+            str(item.cantidad),
+            f"${item.precio_unitario:,.2f}",
+            f"${item.calcular_subtotal():,.2f}"
+        ])
+
+    # Crear tabla de productos
+    product_table = Table(table_data, colWidths=[2.5*cm, 6*cm, 1.5*cm, 2.5*cm, 2.5*cm])
+    product_table.setStyle(TableStyle([
+        # Encabezados
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#dc0000')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 11),
+        
+        # Datos
+        ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#121212')),
+        ('TEXTCOLOR', (0, 1), (-1, -1), colors.white),
+        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 1), (-1, -1), 10),
+        ('ALIGN', (1, 1), (1, -1), 'LEFT'),  # Nombre alineado a la izquierda
+        ('ALIGN', (2, 1), (-1, -1), 'RIGHT'),  # Números a la derecha
+        
+        # Bordes
+        ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#dc0000')),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+        ('TOPPADDING', (0, 0), (-1, -1), 8),
+        ('LEFTPADDING', (0, 0), (-1, -1), 8),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 8),
+        
+        # Filas alternadas
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.HexColor('#1a1a1a'), colors.HexColor('#121212')]),
+    ]))
+
+    story.append(product_table)
+    story.append(Spacer(1, 1*cm))
+
+    # ========== SECCIÓN DE TOTALES (REORGANIZADA Y CORREGIDA) ==========
+    story.append(Paragraph("TOTALES", heading_style))
+    story.append(Spacer(1, 0.3*cm))
+
+    # Tabla de totales parciales - ALINEADA CORRECTAMENTE
+    totales_data = [
+        [
+            Paragraph('Subtotal:', normal_style),
+            Paragraph(f"${venta.subtotal:,.2f}", normal_style)
+        ],
+        [
+            Paragraph('Descuento:', normal_style),
+            Paragraph(f"${venta.descuento_total:,.2f}", normal_style)
+        ],
+        [
+            Paragraph('Impuestos:', normal_style),
+            Paragraph(f"${venta.impuesto_total:,.2f}", normal_style)
+        ],
+    ]
+
+    # Estilo para totales parciales
+    totales_style = TableStyle([
+        ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#1a1a1a')),
+        ('BACKGROUND', (1, 0), (1, -1), colors.HexColor('#2a2a2a')),
+        ('TEXTCOLOR', (0, 0), (-1, -1), colors.white),
+        ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+        ('ALIGN', (1, 0), (1, -1), 'RIGHT'),  # Números a la derecha
+        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 0), (-1, -1), 11),
+        ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#dc0000')),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 12),  # Espaciado vertical adecuado
+        ('TOPPADDING', (0, 0), (-1, -1), 12),
+        ('LEFTPADDING', (0, 0), (-1, -1), 10),  # Padding horizontal para evitar superposición
+        ('RIGHTPADDING', (0, 0), (-1, -1), 10),
+        ('ROWBACKGROUNDS', (0, 0), (-1, -1), [colors.HexColor('#1a1a1a'), colors.HexColor('#2a2a2a'), colors.HexColor('#1a1a1a')]),
+    ])
+
+    totales_table = Table(totales_data, colWidths=[5*cm, 5*cm])
+    totales_table.setStyle(totales_style)
+
+    story.append(totales_table)
+    story.append(Spacer(1, 0.6*cm))  # Espaciado antes del total final
+
+    # Total final - SEPARADO Y BIEN ESPACIADO
+    total_final_style = ParagraphStyle(
+        'TotalFinal',
+        parent=styles['Normal'],
+        fontSize=16,
+        textColor=colors.white,
+        alignment=TA_RIGHT
+    )
+
+    total_final_data = [
+        [
+            Paragraph('<b>TOTAL A PAGAR:</b>', total_final_style),
+            Paragraph(f"<b>${venta.total:,.2f}</b>", total_final_style)
+        ]
+    ]
+
+    total_final_table = Table(total_final_data, colWidths=[5*cm, 5*cm])
+    total_final_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#dc0000')),
+        ('TEXTCOLOR', (0, 0), (-1, -1), colors.white),
+        ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+        ('ALIGN', (1, 0), (1, -1), 'RIGHT'),  # Total alineado a la derecha
+        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 16),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 15),  # Más padding para evitar superposición
+        ('TOPPADDING', (0, 0), (-1, -1), 15),
+        ('LEFTPADDING', (0, 0), (-1, -1), 15),  # Padding generoso
+        ('RIGHTPADDING', (0, 0), (-1, -1), 15),
+        ('GRID', (0, 0), (-1, -1), 2, colors.HexColor('#ff0000')),  # Borde más grueso
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ]))
+
+    story.append(total_final_table)
+    story.append(Spacer(1, 1*cm))
+
+    # ========== PIE DE PÁGINA ==========
+    pie_style = ParagraphStyle(
+        'Pie',
+        parent=styles['Normal'],
+        fontSize=9,
+        textColor=colors.HexColor('#888888'),
+        alignment=TA_CENTER
+    )
+
+    pie_text = f"Factura generada el {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}"
+    story.append(Paragraph(pie_text, pie_style))
+
+    # Construir PDF
+    doc.build(story)
+
+    return str(pdf_path)
+
+
+def medir(cantidad_facturas: int, tienda_service: TiendaService, directorio: str,
+          cacheada: bool) -> float:
+    """
+    Genera facturas y devuelve las facturas por segundo.
+
+    Args:
+        cantidad_facturas: Número de facturas a generar
+        tienda_service: Servicio de tienda usado por la plantilla
+        directorio: Directorio de salida de los PDF
+        cacheada: Si True, reutiliza una plantilla; si False, usa
+            generar_factura_sin_cache
+
+    Returns:
+        float: Facturas generadas por segundo
+    """
+    ventas = [crear_venta(n + 1) for n in range(cantidad_facturas)]
+    plantilla = PlantillaFactura(tienda_service)
+
+    inicio = time.perf_counter()
+    for n, venta in enumerate(ventas, start=1):
+        if cacheada:
+            plantilla.generar(venta, n, directorio)
+        else:
+            generar_factura_sin_cache(venta, n, directorio, tienda_service)
+    return cantidad_facturas / (time.perf_counter() - inicio)
+
+
+def main():
+    """Compara la generación de facturas antes y después de cachear la plantilla."""
+    cantidad_facturas = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+
+    with tempfile.TemporaryDirectory() as directorio:
+        tienda_service = TiendaService(TiendaRepository(os.path.join(directorio, "inventario.db")))
+        tienda_service.guardar_informacion_tienda("Tienda Benchmark", "Calle 1 # 2-3")
+
+        print(f"Generando {cantidad_facturas} facturas de {ITEMS_POR_FACTURA} items\n")
+        print(f"{'Plantilla':<12}{'Facturas/s':>12}{'ms/factura':>12}")
+        print("-" * 36)
+        for nombre, cacheada in (("sin caché", False), ("cacheada", True)):
+            salida = os.path.join(directorio, nombre.replace(" ", "_"))
+            os.makedirs(salida)
+            facturas_por_segundo = medir(cantidad_facturas, tienda_service, salida, cacheada)
+            print(f"{nombre:<12}{facturas_por_segundo:>12.1f}{1000.0 / facturas_por_segundo:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Benchmark de registro de ventas con los distintos perfiles de rendimiento de SQLite.
+
+Uso:
+    python benchmark_ventas.py [cantidad_ventas]
+
+Cada perfil se mide sobre bases de datos nuevas en un directorio temporal,
+por lo que no modifica inventario.db ni Ventas.DB.
+"""
+import os
+import sys
+import tempfile
+import time
+
+from app.config.settings import Settings
+from app.database.connection_manager import close_all_connections
+from app.repository.product_repository import ProductRepository
+from app.services.inventory_service import InventoryService
+from app.sales.domain.models import Venta, ItemVenta
+from app.sales.repository.diario_ventas import DiarioVentas
+from app.sales.repository.venta_repository import VentaRepository
+from app.sales.services.secuencia_facturas import liberar_secuencias_facturas
+from app.sales.services.venta_service import VentaService
+
+
+PRODUCTOS = 50
+ITEMS_POR_VENTA = 3
+
+
+def medir_perfil(perfil: str, cantidad_ventas: int) -> float:
+    """
+    Registra ventas con un perfil y devuelve las ventas por segundo.
+
+    Args:
+        perfil: Nombre del perfil en Settings.DB_PERFORMANCE_PROFILES
+        cantidad_ventas: Número de ventas a registrar
+
+    Returns:
+        float: Ventas registradas por segundo
+    """
+    perfil_anterior = Settings.DB_PERFORMANCE_PROFILE
+    Settings.DB_PERFORMANCE_PROFILE = perfil
+    close_all_connections()
+
+    try:
+        with tempfile.TemporaryDirectory() as directorio:
+            inventario = InventoryService(ProductRepository(os.path.join(directorio, "inventario.db")))
+            diario = DiarioVentas(os.path.join(directorio, "ventas_pendientes.jsonl"))
+            servicio = VentaService(
+                venta_repository=VentaRepository(os.path.join(directorio, "Ventas.DB")),
+                inventory_service=inventario,
+                diario=diario
+            )
+
+            inventario.importar_productos(
+                {"codigo": f"B{i:04d}", "nombre": f"Producto {i}", "categoria": "Benchmark",
+                 "cantidad": cantidad_ventas * ITEMS_POR_VENTA, "precio_unitario": 10.0,
+                 "ganancia": 25.0}
+                for i in range(PRODUCTOS)
+            )
+
+            inicio = time.perf_counter()
+            for n in range(cantidad_ventas):
+                venta = Venta()
+                for j in range(ITEMS_POR_VENTA):
+                    codigo = f"B{(n + j) % PRODUCTOS:04d}"
+                    venta.agregar_item(ItemVenta(codigo, f"Producto {codigo}", 1, 12.5))
+                exitoso, mensaje, _ = servicio.registrar_venta(venta)
+                if not exitoso:
+                    raise RuntimeError(mensaje)
+            duracion = time.perf_counter() - inicio
+
+            liberar_secuencias_facturas()
+            diario.cerrar()
+            close_all_connections()
+            return cantidad_ventas / duracion
+    finally:
+        Settings.DB_PERFORMANCE_PROFILE = perfil_anterior
+
+
+def main():
+    """Ejecuta el benchmark para todos los perfiles configurados."""
+    cantidad_ventas = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+
+    print(f"Registrando {cantidad_ventas} ventas de {ITEMS_POR_VENTA} items por perfil\n")
+    print(f"{'Perfil':<12}{'Ventas/s':>12}{'ms/venta':>12}")
+    print("-" * 36)
+    for perfil in Settings.DB_PERFORMANCE_PROFILES:
+        ventas_por_segundo = medir_perfil(perfil, cantidad_ventas)
+        print(f"{perfil:<12}{ventas_por_segundo:>12.1f}{1000.0 / ventas_por_segundo:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
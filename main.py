@@ -1,4 +1,5 @@
 """Punto de entrada principal para la aplicación de gestión."""
+import multiprocessing
 import tkinter as tk
 
 from app.main_window import MainWindow
@@ -12,5 +13,9 @@ def main():
 
 
 if __name__ == "__main__":
+    # En el ejecutable de PyInstaller, los procesos de la exportación de facturas
+    # vuelven a ejecutar este archivo: freeze_support los desvía al trabajador
+    # antes de que abran otra ventana
+    multiprocessing.freeze_support()
     main()
 
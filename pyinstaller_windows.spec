@@ -19,6 +19,7 @@ a = Analysis(
         'reportlab.pdfgen',
         'reportlab.lib',
         'reportlab.platypus',
+        'pypdf',
         'PIL',
         'PIL.Image',
         'PIL.ImageTk',